@@ -0,0 +1,76 @@
+"""
+Per-row cost of keyword classification (Classifier._classify_by_heuristics).
+
+Compares the keyword automaton over the heuristic text view with the previous
+approach (substring checks per keyword over str(extracted)).
+
+Usage:
+    python benchmarks/bench_classify.py [--rows 2000] [--tokens 400]
+"""
+
+import argparse
+import random
+import time
+
+from itbl.ocr.base import TokenTable
+from itbl.parse.classify import Classifier
+
+WORDS = [
+    "total", "subtotal", "tax", "visa", "thank", "you", "store", "receipt", "qty",
+    "item", "cash", "change", "balance", "ref", "auth", "terminal", "coffee", "paper",
+]
+
+
+def make_rows(count: int, tokens: int, seed: int = 3):
+    """Synthetic extracted dicts shaped like the pipeline's (statement-sized token tables)."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        table = TokenTable()
+        for j in range(tokens):
+            table.append(rng.choice(WORDS), rng.uniform(0.3, 0.79), j * 12, i % 90, 40, 14, 1, 1, j // 8, j % 8)
+        rows.append({
+            "date": "2024-01-15",
+            "vendor": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} #{i}",
+            "amount": round(rng.uniform(1, 500), 2),
+            "description": " ".join(rng.sample(WORDS, 4)),
+            "_ocr_confidence": 0.71,
+            "_low_conf_tokens": table,
+        })
+    return rows
+
+
+def classify_previous(classifier: Classifier, extracted):
+    """The per-category substring loop over str(extracted) (token tables as token dicts)."""
+    text = str({**extracted, "_low_conf_tokens": list(extracted["_low_conf_tokens"])}).lower()
+    vendor = (extracted.get("vendor") or "").lower()
+    for category, keywords in classifier.category_keywords.items():
+        score = sum(1 for keyword in keywords if keyword in text or keyword in vendor)
+        if score > 0:
+            return category, min(0.85, 0.60 + (score * 0.10))
+    return None
+
+
+def bench(label: str, func, rows) -> None:
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1e6 / len(rows):10.1f} us/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=400, help="Low-confidence tokens per row")
+    args = parser.parse_args()
+
+    classifier = Classifier()
+    rows = make_rows(args.rows, args.tokens)
+    print(f"{args.rows} rows, {args.tokens} low-confidence tokens each")
+    bench("str(extracted) loop", lambda row: classify_previous(classifier, row), rows)
+    bench("keyword automaton", classifier._classify_by_heuristics, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-page cost of document-type detection and field extraction (everything after OCR).
+
+Runs what ImagePipeline._process does with the OCR text: one lex pass, check/
+statement detection, then the check, statement or receipt extractor. Every
+page is distinct, so the lex and date-scan caches don't hide the work.
+
+Usage:
+    python benchmarks/bench_extract.py [--pages 300] [--lines 40]
+"""
+
+import argparse
+import random
+import time
+
+from itbl.ocr.base import OCRResult
+from itbl.parse.categories.bank_statements import extract_statement_fields
+from itbl.parse.categories.checks import extract_check_fields
+from itbl.parse.extractors import FieldExtractor
+from itbl.parse.lexer import lex
+from itbl.pipeline import CHECK_KEYWORDS, STATEMENT_KEYWORDS, _looks_like_statement
+
+VENDORS = ["THE HOME DEPOT #2676", "STAPLES 0042", "AMAZON MKTP US", "SHELL OIL 5744", "UBER *TRIP", "COMCAST CABLE"]
+ITEMS = ["Paper", "Pens", "Toner", "Coffee", "Sandwich", "Labels"]
+
+
+def make_statement(rng: random.Random, lines: int) -> str:
+    rows = ["ACCOUNT STATEMENT", f"Account Number XXXX-{rng.randint(1000, 9999)}"]
+    for _ in range(lines):
+        date = f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024 " if rng.random() < 0.6 else ""
+        rows.append(f"{date}{rng.choice(VENDORS)} BOSTON MA ${rng.uniform(1, 3000):,.2f}")
+    rows.append(f"New Balance: ${rng.uniform(100, 9000):,.2f}")
+    return "\n".join(rows)
+
+
+def make_check(rng: random.Random, lines: int) -> str:
+    amount = rng.uniform(10, 9000)
+    rows = [
+        f"ACME SUPPLY CO {rng.randint(1000, 9999)}",
+        f"Date {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024",
+        f"PAY TO THE ORDER OF {rng.choice(VENDORS).title()} ${amount:,.2f}",
+        "Nine hundred and 00/100 DOLLARS",
+        f"MEMO invoice {rng.randint(100, 999)}",
+    ]
+    rows.extend(f"{rng.randint(10, 99)}-{rng.randint(1000, 9999)} {rng.choice(ITEMS)}" for _ in range(lines // 4))
+    return "\n".join(rows)
+
+
+def make_receipt(rng: random.Random, lines: int) -> str:
+    rows = ["Office Depot Inc", f"{rng.randint(1, 999)} Main St", f"Date: {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024"]
+    total = 0.0
+    for _ in range(lines // 2):
+        price = rng.uniform(1, 300)
+        total += price
+        rows.append(f"{rng.choice(ITEMS)} {price:.2f}")
+    rows.append(f"Subtotal: {total:,.2f}")
+    rows.append(f"Total USD {total * 1.06:,.2f}")
+    return "\n".join(rows)
+
+
+def extract_page(extractor: FieldExtractor, text: str) -> dict:
+    lexed = lex(text, extractor.date_formats, extractor.currency_symbols)
+    if lexed.has_keyword(*CHECK_KEYWORDS):
+        return extract_check_fields(text, lexed=lexed)
+    if lexed.has_keyword(*STATEMENT_KEYWORDS) or _looks_like_statement(lexed):
+        return extract_statement_fields(text, lexed=lexed)
+    return extractor.extract_all(OCRResult(text, 0.9, []), lexed=lexed)
+
+
+def bench(label: str, extractor: FieldExtractor, pages) -> None:
+    start = time.perf_counter()
+    for text in pages:
+        extract_page(extractor, text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed * 1e6 / len(pages):10.1f} us/page")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=40, help="Transaction/item lines per page")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    extractor = FieldExtractor()
+    print(f"{args.pages} pages per document type, {args.lines} lines each")
+    for label, make in (("statement", make_statement), ("check", make_check), ("receipt", make_receipt)):
+        bench(label, extractor, [make(rng, args.lines) for _ in range(args.pages)])
+
+
+if __name__ == "__main__":
+    main()
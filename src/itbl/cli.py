@@ -1,45 +1,30 @@
 """CLI entry point."""
 
 import sys
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from itbl.ingest.loader import find_image_files, load_image
-from itbl.ingest.preprocess import preprocess_image
+from itbl.ingest.loader import iter_input_files, iter_work_items
 from itbl.normalize.dedupe import Deduplicator
-from itbl.normalize.schemas import build_normalized_row
-from itbl.normalize.validate import Validator
-from itbl.ocr.tesseract import TesseractBackend
+from itbl.ocr.cache import get_default_cache_dir
 from itbl.output.csv_writer import CSVWriter
-from itbl.output.gsheet_writer import GoogleSheetsWriter
+from itbl.output.gsheet_writer import COMMIT_CHUNK_ROWS, GoogleSheetsWriter
+from itbl.output.staging import CHECKPOINT_FILE, UploadCheckpoint, find_staged_sources, iter_chunks
 from itbl.output.xlsx_writer import XLSXWriter
-from itbl.parse.classify import Classifier
-from itbl.parse.extractors import FieldExtractor
-from itbl.parse.categories.checks import extract_check_fields
-from itbl.parse.categories.bank_statements import extract_statement_fields
-from itbl.review.report import generate_report
-from itbl.review.triage import TriageEngine
-from itbl.util.config import get_config_dir, load_rules_config, load_sheets_config
+from itbl.pipeline import OCR_ENGINES, process_images
+from itbl.review.report import ReportAccumulator
+from itbl.util.config import get_config_dir, load_sheets_config
 from itbl.util.logging import setup_logging
 
 logger = setup_logging()
 
 
-def _looks_like_statement(text: str) -> bool:
-    """Heuristic: does text look like a bank/credit card statement with multiple transactions?"""
-    import re
-    # Look for pattern: multiple lines with amounts (likely multiple transactions)
-    amount_pattern = r'\$\d+\.\d{2}'
-    amounts = re.findall(amount_pattern, text)
-    # If we see 3+ dollar amounts, likely a statement
-    if len(amounts) >= 3:
-        return True
-    # Also check for patterns like "VENDOR $amount" appearing multiple times
-    vendor_amount_pattern = r'[A-Z][A-Z\s&]+?\$\d+\.\d{2}'
-    matches = re.findall(vendor_amount_pattern, text)
-    if len(matches) >= 2:
-        return True
-    return False
+def _names_file(output_path: Path) -> bool:
+    """Whether --out names a file (an existing file, or a new path with a suffix)."""
+    if output_path.exists():
+        return not output_path.is_dir()
+    return bool(output_path.suffix)
 
 
 def parse_command(
@@ -56,10 +41,32 @@ def parse_command(
     no_network: bool = True,
     sheet_id: Optional[str] = None,
     credentials_path: Optional[Path] = None,
+    workers: int = 1,
+    ocr_cache: bool = True,
+    ocr_cache_dir: Optional[Path] = None,
+    ocr_cache_max_mb: int = 512,
+    ocr_retry: str = "auto",
+    preprocess_profile: str = "max-quality",
+    exclude: Optional[List[str]] = None,
+    stream: bool = False,
+    xlsx_append: bool = False,
+    split_statements: bool = False,
 ) -> int:
     """
     Parse images and generate normalized output.
     
+    Args:
+        workers: Number of worker processes for per-image work (1 = serial)
+        ocr_cache: Reuse cached OCR results for unchanged images
+        ocr_cache_dir: OCR cache directory (default: ~/.cache/itbl/ocr)
+        ocr_cache_max_mb: OCR cache size limit in MB (least recently used entries evicted)
+        ocr_retry: Low-confidence OCR retry mode ("auto", "serial" or "speculative")
+        preprocess_profile: Preprocessing profile ("fast", "balanced" or "max-quality")
+        exclude: Glob patterns for files/directories to skip while scanning input_path
+        stream: Write rows to per-category sinks as they are produced (bounded memory)
+        xlsx_append: Add rows to existing XLSX workbooks instead of replacing them
+        split_statements: One row per bank/credit card statement transaction
+    
     Returns:
         Exit code: 0 = success, 2 = staged (needs review), 3 = fatal error
     """
@@ -67,29 +74,24 @@ def parse_command(
         if config_dir is None:
             config_dir = get_config_dir()
 
-        # Load configs
-        rules_config = load_rules_config(config_dir)
-        date_formats = rules_config.get("date_formats", ["%m/%d/%Y", "%Y-%m-%d"])
-        currency_symbols = rules_config.get("currency_symbols", ["$", "USD"])
-
-        # Initialize components
-        ocr_backend = TesseractBackend() if engine == "tesseract" else None
-        if ocr_backend is None:
+        # Validate OCR engine before doing any work
+        if engine not in OCR_ENGINES:
             logger.error(f"Unknown OCR engine: {engine}")
             return 3
 
-        extractor = FieldExtractor(date_formats=date_formats, currency_symbols=currency_symbols)
-        # Pass config_dir as Path (or None) - Classifier will handle it
-        classifier = Classifier(config_dir=str(config_dir) if config_dir else None)
-        validator = Validator(strict_level=strict_level)
-        triage_engine = TriageEngine(strict_level=strict_level) if triage else None
+        # CSV holds one category per file: a file --out would be overwritten (batch)
+        # or fail mid-run (stream) once a second category shows up
+        if target == "csv" and not dry_run and _names_file(output_path):
+            logger.error(f"--out for CSV must be a directory (one file per category), not {output_path}")
+            return 3
+
         deduplicator = Deduplicator()
 
         # Select writer
         if target == "csv":
             writer = CSVWriter(annotate_inline=csv_annotate)
         elif target == "xlsx":
-            writer = XLSXWriter(highlight_color=highlight_color)
+            writer = XLSXWriter(highlight_color=highlight_color, append=xlsx_append)
         elif target == "google-sheets":
             if no_network:
                 logger.error("Google Sheets requires network access (remove --no-network)")
@@ -101,144 +103,89 @@ def parse_command(
                 sheet_id=sheet_id,
                 highlight_color=highlight_color,
                 credentials_path=credentials_path,
+                staged=not stream,  # Batch runs send every category in one commit on close()
             )
         else:
             logger.error(f"Unsupported target: {target}")
             return 3
 
-        # Find images
-        image_files = find_image_files(input_path)
-        if not image_files:
-            logger.warning(f"No images found in {input_path}")
+        # Find images and PDF pages (scanned lazily, so processing starts with the
+        # first match; PDFs expand to one work item per page)
+        image_iter = iter_work_items(iter_input_files(input_path, exclude=exclude))
+        first_image = next(image_iter, None)
+        if first_image is None:
+            logger.warning(f"No images or PDFs found in {input_path}")
             return 2
-
-        logger.info(f"Found {len(image_files)} image(s)")
-
-        # Process images
+        image_files = chain([first_image], image_iter)
+
+        if workers > 1:
+            logger.info(f"Processing with {workers} worker processes")
+
+        # Streaming pushes rows to per-category sinks as they are produced instead of
+        # holding them until the end (a dry run never writes, so it always buffers)
+        stream = stream and not dry_run
+        if not dry_run and target in ["csv", "xlsx"] and not output_path.exists():
+            if _names_file(output_path):
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+            else:
+                output_path.mkdir(parents=True)  # --out is a directory unless it names a file
+        apply_highlights = triage and target in ["xlsx", "google-sheets"]
+        report = ReportAccumulator()
+        sinks = {}  # category -> RowSink (stream mode)
+
+        # Process images (results arrive in input order, so dedupe/grouping is deterministic)
         all_rows_by_category = {}  # Group by category for reporting
-
-        for img_path in image_files:
-            try:
-                logger.info(f"Processing {img_path.name}...")
-
-                # Load and preprocess
-                image = load_image(img_path)
-                # Try enhanced preprocessing for better OCR (binarization helps low-quality images)
-                processed = preprocess_image(image, binarize=True, enhance_contrast=True)
-
-                # OCR - try default settings first
-                ocr_result = ocr_backend.extract(processed)
-                
-                # If confidence is very low, try alternative PSM mode (single column)
-                if ocr_result.confidence < 0.50 and hasattr(ocr_backend, 'extract'):
-                    logger.warning(f"⚠️  Low OCR confidence ({ocr_result.confidence:.2f}), trying alternative mode...")
-                    try:
-                        alt_result = ocr_backend.extract(processed, psm=3)  # Fully automatic page segmentation
-                        if alt_result.confidence > ocr_result.confidence:
-                            ocr_result = alt_result
-                            logger.info(f"✓ Better OCR with alternative mode: {ocr_result.confidence:.2f}")
-                    except Exception:
-                        pass  # Fall back to original result
-                
-                # Log OCR text for debugging in dry-run mode
-                if dry_run:
-                    ocr_preview = ocr_result.text[:500].replace('\n', ' ').strip() if ocr_result.text else "(empty)"
-                    logger.info(f"OCR confidence: {ocr_result.confidence:.2f}")
-                    if ocr_result.confidence < 0.50:
-                        logger.warning(f"⚠️  Low OCR confidence - extracted text may be unreliable")
-                    if ocr_result.text:
-                        logger.info(f"OCR extracted text (first 500 chars): {ocr_preview}...")
-                        if len(ocr_result.text) > 500:
-                            logger.info(f"... (total {len(ocr_result.text)} characters)")
-                    else:
-                        logger.warning(f"⚠️  OCR extracted no text from {img_path.name} - image might be too blurry, dark, or contain no text")
-
-                # Detect document type (checks/statements vs receipts/invoices)
-                # Simple heuristic: check for check keywords
-                text_lower = ocr_result.text.lower()
-                is_check = any(word in text_lower for word in ["pay to the order", "check", "dollars"])
-                # Bank/credit card statements: look for keywords OR pattern of multiple transactions with amounts
-                is_statement = (
-                    any(word in text_lower for word in ["statement", "balance", "transaction", "account", "card"]) or
-                    _looks_like_statement(ocr_result.text)  # Pattern-based detection
-                )
-                
-                if dry_run:
-                    if is_statement:
-                        logger.info("Detected document type: Bank/Credit Card Statement")
-                    elif is_check:
-                        logger.info("Detected document type: Check")
+        image_count = 0
+
+        try:
+            for img_path, rows in process_images(
+                image_files,
+                workers=workers,
+                config_dir=config_dir,
+                engine=engine,
+                strict_level=strict_level,
+                triage=triage,
+                dry_run=dry_run,
+                ocr_cache_dir=(ocr_cache_dir or get_default_cache_dir()) if ocr_cache else None,
+                ocr_cache_max_bytes=ocr_cache_max_mb * 1024 * 1024,
+                ocr_retry=ocr_retry,
+                preprocess_profile=preprocess_profile,
+                split_statements=split_statements,
+            ):
+                image_count += 1
+                ingest_path = "failed"
+                for row in rows:
+                    ingest_path = row.get("_ingest_path", "image")
+                    # Check duplicates
+                    if deduplicator.is_duplicate(row):
+                        logger.info(f"Skipping duplicate: {img_path.name}")
+                        continue
+                    category = row["_category"]
+                    if stream:
+                        sink = sinks.get(category)
+                        if sink is None:
+                            sink = sinks[category] = writer.open_sink(
+                                output_path, category, apply_highlights=apply_highlights
+                            )
+                        sink.append(row)
+                        report.add(row)
                     else:
-                        logger.info("Detected document type: Receipt/Invoice")
-
-                # Extract fields
-                if is_check:
-                    check_data = extract_check_fields(ocr_result.text)
-                    extracted = {
-                        "date": check_data.get("date"),
-                        "vendor": check_data.get("payee"),
-                        "amount": check_data.get("amount_digits"),
-                        "amount_words": check_data.get("amount_words"),
-                        "check_number": check_data.get("check_number"),
-                        "memo": check_data.get("memo"),
-                        "_ocr_confidence": ocr_result.confidence,
-                        "_low_conf_tokens": [t for t in ocr_result.tokens if t.get("confidence", 1.0) < 0.80],
-                    }
-                    # Log what was extracted for debugging
-                    if dry_run:
-                        logger.info(f"Extracted from check - Date: {extracted.get('date')}, Payee: {extracted.get('vendor')}, Amount: {extracted.get('amount')}, Check #: {extracted.get('check_number')}")
-                        if not any([extracted.get('vendor'), extracted.get('amount'), extracted.get('date')]):
-                            logger.warning("⚠️  Check extraction found minimal fields - OCR may need improvement")
-                elif is_statement:
-                    stmt_data = extract_statement_fields(ocr_result.text)
-                    extracted = {
-                        "date": stmt_data.get("date"),
-                        "vendor": stmt_data.get("description"),
-                        "amount": stmt_data.get("amount"),
-                        "description": stmt_data.get("description"),
-                        "_ocr_confidence": ocr_result.confidence,
-                        "_low_conf_tokens": [t for t in ocr_result.tokens if t.get("confidence", 1.0) < 0.80],
-                    }
-                    # Log what was extracted for debugging
-                    if dry_run:
-                        logger.info(f"Extracted from statement - Date: {extracted.get('date')}, Amount: {extracted.get('amount')}, Vendor: {extracted.get('vendor')}")
-                        if not extracted.get("vendor") and not extracted.get("amount"):
-                            logger.warning("⚠️  Statement extraction found no transactions - check OCR text quality")
-                else:
-                    # Standard receipt/invoice
-                    extracted = extractor.extract_all(ocr_result)
-                    # Log what was extracted for debugging
-                    if dry_run:
-                        logger.info(f"Extracted fields - Date: {extracted.get('date')}, Amount: {extracted.get('amount')}, Vendor: {extracted.get('vendor')}")
-
-                # Classify
-                category, category_conf, hints = classifier.classify(extracted)
-
-                # Build normalized row
-                row = build_normalized_row(extracted, str(img_path), category, hints)
-
-                # Validate
-                violations = validator.validate_row(row, category)
-
-                # Triage
-                if triage_engine:
-                    row = triage_engine.analyze_row(row, violations)
-                
-                # Update missing fields with explanations based on flags
-                from itbl.normalize.schemas import update_row_with_explanations
-                row = update_row_with_explanations(row)
-
-                # Check duplicates
-                if not deduplicator.is_duplicate(row):
-                    if category not in all_rows_by_category:
-                        all_rows_by_category[category] = []
-                    all_rows_by_category[category].append(row)
-                else:
-                    logger.info(f"Skipping duplicate: {img_path.name}")
-
-            except Exception as e:
-                logger.error(f"Error processing {img_path.name}: {e}", exc_info=True)
-                continue
+                        if category not in all_rows_by_category:
+                            all_rows_by_category[category] = []
+                        all_rows_by_category[category].append(row)
+                report.add_ingest(ingest_path)
+        finally:
+            # Keep whatever was streamed so far, even if processing failed
+            for category, sink in sinks.items():
+                sink.close()
+                logger.info(f"Wrote {sink.rows_written} rows to {category}")
+            if sinks:
+                writer.close()
+
+        logger.info(
+            f"Processed {image_count} image(s)/page(s): "
+            + ", ".join(f"{path}={count}" for path, count in report.ingest_counts.items())
+        )
 
         if dry_run:
             total = sum(len(rows) for rows in all_rows_by_category.values())
@@ -248,10 +195,10 @@ def parse_command(
             logger.info("EXAMPLE: What will be written to your workbook")
             logger.info("=" * 60)
             
+            sheets_config = load_sheets_config(config_dir)
             for category, rows in all_rows_by_category.items():
                 logger.info("")
                 logger.info(f"📋 Category/Tab: {category}")
-                sheets_config = load_sheets_config()
                 columns = sheets_config["tabs"].get(category, [])
                 logger.info(f"   Columns: {', '.join(columns)}")
                 
@@ -277,33 +224,31 @@ def parse_command(
             return 0
 
         # Write output by category
-        total_rows = 0
-        for category, rows in all_rows_by_category.items():
-            if not rows:
-                continue
-
-            apply_highlights = triage and target in ["xlsx", "google-sheets"]
-            writer.write(
-                rows,
-                output_path,
-                category,
-                apply_highlights=apply_highlights,
-            )
-            total_rows += len(rows)
-            logger.info(f"Wrote {len(rows)} rows to {category}")
+        if not stream:
+            for category, rows in all_rows_by_category.items():
+                if not rows:
+                    continue
+
+                writer.write(
+                    rows,
+                    output_path,
+                    category,
+                    apply_highlights=apply_highlights,
+                )
+                for row in rows:
+                    report.add(row, category)
+                logger.info(f"Wrote {len(rows)} rows to {category}")
+            writer.close()
 
-        if total_rows == 0:
+        if report.total_rows == 0:
             logger.warning("No rows to write")
             return 2
 
         # Generate report
-        generate_report(all_rows_by_category, output_path)
+        report.write(output_path)
 
         # Check if any rows were flagged
-        has_flags = any(
-            any(r.get("_flags") for r in rows)
-            for rows in all_rows_by_category.values()
-        )
+        has_flags = report.total_flagged > 0
 
         return 2 if has_flags else 0  # 2 = staged if flags present
 
@@ -318,15 +263,28 @@ def write_command(
     apply_highlights: bool = False,
     input_path: Optional[Path] = None,
     credentials_path: Optional[Path] = None,
+    chunk_size: int = COMMIT_CHUNK_ROWS,
+    restart: bool = False,
+    config_dir: Optional[Path] = None,
 ) -> int:
     """
     Write staged output to Google Sheets.
+
+    Staged CSV/XLSX files (from 'itbl parse --target csv/xlsx') are read in
+    chunks and each chunk is committed in one batch. Progress is checkpointed
+    after every chunk, so an interrupted upload resumes where it stopped.
     
     Args:
         target: Output target (google-sheets)
         sheet_id: Google Sheets ID
         apply_highlights: Apply yellow highlighting
-        input_path: Path to staged CSV/XLSX files (not yet implemented)
+        input_path: Staging directory or staged CSV/XLSX file (default: ./staging)
+        chunk_size: Rows per committed chunk (at most COMMIT_CHUNK_ROWS, one batch)
+        restart: Ignore the checkpoint and upload everything again
+        config_dir: Config directory (category names for CSV file names)
+
+    Returns:
+        Exit code: 0 = success, 2 = nothing to upload, 3 = fatal error
     """
     if target != "google-sheets":
         logger.error(f"write command only supports google-sheets, got {target}")
@@ -336,15 +294,52 @@ def write_command(
         logger.error("--sheet-id required")
         return 3
 
+    if chunk_size < 1:
+        logger.error("--chunk-size must be at least 1")
+        return 3
+    if chunk_size > COMMIT_CHUNK_ROWS:
+        # A larger chunk spans several batchUpdates, and the checkpoint only
+        # advances per chunk: a failure after the first batch would re-send it
+        logger.error(f"--chunk-size can be at most {COMMIT_CHUNK_ROWS} (one batch per checkpoint)")
+        return 3
+
+    input_path = input_path or Path("./staging")
+    if not input_path.exists():
+        logger.error(f"Staged input not found: {input_path}")
+        return 3
+
     try:
+        tabs = load_sheets_config(config_dir or get_config_dir()).get("tabs", {})
+        sources = find_staged_sources(input_path, tabs)
+        if not sources:
+            logger.warning(f"No staged CSV/XLSX files found in {input_path}")
+            return 2
+
         writer = GoogleSheetsWriter(
             sheet_id=sheet_id,
             credentials_path=credentials_path,
+            staged=True,
         )
-        # TODO: Read from staged files and write to Sheets
-        logger.warning("write command: reading from staged files not yet implemented")
-        logger.info("Use 'itbl parse' with --target google-sheets instead")
-        return 3
+        checkpoint_dir = input_path if input_path.is_dir() else input_path.parent
+        checkpoint = UploadCheckpoint(checkpoint_dir / CHECKPOINT_FILE, sheet_id)
+        if restart:
+            checkpoint.reset()
+
+        uploaded = 0
+        for source in sources:
+            done = checkpoint.rows_done(source)
+            if done:
+                logger.info(f"Resuming {source} after {done} uploaded rows")
+            for chunk in iter_chunks(source.iter_rows(), chunk_size, skip=done):
+                writer.write(chunk, input_path, source.category, apply_highlights=apply_highlights)
+                writer.commit()
+                done += len(chunk)
+                uploaded += len(chunk)
+                checkpoint.record(source, done)
+                logger.info(f"Uploaded {done} rows of {source} to {source.category}")
+
+        logger.info(f"Uploaded {uploaded} rows from {len(sources)} staged source(s)")
+        return 0
     except Exception as e:
         logger.error(f"Error writing to Sheets: {e}")
         return 3
@@ -389,7 +384,7 @@ def main():
     parse_parser = subparsers.add_parser("parse", help="Parse images and stage output")
     parse_parser.add_argument("input", type=Path, help="Input path (file or directory)")
     parse_parser.add_argument("--out", type=Path, default=Path("./staging"), help="Output path")
-    parse_parser.add_argument("--engine", default="tesseract", help="OCR engine (default: tesseract)")
+    parse_parser.add_argument("--engine", default="tesseract", help="OCR engine: tesseract (default) or tesseract-api (in-process libtesseract, no per-image process startup)")
     parse_parser.add_argument("--target", default="csv", choices=["csv", "xlsx", "google-sheets"], help="Output target")
     parse_parser.add_argument("--triage", action="store_true", help="Enable triage mode")
     parse_parser.add_argument("--strict-level", default="medium", choices=["low", "medium", "high"], help="Strictness level")
@@ -400,13 +395,26 @@ def main():
     parse_parser.add_argument("--no-network", action="store_true", default=True, help="Enforce offline mode")
     parse_parser.add_argument("--sheet-id", help="Google Sheets ID (required for google-sheets target)")
     parse_parser.add_argument("--credentials", type=Path, help="Path to Google credentials JSON file (optional, auto-detected if not specified)")
+    parse_parser.add_argument("--workers", type=int, default=1, help="Worker processes for OCR/extraction (default: 1 = serial)")
+    parse_parser.add_argument("--no-ocr-cache", action="store_true", help="Always re-run OCR (ignore and don't update the OCR result cache)")
+    parse_parser.add_argument("--ocr-cache-dir", type=Path, help="OCR result cache directory (default: ~/.cache/itbl/ocr)")
+    parse_parser.add_argument("--ocr-cache-max-mb", type=int, default=512, help="OCR cache size limit in MB (default: 512)")
+    parse_parser.add_argument("--ocr-retry", default="auto", choices=["auto", "serial", "speculative"], help="Low-confidence OCR retry: serial, speculative (both modes concurrently), or auto (speculative for likely low-quality images)")
+    parse_parser.add_argument("--preprocess-profile", default="max-quality", choices=["fast", "balanced", "max-quality"], help="Image preprocessing: fast (downscale, no denoise), balanced (downscale + bilateral filter), max-quality (full-resolution NL-means, default)")
+    parse_parser.add_argument("--exclude", action="append", metavar="PATTERN", help="Skip files/directories matching this glob (name or path relative to input; repeatable)")
+    parse_parser.add_argument("--stream", action="store_true", help="Write rows as they are produced (flat memory, partial output kept if a run fails)")
+    parse_parser.add_argument("--xlsx-append", action="store_true", help="Append rows to existing XLSX workbooks (matching sheets) instead of overwriting them")
+    parse_parser.add_argument("--split-statements", action="store_true", help="Write one row per bank/credit card statement transaction instead of one per statement")
 
     # write command
     write_parser = subparsers.add_parser("write", help="Write to Google Sheets")
     write_parser.add_argument("--target", default="google-sheets", help="Target")
     write_parser.add_argument("--sheet-id", required=True, help="Google Sheets ID")
     write_parser.add_argument("--apply-highlights", action="store_true", help="Apply yellow highlights")
-    write_parser.add_argument("--input", type=Path, help="Staged input path (not yet implemented)")
+    write_parser.add_argument("--input", type=Path, default=Path("./staging"), help="Staging directory or staged CSV/XLSX file (default: ./staging)")
+    write_parser.add_argument("--chunk-size", type=int, default=COMMIT_CHUNK_ROWS, help=f"Rows per committed batch (progress is checkpointed after each; default and maximum: {COMMIT_CHUNK_ROWS})")
+    write_parser.add_argument("--restart", action="store_true", help="Ignore the upload checkpoint and upload all staged rows again")
+    write_parser.add_argument("--config", type=Path, help="Config directory")
     write_parser.add_argument("--credentials", type=Path, help="Path to Google credentials JSON file (optional, auto-detected if not specified)")
 
     # review command
@@ -443,6 +451,16 @@ def main():
             no_network=args.no_network,
             sheet_id=getattr(args, "sheet_id", None),
             credentials_path=getattr(args, "credentials", None),
+            workers=args.workers,
+            ocr_cache=not args.no_ocr_cache,
+            ocr_cache_dir=args.ocr_cache_dir,
+            ocr_cache_max_mb=args.ocr_cache_max_mb,
+            ocr_retry=args.ocr_retry,
+            preprocess_profile=args.preprocess_profile,
+            exclude=args.exclude,
+            stream=args.stream,
+            xlsx_append=args.xlsx_append,
+            split_statements=args.split_statements,
         )
     elif args.command == "write":
         return write_command(
@@ -451,6 +469,9 @@ def main():
             apply_highlights=args.apply_highlights,
             input_path=getattr(args, "input", None),
             credentials_path=getattr(args, "credentials", None),
+            chunk_size=args.chunk_size,
+            restart=args.restart,
+            config_dir=args.config,
         )
     elif args.command == "review":
         return review_command(args.input)
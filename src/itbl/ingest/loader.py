@@ -1,11 +1,17 @@
 """File loader for images and PDFs."""
 
+import fnmatch
 import io
+import os
 from pathlib import Path
-from typing import Iterator, List
+from typing import Iterable, Iterator, List, Optional
 
 from PIL import Image
 
+from itbl.util.logging import setup_logging
+
+logger = setup_logging()
+
 # Try to register HEIC support if pillow-heif is available
 try:
     from pillow_heif import register_heif_opener
@@ -14,65 +20,139 @@ try:
 except ImportError:
     HEIC_SUPPORTED = False
 
+# PDF rendering uses pypdfium2 if available (pip install itbl[pdf])
+try:
+    import pypdfium2 as pdfium
+    PDF_SUPPORTED = True
+except ImportError:
+    PDF_SUPPORTED = False
+
 
 # Supported image extensions
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tiff", ".tif", ".heic", ".heif"}
 PDF_EXTENSIONS = {".pdf"}
 
+# PDF user space units per inch
+PDF_POINTS_PER_INCH = 72.0
+
+
+
+def iter_files(
+    path: Path,
+    extensions: Iterable[str],
+    recursive: bool = True,
+    exclude: Optional[Iterable[str]] = None,
+) -> Iterator[Path]:
+    """
+    Lazily yield files with matching extensions in sorted order.
+
+    Walks the tree once with os.scandir (one directory listing per directory,
+    no per-file stat or resolve), matching extensions case-insensitively.
+    Entries are sorted per directory, so paths come out in the same order as
+    sorting the full list. Symlinked directories are not followed.
+
+    Args:
+        path: File or directory
+        extensions: Lowercase extensions including the dot (e.g. {".jpg"})
+        recursive: Descend into subdirectories
+        exclude: Glob patterns matched against each entry's name and its path
+            relative to the input directory (matching directories are skipped)
+
+    Yields:
+        Matching file paths
+    """
+    extensions = {ext.lower() for ext in extensions}
+    exclude = list(exclude or [])
+    path = Path(path)
 
-def find_image_files(path: Path, recursive: bool = True) -> List[Path]:
-    """Find all supported image files in a path."""
-    files = []
     if path.is_file():
-        if path.suffix.lower() in IMAGE_EXTENSIONS:
-            files.append(path)
-    elif path.is_dir():
-        pattern = "**/*" if recursive else "*"
-        for ext in IMAGE_EXTENSIONS:
-            files.extend(path.glob(f"{pattern}{ext}"))
-            files.extend(path.glob(f"{pattern}{ext.upper()}"))
-    
-    # Deduplicate (important on Windows where filesystem is case-insensitive)
-    # Convert to absolute paths and use a set to remove duplicates
-    seen = set()
-    unique_files = []
-    for f in files:
-        abs_path = f.resolve()
-        if abs_path not in seen:
-            seen.add(abs_path)
-            unique_files.append(f)
-    
-    return sorted(unique_files)
+        if path.suffix.lower() in extensions and not _is_excluded(path.name, path.name, exclude):
+            yield path
+        return
+    if not path.is_dir():
+        return
+
+    def walk(directory: str, rel_prefix: str) -> Iterator[Path]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return  # Unreadable directory
+        for entry in entries:
+            rel_path = rel_prefix + entry.name
+            if _is_excluded(entry.name, rel_path, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from walk(entry.path, rel_path + "/")
+                elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                    yield Path(entry.path)
+            except OSError:
+                continue  # Entry vanished or is unreadable
+
+    yield from walk(str(path), "")
+
+
+def _is_excluded(name: str, rel_path: str, patterns: List[str]) -> bool:
+    """Check an entry's name and relative path against exclude globs."""
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern)
+        for pattern in patterns
+    )
 
 
-def find_pdf_files(path: Path, recursive: bool = True) -> List[Path]:
+def iter_image_files(
+    path: Path, recursive: bool = True, exclude: Optional[Iterable[str]] = None
+) -> Iterator[Path]:
+    """Lazily yield supported image files in sorted order (see iter_files)."""
+    return iter_files(path, IMAGE_EXTENSIONS, recursive=recursive, exclude=exclude)
+
+
+def find_image_files(
+    path: Path, recursive: bool = True, exclude: Optional[Iterable[str]] = None
+) -> List[Path]:
+    """Find all supported image files in a path."""
+    return list(iter_image_files(path, recursive=recursive, exclude=exclude))
+
+
+def iter_input_files(
+    path: Path, recursive: bool = True, exclude: Optional[Iterable[str]] = None
+) -> Iterator[Path]:
+    """Lazily yield image and PDF files in sorted order (see iter_files)."""
+    return iter_files(path, IMAGE_EXTENSIONS | PDF_EXTENSIONS, recursive=recursive, exclude=exclude)
+
+
+def find_pdf_files(
+    path: Path, recursive: bool = True, exclude: Optional[Iterable[str]] = None
+) -> List[Path]:
     """Find all PDF files in a path."""
-    files = []
-    if path.is_file():
-        if path.suffix.lower() in PDF_EXTENSIONS:
-            files.append(path)
-    elif path.is_dir():
-        pattern = "**/*" if recursive else "*"
-        files.extend(path.glob(f"{pattern}.pdf"))
-        files.extend(path.glob(f"{pattern}.PDF"))
-    
-    # Deduplicate (important on Windows where filesystem is case-insensitive)
-    seen = set()
-    unique_files = []
-    for f in files:
-        abs_path = f.resolve()
-        if abs_path not in seen:
-            seen.add(abs_path)
-            unique_files.append(f)
-    
-    return sorted(unique_files)
+    return list(iter_files(path, PDF_EXTENSIONS, recursive=recursive, exclude=exclude))
 
 
-def load_image(file_path: Path) -> Image.Image:
+def load_image(file_path: Path, dpi: Optional[int] = None, max_side: Optional[int] = None) -> Image.Image:
     """
-    Load an image file.
+    Load an image file, optionally at reduced resolution.
     
     Supports: JPG, PNG, TIFF, HEIC (if pillow-heif is installed)
+
+    With dpi and/or max_side the image is reduced as early as possible: JPEGs are
+    decoded directly at a smaller DCT scale (Image.draft), other formats are
+    resampled right after decoding. The original size and the applied scale are
+    recorded in image.info["source_size"] and image.info["source_scale"] so token
+    coordinates can be mapped back to the original image.
+
+    The page size is only known from the file's own resolution (image.info["dpi"]),
+    so dpi reduces scans stored above the target DPI; photos and images without
+    DPI metadata are only limited by max_side.
+
+    Args:
+        file_path: Image file path
+        dpi: Target OCR DPI (applied to images whose stored DPI is higher)
+        max_side: Cap on the longer side in pixels
+    
+    Returns:
+        PIL Image (never enlarged)
     """
     # Check for HEIC/HEIF files and provide helpful error if not supported
     if file_path.suffix.lower() in {".heic", ".heif"}:
@@ -84,7 +164,7 @@ def load_image(file_path: Path) -> Image.Image:
             )
     
     try:
-        return Image.open(file_path)
+        image = Image.open(file_path)
     except Exception as e:
         # Provide more helpful error for HEIC files
         if file_path.suffix.lower() in {".heic", ".heif"}:
@@ -95,16 +175,193 @@ def load_image(file_path: Path) -> Image.Image:
             ) from e
         raise IOError(f"Failed to load image {file_path}: {e}") from e
 
+    return _reduce_image(image, _target_long_side(image, dpi, max_side))
+
+
+def _target_long_side(
+    image: Image.Image, dpi: Optional[int], max_side: Optional[int]
+) -> Optional[int]:
+    """Longest side needed for the target DPI / size cap (None = no limit)."""
+    limits = [max_side] if max_side else []
+    try:
+        source_dpi = min(float(value) for value in image.info["dpi"])
+    except (KeyError, TypeError, ValueError):
+        source_dpi = 0.0  # Unknown page size: the DPI gives no cap
+    if dpi and source_dpi > dpi:
+        limits.append(int(max(image.size) * dpi / source_dpi))
+    return min(limits) if limits else None
+
+
+def _reduce_image(image: Image.Image, target: Optional[int]) -> Image.Image:
+    """Downscale so the longer side is at most target, recording the scale in image.info."""
+    source_size = image.size
+    if target and max(source_size) > target:
+        scale = target / max(source_size)
+        size = (max(1, round(source_size[0] * scale)), max(1, round(source_size[1] * scale)))
+        if image.format == "JPEG":
+            # Decode at the smallest DCT scale (1/2, 1/4, 1/8) that is still >= size
+            image.draft(image.mode, size)
+        if image.size != size:
+            image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    image.info["source_size"] = source_size
+    image.info["source_scale"] = image.size[0] / source_size[0]
+    return image
+
 
-def split_pdf_pages(pdf_path: Path) -> Iterator[Image.Image]:
+class PDFPage:
+    """Reference to one page of a PDF file (a lightweight, picklable work item)."""
+
+    def __init__(self, path: Path, page_number: int, page_count: int):
+        """
+        Initialize PDF page reference.
+
+        Args:
+            path: PDF file path
+            page_number: 1-based page number
+            page_count: Number of pages in the document
+        """
+        self.path = Path(path)
+        self.page_number = page_number
+        self.page_count = page_count
+
+    @property
+    def name(self) -> str:
+        """Display name, e.g. statement.pdf#page=3."""
+        return f"{self.path.name}#page={self.page_number}"
+
+    def __str__(self) -> str:
+        return f"{self.path}#page={self.page_number}"
+
+    def __repr__(self) -> str:
+        return f"PDFPage({str(self)!r}, page_count={self.page_count})"
+
+
+def _require_pdf_support() -> None:
+    """Raise a helpful error if pypdfium2 is missing."""
+    if not PDF_SUPPORTED:
+        raise ImportError(
+            "PDF support requires pypdfium2. Install: pip install pypdfium2 "
+            "(or pip install itbl[pdf])"
+        )
+
+
+def count_pdf_pages(pdf_path: Path) -> int:
+    """Count pages without rendering anything."""
+    _require_pdf_support()
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def iter_pdf_pages(pdf_path: Path) -> Iterator[PDFPage]:
     """
-    Split a PDF into page images.
-    
-    Note: This is a placeholder. Full PDF support would require pdf2image or similar.
-    For now, we skip PDFs and document that they require additional dependencies.
+    Lazily yield one PDFPage reference per page.
+
+    Args:
+        pdf_path: PDF file path
+
+    Yields:
+        PDFPage references (pages are rendered later, one at a time)
     """
-    # TODO: Implement with pdf2image when needed
-    raise NotImplementedError(
-        "PDF support requires pdf2image. Install: pip install pdf2image"
-    )
+    page_count = count_pdf_pages(pdf_path)
+    for page_number in range(1, page_count + 1):
+        yield PDFPage(pdf_path, page_number, page_count)
+
+
+def iter_work_items(paths: Iterable[Path]) -> Iterator["Path | PDFPage"]:
+    """
+    Expand input files into pipeline work items.
+
+    Images pass through unchanged; each PDF becomes one PDFPage per page. PDFs
+    are skipped with a warning if pypdfium2 is not installed or the file
+    can't be opened.
+
+    Args:
+        paths: Image and PDF paths (e.g. from iter_input_files)
 
+    Yields:
+        Image paths and PDFPage references
+    """
+    for path in paths:
+        if path.suffix.lower() not in PDF_EXTENSIONS:
+            yield path
+            continue
+        try:
+            yield from iter_pdf_pages(path)
+        except ImportError as e:
+            logger.warning(f"Skipping {path.name}: {e}")
+        except Exception as e:
+            logger.error(f"Could not open PDF {path.name}: {e}")
+
+
+def _render_page(
+    pdf: "pdfium.PdfDocument", index: int, dpi: int, max_side: Optional[int]
+) -> Image.Image:
+    """Render one page to a grayscale PIL image at the target DPI."""
+    page = pdf[index]
+    try:
+        width_pt, height_pt = page.get_size()
+        scale = dpi / PDF_POINTS_PER_INCH
+        if max_side:
+            scale = min(scale, max_side / max(width_pt, height_pt))
+        bitmap = page.render(scale=scale, grayscale=True)
+        try:
+            image = bitmap.to_pil().copy()  # Detach from the pdfium buffer
+        finally:
+            bitmap.close()
+    finally:
+        page.close()
+
+    # Source units for PDFs are points: token box / source_scale = PDF coordinates
+    image.info["source_size"] = (width_pt, height_pt)
+    image.info["source_scale"] = scale
+    return image
+
+
+def render_pdf_page(
+    pdf_path: Path, page_number: int, dpi: int = 300, max_side: Optional[int] = None
+) -> Image.Image:
+    """
+    Rasterize a single PDF page.
+
+    Only the requested page is rendered, so memory is bounded by one page
+    regardless of document length.
+
+    Args:
+        pdf_path: PDF file path
+        page_number: 1-based page number
+        dpi: Render resolution
+        max_side: Cap on the longer side in pixels
+
+    Returns:
+        Grayscale PIL Image with source_size/source_scale in image.info
+    """
+    _require_pdf_support()
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        return _render_page(pdf, page_number - 1, dpi, max_side)
+    finally:
+        pdf.close()
+
+
+def split_pdf_pages(pdf_path: Path, dpi: int = 300) -> Iterator[Image.Image]:
+    """
+    Split a PDF into page images, rendered one page at a time.
+
+    Args:
+        pdf_path: PDF file path
+        dpi: Render resolution
+
+    Yields:
+        PIL Image per page (the previous page can be freed before the next renders)
+    """
+    _require_pdf_support()
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        for index in range(len(pdf)):
+            yield _render_page(pdf, index, dpi, None)
+    finally:
+        pdf.close()
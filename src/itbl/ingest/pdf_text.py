@@ -0,0 +1,126 @@
+"""Text-layer extraction for born-digital PDF pages (skips rasterization and OCR)."""
+
+from pathlib import Path
+from typing import Optional
+
+from itbl.ingest.loader import PDF_POINTS_PER_INCH, PDF_SUPPORTED
+from itbl.ocr.base import OCRResult, TokenTable
+
+if PDF_SUPPORTED:
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+# Pages with fewer non-whitespace characters than this are treated as scans
+MIN_TEXT_LAYER_CHARS = 20
+
+# Vertical gap (in line heights) that starts a new paragraph
+PARAGRAPH_GAP = 1.0
+
+
+def extract_pdf_text_layer(pdf_path: Path, page_number: int, dpi: int = 300) -> Optional[OCRResult]:
+    """
+    Build an OCRResult from a PDF page's embedded text layer.
+
+    Words are assembled from the page's characters (split on whitespace and the
+    line breaks pdfium inserts), with boxes converted to top-left-origin pixels
+    at the given DPI, the same coordinate space as OCR tokens for a page
+    rendered at that DPI. Confidence is 1.0.
+
+    Args:
+        pdf_path: PDF file path
+        page_number: 1-based page number
+        dpi: Resolution used for token coordinates
+
+    Returns:
+        OCRResult (layout mode "pdf-text"), or None if pypdfium2 is missing or
+        the page has no usable text layer (e.g. a scanned page)
+    """
+    if not PDF_SUPPORTED:
+        return None
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        page = pdf[page_number - 1]
+        try:
+            textpage = page.get_textpage()
+            try:
+                _, page_height = page.get_size()
+                tokens = _tokens_from_textpage(textpage, page_height, dpi / PDF_POINTS_PER_INCH)
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+    finally:
+        pdf.close()
+
+    if sum(len(text) for text in tokens.text) < MIN_TEXT_LAYER_CHARS:
+        return None
+
+    scale = dpi / PDF_POINTS_PER_INCH
+    return OCRResult(
+        text=tokens.to_text(),
+        confidence=1.0,
+        tokens=tokens,
+        layout={"mode": "pdf-text", "source_scale": scale, "retry_strategy": "pdf-text"},
+    )
+
+
+def _tokens_from_textpage(textpage: "pdfium.PdfTextPage", page_height: float, scale: float) -> TokenTable:
+    """Group text-layer characters into word tokens with paragraph/line/word numbering."""
+    tokens = TokenTable()
+    raw = textpage.raw
+
+    par, line, word = 1, 1, 0
+    prev_line = None  # (bottom, height) of the previous non-empty line, PDF points
+    line_box = None  # (bottom, height) of the current line so far
+    chars, box = [], None  # Current word and its [left, bottom, right, top]
+
+    def flush() -> None:
+        nonlocal par, line, word, line_box, chars, box
+        if not chars:
+            return
+        left, bottom, right, top = box
+        if word == 0 and prev_line is not None:
+            # A gap of more than PARAGRAPH_GAP line heights starts a new paragraph
+            prev_bottom, prev_height = prev_line
+            if prev_bottom - top > PARAGRAPH_GAP * prev_height:
+                par, line = par + 1, 1
+        word += 1
+        tokens.append(
+            text="".join(chars),
+            confidence=1.0,
+            left=round(left * scale),
+            top=round((page_height - top) * scale),
+            width=round((right - left) * scale),
+            height=round((top - bottom) * scale),
+            block=1,
+            par=par,
+            line=line,
+            word=word,
+        )
+        if line_box is None:
+            line_box = (bottom, top - bottom)
+        else:
+            line_box = (min(line_box[0], bottom), max(line_box[1], top - bottom))
+        chars, box = [], None
+
+    for index in range(textpage.count_chars()):
+        char = chr(pdfium_c.FPDFText_GetUnicode(raw, index))
+        if char in "\r\n":
+            flush()
+            if word:
+                prev_line, line_box = line_box, None
+                line, word = line + 1, 0
+            continue
+        if char.isspace() or char == "\x00":
+            flush()
+            continue
+
+        left, bottom, right, top = textpage.get_charbox(index)
+        if box is None:
+            box = [left, bottom, right, top]
+        else:
+            box = [min(box[0], left), min(box[1], bottom), max(box[2], right), max(box[3], top)]
+        chars.append(char)
+    flush()
+    return tokens
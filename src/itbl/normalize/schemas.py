@@ -2,6 +2,7 @@
 
 import uuid
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 
 from itbl.util.config import load_sheets_config
@@ -108,6 +109,7 @@ def build_normalized_row(
     source_file: str,
     category: str,
     hints: Dict | None = None,
+    config_dir: Path | str | None = None,
 ) -> Dict:
     """
     Build a normalized row for any category tab.
@@ -117,12 +119,13 @@ def build_normalized_row(
         source_file: Source image path
         category: Category/tab name
         hints: Optional hints from vendor map or classification
+        config_dir: Config directory for sheets.yaml (default: auto-detected)
     
     Returns:
         Normalized row dict with tab columns
     """
     hints = hints or {}
-    sheets_config = load_sheets_config()
+    sheets_config = load_sheets_config(config_dir)
     columns = sheets_config["tabs"].get(category, [])
 
     row = {
@@ -190,6 +193,8 @@ def build_normalized_row(
     row["_vendor_confidence"] = extracted.get("_vendor_confidence", 0.0)
     row["_ocr_confidence"] = extracted.get("_ocr_confidence", 0.0)
     row["_low_conf_tokens"] = extracted.get("_low_conf_tokens", [])
+    row["_ocr_strategy"] = extracted.get("_ocr_strategy")
+    row["_ingest_path"] = extracted.get("_ingest_path", "image")
 
     return row
 
@@ -203,8 +208,8 @@ def build_office_supplies_row(
     return build_normalized_row(extracted, source_file, category)
 
 
-def get_all_tab_schemas() -> Dict[str, List[str]]:
+def get_all_tab_schemas(config_dir: Path | str | None = None) -> Dict[str, List[str]]:
     """Get all tab column schemas from config."""
-    sheets_config = load_sheets_config()
+    sheets_config = load_sheets_config(config_dir)
     return sheets_config.get("tabs", {})
 
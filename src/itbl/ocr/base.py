@@ -1,11 +1,147 @@
 """Base OCR backend interface."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
 from PIL import Image
 
 
+class TokenTable:
+    """
+    Columnar word tokens: parallel lists indexed by token position.
+    
+    Columns are text, confidence (0.0-1.0), bounding box (left, top, width, height)
+    and layout position (block, par, line, word numbers). Storing columns instead
+    of one dict per word keeps dense pages cheap to build, filter and serialize.
+    """
+
+    COLUMNS = ("text", "confidence", "left", "top", "width", "height", "block", "par", "line", "word")
+
+    def __init__(self, columns: Dict[str, List[Any]] | None = None):
+        """
+        Initialize token table.
+        
+        Args:
+            columns: Optional dict of column name -> list (missing columns default to 0)
+        """
+        columns = columns or {}
+        size = len(columns.get("text", []))
+        self.text: List[str] = list(columns.get("text", []))
+        self.confidence: List[float] = list(columns.get("confidence", [1.0] * size))
+        self.left: List[int] = list(columns.get("left", [0] * size))
+        self.top: List[int] = list(columns.get("top", [0] * size))
+        self.width: List[int] = list(columns.get("width", [0] * size))
+        self.height: List[int] = list(columns.get("height", [0] * size))
+        self.block: List[int] = list(columns.get("block", [0] * size))
+        self.par: List[int] = list(columns.get("par", [0] * size))
+        self.line: List[int] = list(columns.get("line", [0] * size))
+        self.word: List[int] = list(columns.get("word", [0] * size))
+
+    @classmethod
+    def from_dicts(cls, tokens: List[Dict[str, Any]]) -> "TokenTable":
+        """Build a table from a list of token dicts (legacy token format)."""
+        table = cls()
+        for token in tokens:
+            table.append(
+                token.get("text", ""),
+                token.get("confidence", 1.0),
+                token.get("left", 0),
+                token.get("top", 0),
+                token.get("width", 0),
+                token.get("height", 0),
+                token.get("block", 0),
+                token.get("par", 0),
+                token.get("line", 0),
+                token.get("word", 0),
+            )
+        return table
+
+    def append(
+        self,
+        text: str,
+        confidence: float,
+        left: int,
+        top: int,
+        width: int,
+        height: int,
+        block: int = 0,
+        par: int = 0,
+        line: int = 0,
+        word: int = 0,
+    ) -> None:
+        """Append one token."""
+        self.text.append(text)
+        self.confidence.append(confidence)
+        self.left.append(left)
+        self.top.append(top)
+        self.width.append(width)
+        self.height.append(height)
+        self.block.append(block)
+        self.par.append(par)
+        self.line.append(line)
+        self.word.append(word)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Get one token as a dict."""
+        return {column: getattr(self, column)[index] for column in self.COLUMNS}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate tokens as dicts."""
+        for index in range(len(self.text)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"TokenTable({len(self.text)} tokens)"
+
+    def select(self, indexes: List[int]) -> "TokenTable":
+        """Build a new table with only the given token positions."""
+        return TokenTable({
+            column: [values[i] for i in indexes]
+            for column, values in self.to_dict().items()
+        })
+
+    def low_confidence(self, threshold: float = 0.80) -> "TokenTable":
+        """Tokens with confidence below threshold."""
+        return self.select([i for i, conf in enumerate(self.confidence) if conf < threshold])
+
+    def to_text(self) -> str:
+        """
+        Rebuild plain text from token layout positions.
+        
+        Words on a line are joined by single spaces, lines by newlines, and
+        paragraphs/blocks are separated by a blank line.
+        """
+        paragraphs: List[List[str]] = []
+        current_para = None
+        current_line = None
+        line_words: List[str] = []
+
+        for text, block, par, line in zip(self.text, self.block, self.par, self.line):
+            para_key = (block, par)
+            line_key = (block, par, line)
+            if line_key != current_line:
+                if line_words:
+                    paragraphs[-1].append(" ".join(line_words))
+                line_words = []
+                current_line = line_key
+                if para_key != current_para:
+                    paragraphs.append([])
+                    current_para = para_key
+            line_words.append(text)
+
+        if line_words:
+            paragraphs[-1].append(" ".join(line_words))
+
+        return "\n\n".join("\n".join(lines) for lines in paragraphs).strip()
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Serialize to a dict of column lists."""
+        return {column: getattr(self, column) for column in self.COLUMNS}
+
+
 class OCRResult:
     """OCR result container."""
 
@@ -13,7 +149,7 @@ class OCRResult:
         self,
         text: str,
         confidence: float,
-        tokens: List[Dict[str, Any]] | None = None,
+        tokens: TokenTable | List[Dict[str, Any]] | None = None,
         layout: Dict | None = None,
     ):
         """
@@ -22,18 +158,56 @@ class OCRResult:
         Args:
             text: Full extracted text
             confidence: Overall confidence (0.0-1.0)
-            tokens: List of token-level results with confidence
+            tokens: Token-level results with confidence (TokenTable or list of dicts)
             layout: Layout information (blocks, lines, words)
         """
         self.text = text
         self.confidence = confidence
-        self.tokens = tokens or []
+        self.tokens = tokens
         self.layout = layout or {}
 
+    @property
+    def tokens(self) -> TokenTable:
+        """Word tokens (columnar; iterating yields token dicts)."""
+        return self.token_table
+
+    @tokens.setter
+    def tokens(self, tokens: TokenTable | List[Dict[str, Any]] | None) -> None:
+        if isinstance(tokens, TokenTable):
+            self.token_table = tokens
+        else:
+            self.token_table = TokenTable.from_dicts(tokens or [])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        return {
+            "text": self.text,
+            "confidence": self.confidence,
+            "tokens": self.token_table.to_dict(),
+            "layout": self.layout,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OCRResult":
+        """Rebuild an OCRResult from to_dict() output."""
+        tokens = data.get("tokens")
+        if isinstance(tokens, dict):
+            tokens = TokenTable(tokens)
+        return cls(
+            text=data["text"],
+            confidence=data["confidence"],
+            tokens=tokens,
+            layout=data.get("layout"),
+        )
+
 
 class OCRBackend(ABC):
     """Base class for OCR backends."""
 
+    # Whether extract() accepts cancel=<threading.Event> and stops a running
+    # pass (raising RuntimeError) once the event is set
+    supports_cancel = False
+
     @abstractmethod
     def extract(self, image: Image.Image, **kwargs) -> OCRResult:
         """
@@ -48,6 +222,21 @@ class OCRBackend(ABC):
         """
         pass
 
+    def settings_key(self, **kwargs) -> str:
+        """
+        Describe the settings that affect recognition output.
+        
+        Used to key cached OCR results; backends should include every option
+        that changes the text they produce.
+        
+        Args:
+            **kwargs: Same overrides accepted by extract()
+        
+        Returns:
+            Stable settings string
+        """
+        return type(self).__name__
+
     @abstractmethod
     def get_confidence_per_token(self, result: OCRResult) -> List[Tuple[str, float]]:
         """
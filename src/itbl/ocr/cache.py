@@ -0,0 +1,170 @@
+"""On-disk OCR result cache keyed by file content and OCR settings."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from itbl.ocr.base import OCRResult
+from itbl.util.logging import setup_logging
+
+logger = setup_logging()
+
+# Bump when the stored format or the meaning of a key changes
+CACHE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+
+def get_default_cache_dir() -> Path:
+    """Get the default OCR cache directory (respects XDG_CACHE_HOME)."""
+    base = os.getenv("XDG_CACHE_HOME")
+    cache_root = Path(base) if base else Path.home() / ".cache"
+    return cache_root / "itbl" / "ocr"
+
+
+class OCRCache:
+    """
+    Content-addressed cache of OCRResult objects with size-bounded LRU eviction.
+
+    Entries are JSON files named by a SHA256 key over the source file hash, the
+    preprocessing options and the OCR backend settings. A cache hit touches the
+    file's mtime, so eviction removes the least recently used entries first.
+    Writes are atomic (temp file + rename), so several worker processes can share
+    one cache directory.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize OCR cache.
+
+        Args:
+            cache_dir: Cache directory (default: ~/.cache/itbl/ocr)
+            max_bytes: Maximum total size of cached entries before eviction
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_default_cache_dir()
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._size_estimate = self._total_size()
+
+    @staticmethod
+    def make_key(file_hash: str, preprocess_options: Dict[str, Any], settings: str) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            file_hash: Content hash of the source file (see itbl.util.hashing.hash_file)
+            preprocess_options: Preprocessing flags applied before OCR
+            settings: OCR backend settings string (see OCRBackend.settings_key)
+
+        Returns:
+            Hex digest key
+        """
+        options = json.dumps(preprocess_options, sort_keys=True, default=str)
+        content = f"v{CACHE_VERSION}|{file_hash}|{options}|{settings}".encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        """Path of the entry file for a key (sharded by key prefix)."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[OCRResult]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            OCRResult, or None on a miss or unreadable entry
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable OCR cache entry {path.name}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return OCRResult.from_dict(data)
+
+    def put(self, key: str, result: OCRResult) -> None:
+        """
+        Store a result, evicting least recently used entries if over the size limit.
+
+        Args:
+            key: Key from make_key()
+            result: OCRResult to cache
+        """
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(result.to_dict(), ensure_ascii=False).encode("utf-8")
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry: {e}")
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            return
+
+        self._size_estimate += len(payload)
+        if self._size_estimate > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache is under 90% of max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        entries.sort(key=lambda e: e[0])
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._size_estimate = total
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+        self._size_estimate = 0
+
+    def _total_size(self) -> int:
+        """Total size of all entries on disk."""
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
@@ -0,0 +1,201 @@
+"""Low-confidence OCR retry strategies (serial or speculative/concurrent)."""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from itbl.ocr.base import OCRBackend, OCRResult
+from itbl.util.logging import setup_logging
+
+logger = setup_logging()
+
+LOW_CONFIDENCE_THRESHOLD = 0.50
+RETRY_PSM = 3  # Fully automatic page segmentation
+
+RETRY_MODES = ("auto", "serial", "speculative")
+
+# Image statistics below these values predict a low-confidence first pass
+MIN_CONTRAST = 80.0  # Ink-to-paper spread: 99.5th - 0.5th intensity percentile (washed out / dark captures)
+MIN_SHARPNESS = 60.0  # Variance of the Laplacian (blurry captures)
+MIN_SHORT_SIDE = 400  # Pixels (thumbnails / heavily compressed photos)
+_STATS_MAX_SIDE = 1024
+
+
+def predict_low_quality(image: Image.Image) -> bool:
+    """
+    Predict from image statistics whether OCR is likely to come back low-confidence.
+
+    Looks at size, ink-to-paper contrast and sharpness (variance of a 4-neighbour
+    Laplacian) on a reduced grayscale copy, so it costs a few milliseconds.
+
+    Args:
+        image: Source image (before binarization)
+
+    Returns:
+        True if the image looks blurry, low-contrast or too small
+    """
+    if min(image.size) < MIN_SHORT_SIDE:
+        return True
+
+    gray = image.convert("L")
+    if max(gray.size) > _STATS_MAX_SIDE:
+        gray = gray.copy()
+        gray.thumbnail((_STATS_MAX_SIDE, _STATS_MAX_SIDE))
+    pixels = np.asarray(gray, dtype=np.float32)
+
+    # Percentiles rather than std dev: documents are mostly blank paper
+    dark, light = np.percentile(pixels, [0.5, 99.5])
+    if float(light - dark) < MIN_CONTRAST:
+        return True
+
+    laplacian = (
+        4 * pixels[1:-1, 1:-1]
+        - pixels[:-2, 1:-1]
+        - pixels[2:, 1:-1]
+        - pixels[1:-1, :-2]
+        - pixels[1:-1, 2:]
+    )
+    return float(laplacian.var()) < MIN_SHARPNESS
+
+
+class OCRRunner:
+    """
+    Runs OCR with the low-confidence retry (alternative page segmentation mode).
+
+    Modes:
+        serial: run the default pass; if it is below the threshold, run the retry
+        speculative: run both passes concurrently and take the first that clears
+            the threshold (otherwise the more confident one)
+        auto: speculative for images predicted to be low quality, serial otherwise
+
+    When a speculative pass wins, the other one is cancelled if the backend
+    supports it (supports_cancel); otherwise it runs to completion in the
+    background. At most one such abandoned pass runs at a time: while it does,
+    images are retried serially.
+
+    The strategy actually used is recorded in result.layout["retry_strategy"]:
+    "single", "serial-retry" or "speculative".
+    """
+
+    def __init__(
+        self,
+        backend: OCRBackend,
+        mode: str = "auto",
+        threshold: float = LOW_CONFIDENCE_THRESHOLD,
+        retry_psm: int = RETRY_PSM,
+    ):
+        """
+        Initialize OCR runner.
+
+        Args:
+            backend: OCR backend
+            mode: "auto", "serial" or "speculative"
+            threshold: Confidence below which the retry is needed
+            retry_psm: Page segmentation mode for the retry pass
+        """
+        if mode not in RETRY_MODES:
+            raise ValueError(f"Unknown OCR retry mode: {mode}")
+        self.backend = backend
+        self.mode = mode
+        self.threshold = threshold
+        self.retry_psm = retry_psm
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Losing speculative pass that may still be running
+        self._abandoned: Optional[Future] = None
+
+    def extract(self, image: Image.Image, source_image: Optional[Image.Image] = None) -> OCRResult:
+        """
+        Extract text, retrying with the alternative mode when confidence is low.
+
+        Args:
+            image: Preprocessed image to OCR
+            source_image: Original image used for the quality prediction in auto mode
+
+        Returns:
+            OCRResult with layout["retry_strategy"] set
+        """
+        speculative = self.mode == "speculative" or (
+            self.mode == "auto" and predict_low_quality(source_image or image)
+        )
+        if speculative and self._abandoned is not None and not self._abandoned.done():
+            speculative = False  # Don't stack a third OCR pass on an abandoned one
+        if speculative:
+            result = self._extract_speculative(image)
+            strategy = "speculative"
+        else:
+            result, strategy = self._extract_serial(image)
+        result.layout["retry_strategy"] = strategy
+        return result
+
+    def _extract_serial(self, image: Image.Image) -> tuple[OCRResult, str]:
+        """Default pass, then the retry pass only if confidence is low."""
+        ocr_result = self.backend.extract(image)
+        if ocr_result.confidence >= self.threshold:
+            return ocr_result, "single"
+
+        logger.warning(f"⚠️  Low OCR confidence ({ocr_result.confidence:.2f}), trying alternative mode...")
+        try:
+            alt_result = self.backend.extract(image, psm=self.retry_psm)
+            if alt_result.confidence > ocr_result.confidence:
+                ocr_result = alt_result
+                logger.info(f"✓ Better OCR with alternative mode: {ocr_result.confidence:.2f}")
+        except Exception:
+            pass  # Fall back to original result
+        return ocr_result, "serial-retry"
+
+    def _extract_speculative(self, image: Image.Image) -> OCRResult:
+        """Run default and retry passes concurrently."""
+        if self._executor is None:
+            # A third thread so an abandoned pass never blocks the next image
+            self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="itbl-ocr")
+
+        cancel = threading.Event()
+        kwargs = {"cancel": cancel} if self.backend.supports_cancel else {}
+        primary = self._executor.submit(self.backend.extract, image, **kwargs)
+        alternative = self._executor.submit(
+            self.backend.extract, image, psm=self.retry_psm, **kwargs
+        )
+        pending = {primary, alternative}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = self._result_or_none(future)
+                if result is not None and result.confidence >= self.threshold:
+                    # Winner found: stop the other pass (a no-op for backends
+                    # that can't cancel; its result is discarded either way)
+                    cancel.set()
+                    for loser in pending:
+                        self._abandoned = loser
+                    if future is alternative:
+                        logger.info(f"✓ Alternative mode cleared threshold first: {result.confidence:.2f}")
+                    return result
+
+        # Neither cleared the threshold: keep the more confident one (default on ties)
+        primary_result = self._result_or_none(primary)
+        alt_result = self._result_or_none(alternative)
+        if primary_result is None:
+            if alt_result is None:
+                primary.result()  # Re-raise the primary pass error
+            return alt_result
+        if alt_result is not None and alt_result.confidence > primary_result.confidence:
+            logger.info(f"✓ Better OCR with alternative mode: {alt_result.confidence:.2f}")
+            return alt_result
+        return primary_result
+
+    @staticmethod
+    def _result_or_none(future: Future) -> Optional[OCRResult]:
+        """Result of a finished pass, or None if it failed."""
+        if future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def close(self) -> None:
+        """Shut down the speculative thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._abandoned = None
@@ -2,13 +2,26 @@
 
 import os
 import re
+import shlex
+import subprocess
+import tempfile
+import threading
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import pytesseract
 from PIL import Image
 
-from itbl.ocr.base import OCRBackend, OCRResult
+from itbl.ocr.base import OCRBackend, OCRResult, TokenTable
+
+# How often a cancellable tesseract process checks its cancel event (seconds)
+CANCEL_POLL_SECONDS = 0.05
+
+# Column layout of Tesseract TSV rows (image_to_data columns)
+TSV_COLUMNS = [
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text",
+]
 
 
 def find_tesseract_executable() -> str | None:
@@ -33,9 +46,160 @@ def find_tesseract_executable() -> str | None:
     return None
 
 
+def token_table_from_tsv_data(data: Dict[str, List]) -> TokenTable:
+    """
+    Build a token table from Tesseract TSV data in one indexed pass.
+    
+    Args:
+        data: Column dict as returned by image_to_data(output_type=DICT)
+    
+    Returns:
+        TokenTable with one entry per non-empty word
+    """
+    table = TokenTable()
+    words = data["text"]
+    confs = data["conf"]
+    lefts, tops = data["left"], data["top"]
+    widths, heights = data["width"], data["height"]
+    blocks, pars = data["block_num"], data["par_num"]
+    lines, word_nums = data["line_num"], data["word_num"]
+
+    for i in range(len(words)):
+        word = str(words[i])
+        if not word.strip():  # Skip empty
+            continue
+        conf = float(confs[i])
+        table.append(
+            word,
+            conf / 100.0 if conf >= 0 else 0.0,
+            int(lefts[i]),
+            int(tops[i]),
+            int(widths[i]),
+            int(heights[i]),
+            int(blocks[i]),
+            int(pars[i]),
+            int(lines[i]),
+            int(word_nums[i]),
+        )
+    return table
+
+
+def mean_confidence_from_tsv_data(data: Dict[str, List]) -> float:
+    """Average confidence (0.0-1.0) over TSV rows with a valid, non-zero confidence."""
+    valid_confs = [float(c) / 100.0 for c in data["conf"] if float(c) > 0]
+    return sum(valid_confs) / len(valid_confs) if valid_confs else 0.0
+
+
+def parse_tsv_text(tsv: str) -> Dict[str, List]:
+    """
+    Parse Tesseract TSV output into image_to_data-style columns.
+
+    Args:
+        tsv: TSV text from the tesseract executable (with a header line) or
+            from TessBaseAPIGetTsvText (without one)
+
+    Returns:
+        Dict of column name -> list (numeric columns as int/float, text as str)
+    """
+    data: Dict[str, List] = {col: [] for col in TSV_COLUMNS}
+    text_idx = len(TSV_COLUMNS) - 1
+    for line in tsv.splitlines():
+        if not line or line.startswith("level\t"):
+            continue  # Blank line or header
+        cells = line.split("\t", text_idx)
+        if len(cells) < text_idx:
+            continue  # Malformed row
+        if len(cells) == text_idx:
+            cells.append("")  # Layout rows may omit the empty text cell
+        for col, value in zip(TSV_COLUMNS, cells):
+            if col == "text":
+                data[col].append(value)
+            elif col == "conf":
+                data[col].append(float(value))
+            else:
+                data[col].append(int(value))
+    return data
+
+
+def text_from_tsv_data(data: Dict[str, List]) -> str:
+    """
+    Rebuild plain text from Tesseract TSV data (image_to_data dict output).
+    
+    Mirrors Tesseract's text renderer: words on a line are joined by single
+    spaces, lines by newlines, and paragraphs/blocks are separated by a blank line.
+    """
+    return token_table_from_tsv_data(data).to_text()
+
+
+def _run_tesseract(image: Image.Image, extension: str, config: str, cancel: threading.Event) -> str:
+    """
+    Run the tesseract executable on an image, killing it if cancel is set.
+
+    pytesseract gives no handle on its subprocess, so cancellable passes save
+    the image to a temporary PNG and run `tesseract IMAGE OUTPUT_BASE [options]`
+    here, with the same executable (pytesseract.pytesseract.tesseract_cmd).
+
+    Args:
+        image: PIL Image
+        extension: "tsv" or "txt"
+        config: Command-line config string
+        cancel: Event that stops the pass
+
+    Returns:
+        Contents of the output file
+
+    Raises:
+        RuntimeError: If cancel was set before tesseract finished
+        pytesseract.TesseractError: If tesseract failed
+    """
+    if extension == "tsv":
+        config = f"-c tessedit_create_tsv=1 {config}"
+    if "A" in image.getbands():
+        # Flatten transparency onto white, as pytesseract does
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+
+    with tempfile.TemporaryDirectory(prefix="itbl_tess_") as temp_dir:
+        input_path = os.path.join(temp_dir, "input.png")
+        output_base = os.path.join(temp_dir, "output")
+        image.save(input_path, format="PNG")
+        args = [pytesseract.pytesseract.tesseract_cmd, input_path, output_base]
+        args += shlex.split(config, posix=os.name != "nt")
+        if extension != "tsv":
+            args.append(extension)
+        proc = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),  # No console on Windows
+        )
+        errors = None
+        try:
+            while errors is None:
+                if cancel.is_set():
+                    raise RuntimeError("Tesseract pass cancelled")
+                try:
+                    _, errors = proc.communicate(timeout=CANCEL_POLL_SECONDS)
+                except subprocess.TimeoutExpired:
+                    pass
+        finally:
+            if proc.poll() is None:  # Cancelled (or interrupted): don't leave tesseract running
+                proc.kill()
+                proc.communicate()
+        if proc.returncode:
+            message = " ".join(errors.decode("utf-8", "replace").splitlines()).strip()
+            raise pytesseract.TesseractError(proc.returncode, message)
+        with open(f"{output_base}{os.extsep}{extension}", "rb") as output_file:
+            return output_file.read().decode("utf-8")
+
+
 class TesseractBackend(OCRBackend):
     """Tesseract OCR backend."""
 
+    supports_cancel = True
+
     def __init__(
         self,
         dpi: int = 300,
@@ -43,6 +207,7 @@ class TesseractBackend(OCRBackend):
         oem: int = 3,  # Default OCR engine mode
         lang: str = "eng",
         tesseract_cmd: str | None = None,
+        single_pass: bool = True,
     ):
         """
         Initialize Tesseract backend.
@@ -53,11 +218,14 @@ class TesseractBackend(OCRBackend):
             oem: OCR engine mode (3 = default)
             lang: Language code (e.g., 'eng')
             tesseract_cmd: Path to tesseract.exe (auto-detected if None)
+            single_pass: Run one recognition pass (TSV) and rebuild the text from
+                the word boxes, instead of a second image_to_string pass
         """
         self.dpi = dpi
         self.psm = psm
         self.oem = oem
         self.lang = lang
+        self.single_pass = single_pass
         
         # Try to find Tesseract if not in PATH
         if tesseract_cmd:
@@ -74,64 +242,65 @@ class TesseractBackend(OCRBackend):
                     import logging
                     logging.getLogger("itbl").info(f"Auto-detected Tesseract at: {found_path}")
 
+    def _build_config(self, **kwargs) -> str:
+        """Build the Tesseract command-line config string (kwargs override defaults)."""
+        dpi = kwargs.get("dpi", self.dpi)
+        psm = kwargs.get("psm", self.psm)
+        oem = kwargs.get("oem", self.oem)
+        lang = kwargs.get("lang", self.lang)
+        return f"--dpi {dpi} --psm {psm} --oem {oem} -l {lang}"
+
+    def settings_key(self, **kwargs) -> str:
+        """Settings string for result caching: engine name plus config string."""
+        mode = "single-pass" if self.single_pass else "two-pass"
+        return f"tesseract {mode} {self._build_config(**kwargs)}"
+
     def extract(self, image: Image.Image, **kwargs) -> OCRResult:
         """
         Extract text using Tesseract.
         
         Args:
             image: PIL Image
-            **kwargs: Override dpi, psm, oem, lang if provided
+            **kwargs: Override dpi, psm, oem, lang if provided; cancel
+                (threading.Event) kills the tesseract process when set
         
         Returns:
             OCRResult
         """
-        dpi = kwargs.get("dpi", self.dpi)
-        psm = kwargs.get("psm", self.psm)
-        oem = kwargs.get("oem", self.oem)
-        lang = kwargs.get("lang", self.lang)
-
-        config = f"--dpi {dpi} --psm {psm} --oem {oem} -l {lang}"
+        config = self._build_config(**kwargs)
+        cancel = kwargs.get("cancel")
 
         # Get detailed data with confidence
-        data = pytesseract.image_to_data(
-            image, config=config, output_type=pytesseract.Output.DICT
-        )
+        if cancel is not None:
+            data = parse_tsv_text(_run_tesseract(image, "tsv", config, cancel))
+        else:
+            data = pytesseract.image_to_data(
+                image, config=config, output_type=pytesseract.Output.DICT
+            )
 
-        # Extract full text
-        text = pytesseract.image_to_string(image, config=config).strip()
-
-        # Build tokens with confidence
-        tokens = []
-        words = data["text"]
-        confidences = data["conf"]
-        for word, conf in zip(words, confidences):
-            if word.strip():  # Skip empty
-                conf_float = float(conf) / 100.0 if conf != "-1" else 0.0
-                tokens.append(
-                    {
-                        "text": word,
-                        "confidence": conf_float,
-                        "left": data["left"][words.index(word)],
-                        "top": data["top"][words.index(word)],
-                        "width": data["width"][words.index(word)],
-                        "height": data["height"][words.index(word)],
-                    }
-                )
+        # Build tokens in one indexed pass
+        tokens = token_table_from_tsv_data(data)
+
+        # Extract full text (rebuilt from the word boxes in single-pass mode)
+        if self.single_pass:
+            text = tokens.to_text()
+        elif cancel is not None:
+            text = _run_tesseract(image, "txt", config, cancel).strip()
+        else:
+            text = pytesseract.image_to_string(image, config=config).strip()
 
         # Compute overall confidence (average of valid tokens)
-        valid_confs = [
-            float(c) / 100.0 for c in confidences if c != "-1" and c != "0"
-        ]
-        overall_conf = sum(valid_confs) / len(valid_confs) if valid_confs else 0.0
+        overall_conf = mean_confidence_from_tsv_data(data)
 
         return OCRResult(
             text=text,
             confidence=overall_conf,
             tokens=tokens,
-            layout={"mode": "tesseract", "config": config},
+            layout={"mode": "tesseract", "config": config, "single_pass": self.single_pass},
         )
 
     def get_confidence_per_token(self, result: OCRResult) -> List[Tuple[str, float]]:
         """Extract (token, confidence) pairs from OCRResult."""
-        return [(token["text"], token["confidence"]) for token in result.tokens]
+        table = result.token_table
+        return list(zip(table.text, table.confidence))
 
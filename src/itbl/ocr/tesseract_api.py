@@ -0,0 +1,289 @@
+"""In-process Tesseract backend using the libtesseract C API via ctypes."""
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import threading
+import weakref
+from pathlib import Path
+from typing import List, Tuple
+
+from PIL import Image
+
+from itbl.ocr.base import OCRBackend, OCRResult
+from itbl.ocr.tesseract import mean_confidence_from_tsv_data, parse_tsv_text, token_table_from_tsv_data
+
+# TessCancelFunc: bool (*)(void* cancel_this, int words)
+_CANCEL_FUNC = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_int)
+
+
+def find_tesseract_library() -> str | None:
+    """Locate the libtesseract shared library (ITBL_TESSERACT_LIB overrides)."""
+    env_path = os.getenv("ITBL_TESSERACT_LIB")
+    if env_path:
+        return env_path
+
+    found = ctypes.util.find_library("tesseract")
+    if found:
+        return found
+
+    if platform.system() == "Windows":
+        # UB-Mannheim installer ships versioned DLLs next to tesseract.exe
+        for base in [r"C:\Program Files\Tesseract-OCR", r"C:\Program Files (x86)\Tesseract-OCR"]:
+            for name in ["libtesseract-5.dll", "libtesseract-4.dll", "tesseract.dll"]:
+                path = Path(base) / name
+                if path.exists():
+                    return str(path)
+    elif platform.system() == "Darwin":
+        for path in ["/opt/homebrew/lib/libtesseract.dylib", "/usr/local/lib/libtesseract.dylib"]:
+            if Path(path).exists():
+                return path
+
+    return None
+
+
+def _load_library(library_path: str | None) -> ctypes.CDLL:
+    """Load libtesseract and declare the C API signatures we use."""
+    path = library_path or find_tesseract_library()
+    if not path:
+        raise ImportError(
+            "libtesseract not found. Install Tesseract (with its shared library) "
+            "or set ITBL_TESSERACT_LIB to the library path. "
+            "Use --engine tesseract to run the tesseract executable instead."
+        )
+    lib = ctypes.CDLL(path)
+
+    handle = ctypes.c_void_p
+    lib.TessVersion.restype = ctypes.c_char_p
+    lib.TessVersion.argtypes = []
+    lib.TessBaseAPICreate.restype = handle
+    lib.TessBaseAPICreate.argtypes = []
+    lib.TessBaseAPIDelete.restype = None
+    lib.TessBaseAPIDelete.argtypes = [handle]
+    lib.TessBaseAPIEnd.restype = None
+    lib.TessBaseAPIEnd.argtypes = [handle]
+    lib.TessBaseAPIInit2.restype = ctypes.c_int
+    lib.TessBaseAPIInit2.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    lib.TessBaseAPISetPageSegMode.restype = None
+    lib.TessBaseAPISetPageSegMode.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPISetImage.restype = None
+    lib.TessBaseAPISetImage.argtypes = [
+        handle, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+    ]
+    lib.TessBaseAPISetSourceResolution.restype = None
+    lib.TessBaseAPISetSourceResolution.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPIRecognize.restype = ctypes.c_int
+    lib.TessBaseAPIRecognize.argtypes = [handle, ctypes.c_void_p]
+    # Returned strings must be released with TessDeleteText, so keep them as raw pointers
+    lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetUTF8Text.argtypes = [handle]
+    lib.TessBaseAPIGetTsvText.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetTsvText.argtypes = [handle, ctypes.c_int]
+    lib.TessDeleteText.restype = None
+    lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+    lib.TessBaseAPIClear.restype = None
+    lib.TessBaseAPIClear.argtypes = [handle]
+    # Progress monitor (cancellation); missing from very old libraries
+    if _has_monitor(lib):
+        lib.TessMonitorCreate.restype = handle
+        lib.TessMonitorCreate.argtypes = []
+        lib.TessMonitorDelete.restype = None
+        lib.TessMonitorDelete.argtypes = [handle]
+        lib.TessMonitorSetCancelFunc.restype = None
+        lib.TessMonitorSetCancelFunc.argtypes = [handle, _CANCEL_FUNC]
+    return lib
+
+
+def _has_monitor(lib: ctypes.CDLL) -> bool:
+    """Whether the library exports the TessMonitor cancellation API."""
+    return hasattr(lib, "TessMonitorCreate") and hasattr(lib, "TessMonitorSetCancelFunc")
+
+
+class _Engine:
+    """One initialized TessBaseAPI handle (not thread-safe; use one per thread)."""
+
+    def __init__(self, lib: ctypes.CDLL, lang: str, oem: int, tessdata_dir: str | None):
+        self.lib = lib
+        self.handle = lib.TessBaseAPICreate()
+        datapath = tessdata_dir.encode("utf-8") if tessdata_dir else None
+        if lib.TessBaseAPIInit2(self.handle, datapath, lang.encode("utf-8"), oem) != 0:
+            lib.TessBaseAPIDelete(self.handle)
+            self.handle = None
+            raise RuntimeError(
+                f"Could not initialize Tesseract for language '{lang}' "
+                f"(tessdata: {tessdata_dir or 'default'})"
+            )
+
+    def _take_text(self, pointer: int | None) -> str:
+        """Copy a C string returned by the API and free it."""
+        if not pointer:
+            return ""
+        try:
+            return ctypes.string_at(pointer).decode("utf-8", errors="replace")
+        finally:
+            self.lib.TessDeleteText(pointer)
+
+    def recognize(
+        self,
+        image: Image.Image,
+        psm: int,
+        dpi: int,
+        cancel: threading.Event | None = None,
+    ) -> Tuple[str, str]:
+        """
+        Recognize an image once; return (utf8_text, tsv_text).
+
+        With cancel, recognition runs under a progress monitor whose cancel
+        callback stops it once the event is set (RuntimeError is raised).
+        """
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        bytes_per_pixel = 1 if image.mode == "L" else 3
+        width, height = image.size
+        buffer = image.tobytes()  # Must stay alive until recognition finishes
+
+        lib = self.lib
+        lib.TessBaseAPISetPageSegMode(self.handle, psm)
+        lib.TessBaseAPISetImage(
+            self.handle, buffer, width, height, bytes_per_pixel, width * bytes_per_pixel
+        )
+        lib.TessBaseAPISetSourceResolution(self.handle, dpi)
+        monitor = callback = None
+        if cancel is not None:
+            # The callback object must stay alive until Recognize returns
+            callback = _CANCEL_FUNC(lambda cancel_this, words: cancel.is_set())
+            monitor = lib.TessMonitorCreate()
+            lib.TessMonitorSetCancelFunc(monitor, callback)
+        try:
+            if lib.TessBaseAPIRecognize(self.handle, monitor) != 0:
+                if cancel is not None and cancel.is_set():
+                    raise RuntimeError("Tesseract pass cancelled")
+                raise RuntimeError("Tesseract recognition failed")
+            text = self._take_text(lib.TessBaseAPIGetUTF8Text(self.handle))
+            tsv = self._take_text(lib.TessBaseAPIGetTsvText(self.handle, 0))
+        finally:
+            lib.TessBaseAPIClear(self.handle)  # Drop image and results, keep models loaded
+            if monitor:
+                lib.TessMonitorDelete(monitor)
+        return text, tsv
+
+    def close(self) -> None:
+        """Release the handle and its loaded models."""
+        if self.handle:
+            self.lib.TessBaseAPIEnd(self.handle)
+            self.lib.TessBaseAPIDelete(self.handle)
+            self.handle = None
+
+
+def _close_engines(engines: List[_Engine]) -> None:
+    """Close and forget a list of engines."""
+    for engine in engines:
+        engine.close()
+    engines.clear()
+
+
+class TesseractAPIBackend(OCRBackend):
+    """
+    Tesseract backend that keeps engines loaded in-process.
+
+    Calls libtesseract directly instead of spawning the tesseract executable, so
+    language models are loaded once per worker thread and reused for every image,
+    and images are handed over as raw pixel buffers instead of temp PNG files.
+    Text, tokens and confidence come from the same recognition pass.
+    """
+
+    def __init__(
+        self,
+        dpi: int = 300,
+        psm: int = 6,  # Assume uniform block of text
+        oem: int = 3,  # Default OCR engine mode
+        lang: str = "eng",
+        library_path: str | None = None,
+        tessdata_dir: str | None = None,
+    ):
+        """
+        Initialize in-process Tesseract backend.
+
+        Args:
+            dpi: Image DPI assumption
+            psm: Page segmentation mode (6 = uniform block)
+            oem: OCR engine mode (3 = default)
+            lang: Language code (e.g., 'eng')
+            library_path: Path to libtesseract (auto-detected if None)
+            tessdata_dir: Directory with .traineddata files (Tesseract default if None)
+        """
+        self.dpi = dpi
+        self.psm = psm
+        self.oem = oem
+        self.lang = lang
+        self.tessdata_dir = tessdata_dir
+        self._lib = _load_library(library_path)
+        self.version = self._lib.TessVersion().decode("utf-8")
+        self.supports_cancel = _has_monitor(self._lib)
+        # Engines are per thread: a TessBaseAPI handle must not be shared across threads
+        self._local = threading.local()
+        self._engines: List[_Engine] = []
+        self._engines_lock = threading.Lock()
+        # Release loaded models when the backend is garbage collected or at exit
+        self._finalizer = weakref.finalize(self, _close_engines, self._engines)
+
+    def _get_engine(self, lang: str, oem: int) -> _Engine:
+        """Get this thread's warm engine for (lang, oem), creating it on first use."""
+        engines = getattr(self._local, "engines", None)
+        if engines is None:
+            engines = self._local.engines = {}
+        engine = engines.get((lang, oem))
+        if engine is None:
+            engine = engines[(lang, oem)] = _Engine(self._lib, lang, oem, self.tessdata_dir)
+            with self._engines_lock:
+                self._engines.append(engine)
+        return engine
+
+    def settings_key(self, **kwargs) -> str:
+        """Settings string for result caching."""
+        dpi = kwargs.get("dpi", self.dpi)
+        psm = kwargs.get("psm", self.psm)
+        oem = kwargs.get("oem", self.oem)
+        lang = kwargs.get("lang", self.lang)
+        return f"tesseract-api {self.version} --dpi {dpi} --psm {psm} --oem {oem} -l {lang}"
+
+    def extract(self, image: Image.Image, **kwargs) -> OCRResult:
+        """
+        Extract text with a warm in-process engine.
+
+        Args:
+            image: PIL Image
+            **kwargs: Override dpi, psm, oem, lang if provided; cancel
+                (threading.Event) stops recognition when set (if supports_cancel)
+
+        Returns:
+            OCRResult
+        """
+        dpi = kwargs.get("dpi", self.dpi)
+        psm = kwargs.get("psm", self.psm)
+        oem = kwargs.get("oem", self.oem)
+        lang = kwargs.get("lang", self.lang)
+        cancel = kwargs.get("cancel") if self.supports_cancel else None
+
+        engine = self._get_engine(lang, oem)
+        text, tsv = engine.recognize(image, psm=psm, dpi=dpi, cancel=cancel)
+        data = parse_tsv_text(tsv)
+
+        return OCRResult(
+            text=text.strip(),
+            confidence=mean_confidence_from_tsv_data(data),
+            tokens=token_table_from_tsv_data(data),
+            layout={"mode": "tesseract-api", "config": self.settings_key(**kwargs)},
+        )
+
+    def close(self) -> None:
+        """Release all engines (only call when no extract() is running)."""
+        with self._engines_lock:
+            _close_engines(self._engines)
+        self._local = threading.local()
+
+    def get_confidence_per_token(self, result: OCRResult) -> List[Tuple[str, float]]:
+        """Extract (token, confidence) pairs from OCRResult."""
+        table = result.token_table
+        return list(zip(table.text, table.confidence))
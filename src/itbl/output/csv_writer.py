@@ -4,7 +4,7 @@ import csv
 from pathlib import Path
 from typing import Dict, List
 
-from itbl.output.writer_base import WriterBase
+from itbl.output.writer_base import RowSink, WriterBase
 
 
 class CSVWriter(WriterBase):
@@ -20,6 +20,7 @@ class CSVWriter(WriterBase):
         """
         self.annotate_inline = annotate_inline
         self.triage_column = triage_column
+        self._sink_files: Dict[Path, str] = {}  # CSV file -> category streaming into it
 
     def write(
         self,
@@ -37,18 +38,65 @@ class CSVWriter(WriterBase):
             category: Category/tab name
             apply_highlights: Ignored for CSV (use triage column instead)
         """
-        if output_path.is_dir():
-            output_file = output_path / f"{category.replace(' ', '_')}.csv"
-        else:
-            output_file = output_path
+        output_file = self._output_file(output_path, category)
 
         if not rows:
             return
 
+        # Always include triage column if any row has flags
+        has_triage = any(row.get("_flags") for row in rows)
+        visible_cols = self._visible_columns(rows[0], include_triage=has_triage)
+
+        # Write CSV
+        with open(output_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=visible_cols, extrasaction="ignore")
+            writer.writeheader()
+
+            for row in rows:
+                writer.writerow(self._format_row(row, visible_cols))
+
+    def open_sink(
+        self,
+        output_path: Path,
+        category: str,
+        apply_highlights: bool = False,
+    ) -> "CSVRowSink":
+        """
+        Open an incremental CSV sink for one category.
+
+        Args:
+            output_path: Output file path (or directory; will create category_name.csv)
+            category: Category/tab name
+            apply_highlights: Ignored for CSV (use triage column instead)
+
+        Returns:
+            CSVRowSink that appends each row to the file as it arrives
+
+        Raises:
+            ValueError: If another category is already streaming into the same file
+                (a single-file output_path only holds one category's columns)
+        """
+        output_file = self._output_file(output_path, category)
+        owner = self._sink_files.setdefault(output_file, category)
+        if owner != category:
+            raise ValueError(
+                f"Cannot stream {category!r} into {output_file}: it already holds {owner!r} rows "
+                "(use a directory for --out to get one CSV file per category)"
+            )
+        return CSVRowSink(self, output_file)
+
+    @staticmethod
+    def _output_file(output_path: Path, category: str) -> Path:
+        """Resolve the CSV file for a category."""
+        if output_path.is_dir():
+            return output_path / f"{category.replace(' ', '_')}.csv"
+        return output_path
+
+    def _visible_columns(self, sample_row: Dict, include_triage: bool) -> List[str]:
+        """Columns to write: visible fields in row key order, triage column last."""
         # Determine columns (skip hidden fields except _triage)
         hidden_prefixes = ["_"]
-        sample_row = rows[0]
-        all_cols = set(sample_row.keys())
+        all_cols = list(sample_row.keys())  # Row key order is stable across runs and processes
         visible_cols = [
             col
             for col in all_cols
@@ -56,48 +104,83 @@ class CSVWriter(WriterBase):
             or col == self.triage_column
         ]
 
-        # Always include triage column if any row has flags
-        has_triage = any(row.get("_flags") for row in rows)
-        if has_triage and self.triage_column not in visible_cols:
+        if include_triage and self.triage_column not in visible_cols:
             visible_cols.append(self.triage_column)
 
         # Sort columns: put triage last, otherwise maintain order
         if self.triage_column in visible_cols:
             visible_cols.remove(self.triage_column)
             visible_cols.append(self.triage_column)
+        return visible_cols
+
+    def _format_row(self, row: Dict, visible_cols: List[str]) -> Dict:
+        """Build the output dict for one row (triage info and inline annotations)."""
+        out_row = {}
+        flags = row.get("_flags", [])
+        highlight_cells = row.get("_highlight_cells", [])
+
+        # Build triage info
+        triage_info = []
+        if flags:
+            triage_info.extend(flags)
+        if highlight_cells:
+            triage_info.extend([f"highlight:{cell}" for cell in highlight_cells])
+
+        for col in visible_cols:
+            if col == self.triage_column:
+                out_row[col] = "; ".join(triage_info) if triage_info else ""
+            else:
+                value = row.get(col, "")
+                # Apply inline annotation if flagged
+                if (
+                    self.annotate_inline
+                    and col in highlight_cells
+                    and flags
+                ):
+                    reason = flags[0] if flags else "review"
+                    out_row[col] = f"<<REVIEW: {reason}>> {value}"
+                else:
+                    out_row[col] = value
+        return out_row
+
+
+class CSVRowSink(RowSink):
+    """
+    Appends rows to one CSV file as they are produced.
+
+    Columns are fixed by the first row. Since later rows aren't known yet, the
+    triage column is always included (empty for unflagged rows). Each row is
+    flushed to disk, so a crash keeps everything written so far.
+    """
+
+    def __init__(self, writer: CSVWriter, output_file: Path):
+        """
+        Initialize CSV sink.
 
-        # Write CSV
-        with open(output_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=visible_cols, extrasaction="ignore")
-            writer.writeheader()
-
-            for row in rows:
-                out_row = {}
-                flags = row.get("_flags", [])
-                highlight_cells = row.get("_highlight_cells", [])
-
-                # Build triage info
-                triage_info = []
-                if flags:
-                    triage_info.extend(flags)
-                if highlight_cells:
-                    triage_info.extend([f"highlight:{cell}" for cell in highlight_cells])
-
-                for col in visible_cols:
-                    if col == self.triage_column:
-                        out_row[col] = "; ".join(triage_info) if triage_info else ""
-                    else:
-                        value = row.get(col, "")
-                        # Apply inline annotation if flagged
-                        if (
-                            self.annotate_inline
-                            and col in highlight_cells
-                            and flags
-                        ):
-                            reason = flags[0] if flags else "review"
-                            out_row[col] = f"<<REVIEW: {reason}>> {value}"
-                        else:
-                            out_row[col] = value
-
-                writer.writerow(out_row)
-
+        Args:
+            writer: CSVWriter providing column and formatting rules
+            output_file: CSV file to create
+        """
+        super().__init__()
+        self.writer = writer
+        self.output_file = output_file
+        self._file = None
+        self._csv = None
+        self._columns: List[str] = []
+
+    def append(self, row: Dict) -> None:
+        """Write one row (the header is written with the first row)."""
+        if self._file is None:
+            self._columns = self.writer._visible_columns(row, include_triage=True)
+            self._file = open(self.output_file, "w", newline="", encoding="utf-8")
+            self._csv = csv.DictWriter(self._file, fieldnames=self._columns, extrasaction="ignore")
+            self._csv.writeheader()
+        self._csv.writerow(self.writer._format_row(row, self._columns))
+        self._file.flush()
+        self.rows_written += 1
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
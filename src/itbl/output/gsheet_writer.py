@@ -1,7 +1,10 @@
 """Google Sheets writer with batch formatting and notes."""
 
+import random
+import re
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
     from google.auth.transport.requests import Request
@@ -15,14 +18,32 @@ except ImportError:
 
 from itbl.output.writer_base import WriterBase
 from itbl.util.logging import setup_logging
+from itbl.util.ratelimit import TokenBucket
 
 logger = setup_logging()
 
+# Sheets API write quota (requests per minute per user)
+REQUESTS_PER_MINUTE = 60
+
+# Responses worth retrying: quota exceeded and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Appends may have been applied before a server error, so they only retry quota errors
+APPEND_RETRY_STATUSES = (429,)
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # Seconds before the first retry (doubles each attempt)
+BACKOFF_MAX = 64.0
+
+# Rows per batchUpdate when committing staged categories (keeps payloads small)
+COMMIT_CHUNK_ROWS = 2000
+
 
 class GoogleSheetsWriter(WriterBase):
     """Google Sheets writer with highlighting support."""
 
     SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+    # Streaming mode appends to a tab every this many rows
+    stream_batch_size = 500
     
     @staticmethod
     def _get_credentials_path() -> Path:
@@ -97,7 +118,15 @@ class GoogleSheetsWriter(WriterBase):
     CREDENTIALS_FILE = _get_credentials_path()
     TOKEN_FILE = Path.home() / ".config" / "itbl" / "token.json"
 
-    def __init__(self, sheet_id: str, highlight_color: str = "#FFF59D", credentials_path: Path | None = None):
+    def __init__(
+        self,
+        sheet_id: str,
+        highlight_color: str = "#FFF59D",
+        credentials_path: Path | None = None,
+        service=None,
+        staged: bool = False,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
         """
         Initialize Google Sheets writer.
         
@@ -105,6 +134,9 @@ class GoogleSheetsWriter(WriterBase):
             sheet_id: Google Sheets ID (from URL)
             highlight_color: Hex color for highlights (default: yellow #FFF59D)
             credentials_path: Optional path to credentials file (overrides auto-detection)
+            service: Prebuilt Sheets API service (skips authentication; e.g. for tests)
+            staged: Hold rows from write() and send every category at once on commit()/close()
+            rate_limiter: Limiter applied to every API request (default: REQUESTS_PER_MINUTE)
         """
         if not GOOGLE_AVAILABLE:
             raise ImportError(
@@ -112,7 +144,13 @@ class GoogleSheetsWriter(WriterBase):
             )
         self.sheet_id = sheet_id
         self.highlight_color = highlight_color
-        self.service = None
+        self.service = service
+        self.staged = staged
+        self.rate_limiter = rate_limiter or TokenBucket(REQUESTS_PER_MINUTE)
+        self._tab_ids: Optional[Dict[str, int]] = None  # Cached tab title -> sheetId
+        self._staged: Dict[str, Tuple[List[Dict], bool]] = {}  # category -> (rows, apply_highlights)
+        if service is not None:
+            return
         
         # Use provided path or try to find credentials
         if credentials_path:
@@ -192,18 +230,109 @@ class GoogleSheetsWriter(WriterBase):
 
         self.service = build("sheets", "v4", credentials=creds)
 
+    def _execute(self, request, action: str, idempotent: bool = True) -> Dict:
+        """
+        Execute an API request under the rate limit, retrying quota and server errors.
+
+        Retries use exponential backoff with jitter (or the server's Retry-After).
+
+        Args:
+            request: Unexecuted googleapiclient request
+            action: Description for log messages
+            idempotent: False for appends, which a 5xx may have applied anyway;
+                those are only retried on 429 so rows are never written twice
+
+        Returns:
+            Response body
+        """
+        retry_statuses = RETRY_STATUSES if idempotent else APPEND_RETRY_STATUSES
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                return request.execute()
+            except HttpError as e:
+                status = getattr(e.resp, "status", None)
+                if status not in retry_statuses or attempt == MAX_RETRIES:
+                    raise
+                retry_after = e.resp.get("retry-after") if hasattr(e.resp, "get") else None
+                if retry_after and str(retry_after).isdigit():
+                    delay = float(retry_after)
+                else:
+                    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning(
+                    f"Sheets API returned {status} while {action}; retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{MAX_RETRIES})"
+                )
+                time.sleep(delay)
+
+    def _load_metadata(self) -> Dict[str, int]:
+        """
+        Get tab titles and IDs, fetching sheet properties only on first use.
+
+        The cache is kept up to date with tabs this writer creates; call
+        invalidate_metadata() if tabs are changed by someone else.
+
+        Returns:
+            Dict mapping tab title to sheetId
+        """
+        if self._tab_ids is None:
+            metadata = self._execute(
+                self.service.spreadsheets().get(
+                    spreadsheetId=self.sheet_id, fields="sheets.properties(sheetId,title)"
+                ),
+                "reading sheet metadata",
+            )
+            self._tab_ids = {
+                sheet["properties"]["title"]: sheet["properties"]["sheetId"]
+                for sheet in metadata.get("sheets", [])
+            }
+        return self._tab_ids
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached tab metadata (refetched on next use)."""
+        self._tab_ids = None
+
     def _get_tab_id(self, tab_name: str) -> Optional[int]:
         """Get tab/sheet ID by name."""
         try:
-            metadata = self.service.spreadsheets().get(spreadsheetId=self.sheet_id).execute()
-            sheets = metadata.get("sheets", [])
-            for sheet in sheets:
-                if sheet["properties"]["title"] == tab_name:
-                    return sheet["properties"]["sheetId"]
+            return self._load_metadata().get(tab_name)
         except HttpError as e:
             logger.error(f"Error getting tab ID: {e}")
         return None
 
+    def _ensure_tab(self, tab_name: str) -> int:
+        """Get a tab's ID, creating the tab if it doesn't exist."""
+        tab_id = self._get_tab_id(tab_name)
+        if tab_id is not None:
+            return tab_id
+
+        # Create new tab
+        requests = [
+            {
+                "addSheet": {
+                    "properties": {
+                        "title": tab_name,
+                    }
+                }
+            }
+        ]
+        try:
+            response = self._execute(
+                self.service.spreadsheets().batchUpdate(
+                    spreadsheetId=self.sheet_id, body={"requests": requests}
+                ),
+                f"creating tab {tab_name}",
+            )
+        except HttpError as e:
+            logger.error(f"Error creating tab: {e}")
+            self.invalidate_metadata()  # The tab may exist after all (e.g. created concurrently)
+            raise
+
+        # Record the new tab from the reply instead of refetching metadata
+        properties = response["replies"][0]["addSheet"]["properties"]
+        self._load_metadata()[properties["title"]] = properties["sheetId"]
+        return properties["sheetId"]
+
     def write(
         self,
         rows: List[Dict],
@@ -213,6 +342,8 @@ class GoogleSheetsWriter(WriterBase):
     ) -> None:
         """
         Write rows to Google Sheets.
+
+        In staged mode the rows are held until commit() (or close()).
         
         Args:
             rows: List of normalized row dicts
@@ -223,37 +354,16 @@ class GoogleSheetsWriter(WriterBase):
         if not rows:
             return
 
+        if self.staged:
+            staged_rows, staged_highlights = self._staged.get(category, ([], False))
+            self._staged[category] = (staged_rows + list(rows), staged_highlights or apply_highlights)
+            return
+
         # Get or create tab
-        tab_id = self._get_tab_id(category)
-        if tab_id is None:
-            # Create new tab
-            requests = [
-                {
-                    "addSheet": {
-                        "properties": {
-                            "title": category,
-                        }
-                    }
-                }
-            ]
-            try:
-                self.service.spreadsheets().batchUpdate(
-                    spreadsheetId=self.sheet_id, body={"requests": requests}
-                ).execute()
-                tab_id = self._get_tab_id(category)
-            except HttpError as e:
-                logger.error(f"Error creating tab: {e}")
-                raise
+        self._ensure_tab(category)
 
         # Determine columns (skip hidden fields)
-        hidden_prefixes = ["_"]
-        sample_row = rows[0]
-        all_cols = set(sample_row.keys())
-        visible_cols = [
-            col for col in all_cols
-            if not any(col.startswith(prefix) for prefix in hidden_prefixes)
-        ]
-        visible_cols = sorted(list(visible_cols))
+        visible_cols = _visible_columns(rows[0])
 
         # Prepare values
         values = []
@@ -262,47 +372,54 @@ class GoogleSheetsWriter(WriterBase):
             values.append(row_values)
 
         # Append values
-        range_name = f"{category}!A:Z"
+        range_name = f"{_quote_tab(category)}!A:Z"
         body = {"values": values}
 
         try:
-            result = self.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_id,
-                range=range_name,
-                valueInputOption="RAW",
-                insertDataOption="INSERT_ROWS",
-                body=body,
-            ).execute()
+            result = self._execute(
+                self.service.spreadsheets().values().append(
+                    spreadsheetId=self.sheet_id,
+                    range=range_name,
+                    valueInputOption="RAW",
+                    insertDataOption="INSERT_ROWS",
+                    body=body,
+                ),
+                f"appending to {category}",
+                idempotent=False,
+            )
             logger.info(f"Appended {len(values)} rows to {category}")
 
             # Apply highlighting if requested
             if apply_highlights:
-                self._apply_highlights(category, visible_cols, rows)
+                updated_range = result.get("updates", {}).get("updatedRange", "")
+                start_row = _range_start_row(updated_range)
+                if start_row is None:
+                    logger.warning(f"Append response for {category} has no usable range ({updated_range!r}); skipping highlights")
+                else:
+                    self._apply_highlights(category, visible_cols, rows, start_row)
 
         except HttpError as e:
             logger.error(f"Error writing to Sheets: {e}")
             raise
 
     def _apply_highlights(
-        self, category: str, columns: List[str], rows: List[Dict]
+        self, category: str, columns: List[str], rows: List[Dict], start_row: int
     ) -> None:
-        """Apply yellow highlighting to flagged cells."""
+        """
+        Apply yellow highlighting and notes to flagged cells.
+
+        Args:
+            category: Category/tab name
+            columns: Column order of the appended rows
+            rows: Appended rows
+            start_row: 1-based sheet row of rows[0] (from the append response)
+        """
         requests = []
         tab_id = self._get_tab_id(category)
+        background = self._background_color()
 
-        # Find starting row (get current data range)
-        try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id, range=f"{category}!A:Z"
-            ).execute()
-            existing_rows = len(result.get("values", []))
-            start_row = existing_rows - len(rows) + 1  # +1 for 1-indexed, +1 for header
-        except Exception:
-            start_row = 2  # Assume header at row 1
-
-        # Build format requests for each flagged cell
+        # Build one request per flagged cell (background color and note together)
         for row_idx, row in enumerate(rows):
-            flags = row.get("_flags", [])
             highlight_cells = row.get("_highlight_cells", [])
 
             if not highlight_cells:
@@ -313,41 +430,12 @@ class GoogleSheetsWriter(WriterBase):
                     continue
 
                 col_idx = columns.index(col_name)
-                cell_range = f"{category}!{chr(65 + col_idx)}{start_row + row_idx}"
-
-                # Background color
-                requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": tab_id,
-                            "startRowIndex": start_row + row_idx - 1,  # 0-indexed
-                            "endRowIndex": start_row + row_idx,
-                            "startColumnIndex": col_idx,
-                            "endColumnIndex": col_idx + 1,
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "backgroundColor": {
-                                    "red": float(int(self.highlight_color[1:3], 16)) / 255.0,
-                                    "green": float(int(self.highlight_color[3:5], 16)) / 255.0,
-                                    "blue": float(int(self.highlight_color[5:7], 16)) / 255.0,
-                                }
-                            }
-                        },
-                        "fields": "userEnteredFormat.backgroundColor",
-                    }
-                })
-
-                # Cell note
-                note_text = f"Reason: {', '.join(flags)}\nConfidence: {row.get('_ocr_confidence', 'N/A')}"
-                if row.get("_low_conf_tokens"):
-                    note_text += "\nLow confidence tokens detected"
 
                 requests.append({
                     "updateCells": {
                         "range": {
                             "sheetId": tab_id,
-                            "startRowIndex": start_row + row_idx - 1,
+                            "startRowIndex": start_row + row_idx - 1,  # 0-indexed
                             "endRowIndex": start_row + row_idx,
                             "startColumnIndex": col_idx,
                             "endColumnIndex": col_idx + 1,
@@ -356,23 +444,180 @@ class GoogleSheetsWriter(WriterBase):
                             {
                                 "values": [
                                     {
-                                        "note": note_text,
+                                        "userEnteredFormat": {"backgroundColor": background},
+                                        "note": _note_text(row),
                                     }
                                 ]
                             }
                         ],
-                        "fields": "note",
+                        "fields": "userEnteredFormat.backgroundColor,note",
                     }
                 })
 
         # Batch update
         if requests:
             try:
-                self.service.spreadsheets().batchUpdate(
-                    spreadsheetId=self.sheet_id,
-                    body={"requests": requests},
-                ).execute()
-                logger.info(f"Applied highlighting to {len(requests) // 2} cells")
+                self._execute(
+                    self.service.spreadsheets().batchUpdate(
+                        spreadsheetId=self.sheet_id,
+                        body={"requests": requests},
+                    ),
+                    f"highlighting {category}",
+                )
+                logger.info(f"Applied highlighting to {len(requests)} cells")
             except HttpError as e:
                 logger.error(f"Error applying highlights: {e}")
 
+    def commit(self) -> None:
+        """
+        Send all staged categories to the spreadsheet.
+
+        Missing tabs are created (with IDs assigned here) and rows are added with
+        appendCells requests in the same batchUpdate, highlight colour and notes
+        travelling with the values. A commit costs one metadata read (cached)
+        plus one write per COMMIT_CHUNK_ROWS rows, regardless of the number of
+        categories, and each batchUpdate is applied atomically.
+
+        Rows leave the writer only once their batch is applied: if a batch
+        fails, the rows of the earlier batches are gone and the rest are still
+        staged, so calling commit() again sends each row exactly once.
+        """
+        if not self._staged:
+            return
+        staged = self._staged
+
+        # New tabs go first in the first batch
+        tab_ids = dict(self._load_metadata())
+        next_id = max(tab_ids.values(), default=0) + 1
+        add_sheets = []
+        for category in staged:
+            if category not in tab_ids:
+                tab_ids[category] = next_id
+                add_sheets.append({"addSheet": {"properties": {"title": category, "sheetId": next_id}}})
+                next_id += 1
+
+        # appendCells requests of up to COMMIT_CHUNK_ROWS rows each
+        appends = []
+        for category, (rows, apply_highlights) in staged.items():
+            for start in range(0, len(rows), COMMIT_CHUNK_ROWS):
+                chunk = rows[start:start + COMMIT_CHUNK_ROWS]
+                request = self._append_cells_request(tab_ids[category], chunk, apply_highlights)
+                appends.append((category, len(chunk), request))
+
+        # Pack requests into batchUpdates of at most COMMIT_CHUNK_ROWS rows,
+        # remembering how many rows of each category every batch carries
+        batches = [(list(add_sheets), [])]
+        batch_rows = 0
+        for category, row_count, request in appends:
+            if batch_rows and batch_rows + row_count > COMMIT_CHUNK_ROWS:
+                batches.append(([], []))
+                batch_rows = 0
+            batches[-1][0].append(request)
+            batches[-1][1].append((category, row_count))
+            batch_rows += row_count
+
+        total_rows = sum(row_count for _, row_count, _ in appends)
+        category_count = len(staged)
+        for index, (requests, sent) in enumerate(batches, start=1):
+            try:
+                response = self._execute(
+                    self.service.spreadsheets().batchUpdate(
+                        spreadsheetId=self.sheet_id, body={"requests": requests}
+                    ),
+                    f"committing batch {index}/{len(batches)}",
+                    idempotent=False,
+                )
+            except HttpError as e:
+                logger.error(f"Error committing to Sheets: {e}")
+                self.invalidate_metadata()
+                raise
+            for reply in response.get("replies", []):
+                if "addSheet" in reply:
+                    properties = reply["addSheet"]["properties"]
+                    self._load_metadata()[properties["title"]] = properties["sheetId"]
+            self._drop_staged(sent)
+        logger.info(
+            f"Committed {total_rows} rows across {category_count} categories in {len(batches)} request(s)"
+        )
+
+    def _drop_staged(self, sent: List[Tuple[str, int]]) -> None:
+        """Remove rows of an applied batch (the first row_count staged rows per category)."""
+        for category, row_count in sent:
+            rows, apply_highlights = self._staged[category]
+            if row_count < len(rows):
+                self._staged[category] = (rows[row_count:], apply_highlights)
+            else:
+                del self._staged[category]
+
+    def close(self) -> None:
+        """Commit staged rows."""
+        self.commit()
+
+    def _append_cells_request(self, tab_id: int, rows: List[Dict], apply_highlights: bool) -> Dict:
+        """Build an appendCells request with values, highlight colour and notes."""
+        columns = _visible_columns(rows[0])
+        background = self._background_color()
+        row_data = []
+        for row in rows:
+            highlight_cells = row.get("_highlight_cells", []) if apply_highlights else []
+            cells = []
+            for col_name in columns:
+                cell = _cell_value(row.get(col_name, ""))
+                if col_name in highlight_cells:
+                    cell["userEnteredFormat"] = {"backgroundColor": background}
+                    cell["note"] = _note_text(row)
+                cells.append(cell)
+            row_data.append({"values": cells})
+
+        fields = "userEnteredValue"
+        if apply_highlights:
+            fields += ",userEnteredFormat.backgroundColor,note"
+        return {"appendCells": {"sheetId": tab_id, "rows": row_data, "fields": fields}}
+
+    def _background_color(self) -> Dict[str, float]:
+        """Highlight colour as a Sheets Color."""
+        return {
+            "red": float(int(self.highlight_color[1:3], 16)) / 255.0,
+            "green": float(int(self.highlight_color[3:5], 16)) / 255.0,
+            "blue": float(int(self.highlight_color[5:7], 16)) / 255.0,
+        }
+
+
+def _visible_columns(row: Dict) -> List[str]:
+    """Sorted output columns of a row (hidden "_" fields skipped)."""
+    return sorted(col for col in row.keys() if not col.startswith("_"))
+
+
+def _note_text(row: Dict) -> str:
+    """Review note for a flagged cell."""
+    note_text = f"Reason: {', '.join(row.get('_flags', []))}\nConfidence: {row.get('_ocr_confidence', 'N/A')}"
+    if row.get("_low_conf_tokens"):
+        note_text += "\nLow confidence tokens detected"
+    return note_text
+
+
+def _cell_value(value) -> Dict:
+    """CellData for a raw value (numbers and booleans keep their type, like RAW input)."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+def _quote_tab(title: str) -> str:
+    """Quote a tab title for A1 notation (needed for spaces and punctuation)."""
+    return "'" + title.replace("'", "''") + "'"
+
+
+def _range_start_row(a1_range: str) -> Optional[int]:
+    """
+    First row number of an A1 range such as "'Office Supplies'!A12:F40".
+
+    Returns:
+        1-based row number, or None if the range has no row
+    """
+    match = re.match(r"[A-Z]*(\d+)", a1_range.rsplit("!", 1)[-1])
+    return int(match.group(1)) if match else None
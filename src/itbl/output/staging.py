@@ -0,0 +1,296 @@
+"""Read staged parse output (CSV/XLSX) back for upload, with resumable checkpoints."""
+
+import csv
+import json
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+from itbl.util.config import load_sheets_config
+from itbl.util.logging import setup_logging
+
+logger = setup_logging()
+
+TRIAGE_COLUMN = "_triage"
+CHECKPOINT_FILE = ".itbl-write-checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+# Inline CSV annotation added by --csv-annotate
+_ANNOTATION = re.compile(r"^<<REVIEW: [^>]*>> ")
+# Plain decimal numbers (no leading zeros, so check and account numbers stay text)
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?")
+# Amount-type column names ("Amount", "Deductible Amount", "Monthly Cost", "Rate/Mile"...):
+# the only staged CSV cells read back as numbers (text columns keep values like "7",
+# "2024" or "1.50" as written)
+_NUMERIC_COLUMN = re.compile(r"\b(?:Amount|Cost|Total|Miles|Rate)\b")
+
+
+class StagedSource:
+    """One staged category: a CSV file, or one sheet of an XLSX workbook."""
+
+    def __init__(
+        self,
+        path: Path,
+        category: str,
+        sheet: Optional[str] = None,
+        numeric_columns: Iterable[str] = (),
+    ):
+        """
+        Initialize staged source.
+
+        Args:
+            path: Staged CSV or XLSX file
+            category: Category/tab name the rows belong to
+            sheet: Worksheet name (XLSX only)
+            numeric_columns: CSV columns read back as numbers (see find_numeric_columns)
+        """
+        self.path = path
+        self.category = category
+        self.sheet = sheet
+        self.numeric_columns = frozenset(numeric_columns)
+
+    @property
+    def key(self) -> str:
+        """Checkpoint key (file name, plus sheet for workbooks)."""
+        return f"{self.path.name}#{self.sheet}" if self.sheet else self.path.name
+
+    def signature(self) -> Dict[str, int]:
+        """File size and mtime, to detect staged files changed since a checkpoint."""
+        stat = self.path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """
+        Yield staged rows as normalized row dicts.
+
+        Review info is restored into _flags/_highlight_cells (from the CSV
+        triage column, or XLSX highlight fills and comments).
+        """
+        if self.sheet is None:
+            yield from _iter_csv_rows(self.path, self.category, self.numeric_columns)
+        else:
+            yield from _iter_xlsx_rows(self.path, self.sheet, self.category)
+
+    def __str__(self) -> str:
+        return self.key
+
+
+def find_numeric_columns(tabs: Mapping[str, Iterable[str]]) -> FrozenSet[str]:
+    """Amount-type columns (Amount, Cost, Total, Miles, Rate) across the sheets.yaml tabs."""
+    return frozenset(
+        column for columns in tabs.values() for column in columns if _NUMERIC_COLUMN.search(column)
+    )
+
+
+def find_staged_sources(
+    input_path: Path, tabs: Optional[Mapping[str, Iterable[str]]] = None
+) -> List[StagedSource]:
+    """
+    Find staged output files.
+
+    CSV files map to a category by file name (Office_Supplies.csv -> "Office
+    Supplies", matched against known categories first); every sheet of an XLSX
+    workbook is a category.
+
+    Args:
+        input_path: Staging directory or a single CSV/XLSX file
+        tabs: sheets.yaml tabs (category name -> columns; default: the default
+            config). Their amount-type columns are read back from CSV as numbers
+
+    Returns:
+        Sources in file name order
+    """
+    if tabs is None:
+        tabs = load_sheets_config().get("tabs", {})
+    numeric_columns = find_numeric_columns(tabs)
+    by_stem = {name.replace(" ", "_"): name for name in tabs}
+    paths = [input_path] if input_path.is_file() else sorted(input_path.iterdir())
+    sources = []
+    for path in paths:
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            category = by_stem.get(path.stem, path.stem.replace("_", " "))
+            sources.append(StagedSource(path, category, numeric_columns=numeric_columns))
+        elif suffix == ".xlsx" and not path.name.startswith("~$"):
+            if not OPENPYXL_AVAILABLE:
+                raise ImportError("openpyxl is required to read XLSX staging files. Install: pip install openpyxl")
+            sheets = load_workbook(path, read_only=True).sheetnames
+            sources.extend(StagedSource(path, sheet, sheet=sheet) for sheet in sheets)
+    return sources
+
+
+def iter_chunks(rows: Iterable[Dict], chunk_size: int, skip: int = 0) -> Iterator[List[Dict]]:
+    """
+    Group rows into lists of chunk_size, after skipping rows already uploaded.
+
+    Args:
+        rows: Row iterator
+        chunk_size: Rows per chunk
+        skip: Leading rows to drop
+
+    Yields:
+        Lists of up to chunk_size rows
+    """
+    chunk = []
+    for index, row in enumerate(rows):
+        if index < skip:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_triage(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Split a CSV triage cell ("flag_a; flag_b; highlight:Amount") into flags and highlights.
+
+    Returns:
+        (flags, highlight_cells)
+    """
+    flags, highlight_cells = [], []
+    for part in (text or "").split(";"):
+        part = part.strip()
+        if part.startswith("highlight:"):
+            highlight_cells.append(part[len("highlight:"):])
+        elif part:
+            flags.append(part)
+    return flags, highlight_cells
+
+
+def _csv_value(text: str, numeric: bool = False):
+    """Staged CSV cell back to a value: inline annotations removed, amounts as numbers."""
+    text = _ANNOTATION.sub("", text)
+    if numeric and _NUMBER.fullmatch(text):
+        return float(text) if "." in text else int(text)
+    return text
+
+
+def _iter_csv_rows(path: Path, category: str, numeric_columns: FrozenSet[str]) -> Iterator[Dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            flags, highlight_cells = parse_triage(record.pop(TRIAGE_COLUMN, ""))
+            row = {"_category": category, "_flags": flags, "_highlight_cells": highlight_cells}
+            row.update(
+                (col, _csv_value(value or "", col in numeric_columns))
+                for col, value in record.items()
+            )
+            yield row
+
+
+@lru_cache(maxsize=1)
+def _load_staged_workbook(path: Path, mtime_ns: int):
+    """
+    Load a staged workbook (cached for consecutive sheets of the same file).
+
+    Regular mode is needed: read-only mode does not load cell comments, which
+    carry the review reasons.
+    """
+    return load_workbook(path)
+
+
+def _iter_xlsx_rows(path: Path, sheet: str, category: str) -> Iterator[Dict]:
+    ws = _load_staged_workbook(path, path.stat().st_mtime_ns)[sheet]
+    rows = ws.iter_rows()
+    header = [cell.value for cell in next(rows, [])]
+    for cells in rows:
+        row = {"_category": category, "_flags": [], "_highlight_cells": []}
+        for col_name, cell in zip(header, cells):
+            if col_name is None:
+                continue
+            row[col_name] = "" if cell.value is None else cell.value
+            if cell.fill is not None and cell.fill.fill_type == "solid":
+                row["_highlight_cells"].append(col_name)
+            if cell.comment is not None and not row["_flags"]:
+                _apply_comment(row, cell.comment.text)
+        yield row
+
+
+def _apply_comment(row: Dict, text: str) -> None:
+    """Restore flags and confidence from an XLSX review comment."""
+    for line in text.splitlines():
+        if line.startswith("Reason: "):
+            row["_flags"] = [flag.strip() for flag in line[len("Reason: "):].split(",") if flag.strip()]
+        elif line.startswith("Confidence: "):
+            try:
+                row["_ocr_confidence"] = float(line[len("Confidence: "):])
+            except ValueError:
+                pass
+        elif line.startswith("Low confidence tokens"):
+            row["_low_conf_tokens"] = True
+
+
+class UploadCheckpoint:
+    """
+    Rows already uploaded per staged source, saved after every committed chunk.
+
+    The checkpoint belongs to one spreadsheet; sources whose file changed since
+    it was recorded start over.
+    """
+
+    def __init__(self, path: Path, sheet_id: str):
+        """
+        Initialize checkpoint, loading progress from a previous run.
+
+        Args:
+            path: Checkpoint JSON file
+            sheet_id: Target spreadsheet ID
+        """
+        self.path = path
+        self.sheet_id = sheet_id
+        self.sources: Dict[str, Dict] = {}
+        if path.exists():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+                return
+            if data.get("version") == CHECKPOINT_VERSION and data.get("sheet_id") == sheet_id:
+                self.sources = data.get("sources", {})
+
+    def rows_done(self, source: StagedSource) -> int:
+        """Rows of a source already committed (0 if the file changed since)."""
+        entry = self.sources.get(source.key)
+        if not entry:
+            return 0
+        if {"size": entry.get("size"), "mtime_ns": entry.get("mtime_ns")} != source.signature():
+            logger.warning(f"{source.key} changed since the last upload; uploading it from the start")
+            return 0
+        return entry.get("rows", 0)
+
+    def record(self, source: StagedSource, rows: int) -> None:
+        """Save progress for a source (atomic replace, so a crash keeps the last good state)."""
+        self.sources[source.key] = {"rows": rows, **source.signature()}
+        payload = json.dumps(
+            {"version": CHECKPOINT_VERSION, "sheet_id": self.sheet_id, "sources": self.sources},
+            indent=2,
+        )
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def reset(self) -> None:
+        """Forget all progress."""
+        self.sources = {}
+        if self.path.exists():
+            self.path.unlink()
@@ -2,12 +2,92 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+
+class RowSink(ABC):
+    """Incremental per-category output: rows are appended as they are produced."""
+
+    def __init__(self):
+        """Initialize row sink."""
+        self.rows_written = 0
+
+    @abstractmethod
+    def append(self, row: Dict) -> None:
+        """
+        Append one row.
+
+        Args:
+            row: Normalized row dict
+        """
+        pass
+
+    def close(self) -> None:
+        """Flush and release the sink (safe to call more than once)."""
+        pass
+
+
+class BufferedSink(RowSink):
+    """
+    Fallback sink for writers without native streaming.
+
+    Buffers rows and hands them to writer.write() every flush_every rows (and on
+    close), so memory is bounded by one batch when flush_every is set.
+    """
+
+    def __init__(
+        self,
+        writer: "WriterBase",
+        output_path: Path,
+        category: str,
+        apply_highlights: bool = False,
+        flush_every: Optional[int] = None,
+    ):
+        """
+        Initialize buffered sink.
+
+        Args:
+            writer: Writer whose write() receives each batch
+            output_path: Output file/directory path
+            category: Category/tab name
+            apply_highlights: Whether to apply yellow highlighting
+            flush_every: Batch size (None = write everything on close)
+        """
+        super().__init__()
+        self.writer = writer
+        self.output_path = output_path
+        self.category = category
+        self.apply_highlights = apply_highlights
+        self.flush_every = flush_every
+        self._buffer: List[Dict] = []
+
+    def append(self, row: Dict) -> None:
+        """Buffer a row, writing the batch once it is full."""
+        self._buffer.append(row)
+        if self.flush_every and len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows."""
+        if not self._buffer:
+            return
+        self.writer.write(
+            self._buffer, self.output_path, self.category, apply_highlights=self.apply_highlights
+        )
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        """Write any remaining rows."""
+        self.flush()
 
 
 class WriterBase(ABC):
     """Base class for output writers."""
 
+    # Rows per write() call for the default buffered sink (None = one call on close)
+    stream_batch_size: Optional[int] = None
+
     @abstractmethod
     def write(
         self,
@@ -18,7 +98,7 @@ class WriterBase(ABC):
     ) -> None:
         """
         Write rows to output.
-        
+
         Args:
             rows: List of normalized row dicts
             output_path: Output file/directory path
@@ -27,3 +107,30 @@ class WriterBase(ABC):
         """
         pass
 
+    def open_sink(
+        self,
+        output_path: Path,
+        category: str,
+        apply_highlights: bool = False,
+    ) -> RowSink:
+        """
+        Open an incremental sink for one category.
+
+        Writers that can append natively override this; the default buffers rows
+        and calls write() in batches of stream_batch_size.
+
+        Args:
+            output_path: Output file/directory path
+            category: Category/tab name
+            apply_highlights: Whether to apply yellow highlighting
+
+        Returns:
+            RowSink for the category
+        """
+        return BufferedSink(
+            self, output_path, category, apply_highlights, flush_every=self.stream_batch_size
+        )
+
+    def close(self) -> None:
+        """Finish any output shared across categories (called once after all sinks close)."""
+        pass
@@ -1,35 +1,49 @@
 """XLSX writer with yellow highlighting and comments."""
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 try:
-    from openpyxl import Workbook
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.comments import Comment
-    from openpyxl.styles import PatternFill
+    from openpyxl.styles import Font, PatternFill
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
-from itbl.output.writer_base import WriterBase
+from itbl.output.writer_base import RowSink, WriterBase
 
 
 class XLSXWriter(WriterBase):
-    """XLSX writer with highlighting support."""
+    """
+    XLSX writer with highlighting support.
 
-    def __init__(self, highlight_color: str = "#FFF59D"):
+    Rows are streamed through openpyxl's write-only mode, so they are serialized
+    as they arrive instead of being kept as cell objects. A directory output gets
+    one category_name.xlsx per category; a file output gets a single workbook
+    with one sheet per category, saved by close().
+
+    With append=True an existing workbook is loaded (write-only mode cannot
+    edit files) and rows go below the data already in each category's sheet.
+    """
+
+    def __init__(self, highlight_color: str = "#FFF59D", append: bool = False):
         """
         Initialize XLSX writer.
-        
+
         Args:
             highlight_color: Hex color for highlights (default: yellow #FFF59D)
+            append: Add rows to existing workbooks instead of replacing them
         """
         if not OPENPYXL_AVAILABLE:
             raise ImportError(
                 "openpyxl is required for XLSX output. Install: pip install openpyxl"
             )
         self.highlight_color = highlight_color
+        self.append = append
         self.fill = PatternFill(start_color=highlight_color.replace("#", ""), end_color=highlight_color.replace("#", ""), fill_type="solid")
+        self._workbooks: Dict[Path, "_WorkbookTarget"] = {}  # Multi-category workbooks, saved by close()
 
     def write(
         self,
@@ -40,7 +54,10 @@ class XLSXWriter(WriterBase):
     ) -> None:
         """
         Write rows to XLSX file.
-        
+
+        A file output_path collects each category as a sheet of one workbook;
+        call close() once all categories are written to save it.
+
         Args:
             rows: List of normalized row dicts
             output_path: Output file path (or directory; will create category_name.xlsx)
@@ -50,51 +67,199 @@ class XLSXWriter(WriterBase):
         if not OPENPYXL_AVAILABLE:
             raise ImportError("openpyxl not available")
 
+        if not rows:
+            return
+
+        sink = self.open_sink(output_path, category, apply_highlights=apply_highlights)
+        try:
+            for row in rows:
+                sink.append(row)
+        finally:
+            sink.close()
+
+    def open_sink(
+        self,
+        output_path: Path,
+        category: str,
+        apply_highlights: bool = False,
+    ) -> "XLSXRowSink":
+        """
+        Open an incremental XLSX sink for one category.
+
+        Args:
+            output_path: Output file path (or directory; will create category_name.xlsx)
+            category: Category/tab name
+            apply_highlights: Whether to apply yellow highlighting
+
+        Returns:
+            XLSXRowSink streaming rows into the category's sheet
+        """
         if output_path.is_dir():
-            output_file = output_path / f"{category.replace(' ', '_')}.xlsx"
-        else:
-            output_file = output_path
+            target = _WorkbookTarget(output_path / f"{category.replace(' ', '_')}.xlsx", self.append)
+            return XLSXRowSink(self, target.sheet(category), apply_highlights, save_on_close=target)
 
-        if not rows:
+        target = self._workbooks.get(output_path)
+        if target is None:
+            target = self._workbooks[output_path] = _WorkbookTarget(output_path, self.append)
+        return XLSXRowSink(self, target.sheet(category), apply_highlights)
+
+    def close(self) -> None:
+        """Save the multi-category workbooks."""
+        for target in self._workbooks.values():
+            target.save()
+        self._workbooks = {}
+
+    def _styled(self, row: Dict, apply_highlights: bool, col_name: str):
+        """
+        Highlight fill and review comment for one cell.
+
+        Returns:
+            (fill, comment) tuple; fill is None for cells that are not highlighted
+        """
+        if not apply_highlights or col_name not in row.get("_highlight_cells", []):
+            return None, None
+
+        # Add comment with reason
+        comment = None
+        flags = row.get("_flags", [])
+        if flags:
+            comment_text = f"Reason: {', '.join(flags)}\nConfidence: {row.get('_ocr_confidence', 'N/A')}"
+            if row.get("_low_conf_tokens"):
+                comment_text += "\nLow confidence tokens detected"
+            comment = Comment(comment_text, "itbl")
+        return self.fill, comment
+
+
+class _WorkbookTarget:
+    """One output workbook: write-only when new, loaded normally when appending."""
+
+    def __init__(self, path: Path, append: bool):
+        self.path = path
+        self.write_only = not (append and path.exists())
+        self.wb = Workbook(write_only=True) if self.write_only else load_workbook(path)
+        self.sheets: Dict[str, "_SheetStream"] = {}
+        self.saved = False
+
+    def sheet(self, category: str) -> "_SheetStream":
+        """Sheet stream for a category (one per workbook)."""
+        if category not in self.sheets:
+            self.sheets[category] = _SheetStream(self, category)
+        return self.sheets[category]
+
+    def save(self) -> None:
+        """Save the workbook if any rows were written (write-only workbooks save once)."""
+        if self.saved or not any(sheet.ws is not None for sheet in self.sheets.values()):
             return
+        self.wb.save(self.path)
+        self.saved = True
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = category
 
-        # Determine columns (skip hidden fields)
-        hidden_prefixes = ["_"]
-        sample_row = rows[0]
-        all_cols = set(sample_row.keys())
-        visible_cols = [
-            col for col in all_cols
-            if not any(col.startswith(prefix) for prefix in hidden_prefixes)
-        ]
-        visible_cols = sorted(list(visible_cols))
-
-        # Write header
-        for col_idx, col_name in enumerate(visible_cols, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=col_name)
-            cell.font = cell.font.copy(bold=True)
-
-        # Write rows
-        for row_idx, row in enumerate(rows, start=2):
-            flags = row.get("_flags", [])
-            highlight_cells = row.get("_highlight_cells", [])
-
-            for col_idx, col_name in enumerate(visible_cols, start=1):
+class _SheetStream:
+    """Appends rows to one worksheet; the header is written with the first row."""
+
+    def __init__(self, target: _WorkbookTarget, category: str):
+        self.target = target
+        self.category = category
+        self.ws = None
+        self.columns: List[str] = []
+        self.next_row = 1  # Next row index (loaded workbooks only)
+
+    def append(self, writer: XLSXWriter, row: Dict, apply_highlights: bool) -> None:
+        """Write one data row."""
+        if self.ws is None:
+            self._open(row)
+
+        if self.target.write_only:
+            values = []
+            for col_name in self.columns:
                 value = row.get(col_name, "")
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
+                fill, comment = writer._styled(row, apply_highlights, col_name)
+                if fill is None:
+                    values.append(value)
+                    continue
+                cell = WriteOnlyCell(self.ws, value=value)
+                cell.fill = fill
+                cell.comment = comment
+                values.append(cell)
+            self.ws.append(values)
+            return
+
+        for col_idx, col_name in enumerate(self.columns, start=1):
+            cell = self.ws.cell(row=self.next_row, column=col_idx, value=row.get(col_name, ""))
+            fill, comment = writer._styled(row, apply_highlights, col_name)
+            if fill is not None:
+                cell.fill = fill
+                cell.comment = comment
+        self.next_row += 1
+
+    def _open(self, row: Dict) -> None:
+        """Create (or, when appending, reopen) the worksheet and fix the column order."""
+        # Determine columns (skip hidden fields)
+        row_columns = sorted(col for col in row.keys() if not col.startswith("_"))
+        wb = self.target.wb
 
-                # Apply highlighting if flagged
-                if apply_highlights and col_name in highlight_cells:
-                    cell.fill = self.fill
-                    # Add comment with reason
-                    if flags:
-                        comment_text = f"Reason: {', '.join(flags)}\nConfidence: {row.get('_ocr_confidence', 'N/A')}"
-                        if row.get("_low_conf_tokens"):
-                            comment_text += f"\nLow confidence tokens detected"
-                        cell.comment = Comment(comment_text, "itbl")
+        if self.target.write_only:
+            self.ws = wb.create_sheet(self.category)
+            self.columns = row_columns
+            header = []
+            for col_name in self.columns:
+                cell = WriteOnlyCell(self.ws, value=col_name)
+                cell.font = Font(bold=True)
+                header.append(cell)
+            self.ws.append(header)
+            return
+
+        if self.category in wb.sheetnames:
+            # Keep the existing header order; new columns go on the end
+            self.ws = wb[self.category]
+            self.columns = [cell.value for cell in self.ws[1] if cell.value is not None]
+            self.next_row = self.ws.max_row + 1
+        else:
+            self.ws = wb.create_sheet(self.category)
+            self.next_row = 2
+        new_columns = [col for col in row_columns if col not in self.columns]
+        for col_idx, col_name in enumerate(new_columns, start=len(self.columns) + 1):
+            self.ws.cell(row=1, column=col_idx, value=col_name).font = Font(bold=True)
+        self.columns.extend(new_columns)
+
+
+class XLSXRowSink(RowSink):
+    """
+    Streams rows into one category's worksheet.
+
+    Per-category workbooks are saved when the sink is closed; sheets of a
+    shared workbook are saved by XLSXWriter.close().
+    """
+
+    def __init__(
+        self,
+        writer: XLSXWriter,
+        sheet: _SheetStream,
+        apply_highlights: bool,
+        save_on_close: Optional[_WorkbookTarget] = None,
+    ):
+        """
+        Initialize XLSX sink.
+
+        Args:
+            writer: XLSXWriter providing the highlight fill
+            sheet: Worksheet stream for the category
+            apply_highlights: Whether to apply yellow highlighting
+            save_on_close: Workbook to save on close (None for shared workbooks)
+        """
+        super().__init__()
+        self.writer = writer
+        self.sheet = sheet
+        self.apply_highlights = apply_highlights
+        self.save_on_close = save_on_close
 
-        wb.save(output_file)
+    def append(self, row: Dict) -> None:
+        """Write one row (the header is written with the first row)."""
+        self.sheet.append(self.writer, row, self.apply_highlights)
+        self.rows_written += 1
 
+    def close(self) -> None:
+        """Save a per-category workbook."""
+        if self.save_on_close is not None:
+            self.save_on_close.save()
+            self.save_on_close = None
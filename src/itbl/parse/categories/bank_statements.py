@@ -1,21 +1,59 @@
 """Extractor for bank statement documents."""
 
 import re
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from itbl.parse.common import extract_date
+from itbl.parse.dates import parse_date
+from itbl.parse.lexer import LexedText, lex
 
+# Transaction rows are parsed one line at a time from the right: the amount
+# column is the last whitespace-separated token (or the one before it, when
+# the last is a running balance). Only whole tokens are matched, so parsing
+# is linear in the line length and nothing can backtrack across a description.
 
-def extract_statement_fields(text: str) -> Dict:
+# Amount column token: a "$" amount or one with cents ("-$1,169.21", "$5",
+# "734.00"), thousands grouped by three
+_AMOUNT_TOKEN = re.compile(r"([-+]?)(\$|(?=[\d,]*\.\d\d$))(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)")
+# Date column at the start of a row: "01/15/2024", "1-5-24"
+_ROW_DATE = re.compile(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}")
+# Words of an undated "VENDOR [LOCATION] $amount" description
+_VENDOR_WORD = re.compile(r"[A-Z0-9&#.,/*'-]+")
+_VENDOR_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789&#.,/*'-")
+_CAPITAL = re.compile(r"[A-Z]")
+_STATE_CODE = re.compile(r"[A-Z]{2}")
+_STORE_NUMBER = re.compile(r"#?\d+")
+_LOCATION_WORD = re.compile(r"[A-Z]+")
+# Summary block vocabulary ("NEW BALANCE $1,234.56", "MINIMUM PAYMENT DUE $35.00"):
+# rows with these descriptions are statement totals, not transactions
+_SUMMARY_LINE = re.compile(
+    r"\b(?:balance(?! transfer)|minimum|payment due|due date|amount due|past due|credit limit|credit line"
+    r"|available credit|cash advance limit|fees charged|interest charged|total fees|total interest"
+    r"|payments and (?:other )?credits|annual percentage)\b",
+    re.IGNORECASE,
+)
+_BALANCE = re.compile(r"BALANCE[:\s]+\$?(\d{1,3}(?:[,.]\d{3})*(?:\.\d{2})?)", re.IGNORECASE)
+
+
+def extract_statement_fields(
+    text: str,
+    date_formats: List[str] | None = None,
+    lexed: LexedText | None = None,
+) -> Dict:
     """
     Extract fields from a bank statement.
     
     Args:
         text: OCR text from statement
+        date_formats: strftime formats to try (rules.yaml date_formats)
+        lexed: Span index of text (lexed once per document and shared)
     
     Returns:
         Dict with: date, description, amount, balance, transaction_type
     """
+    if lexed is None:
+        lexed = lex(text, date_formats)
+    text = lexed.text
+
     result = {
         "date": None,
         "description": None,
@@ -25,74 +63,10 @@ def extract_statement_fields(text: str) -> Dict:
     }
 
     # Extract date (look for dates in various formats)
-    date, _ = extract_date(text)
-    result["date"] = date
+    date = lexed.best_date()
+    result["date"] = date.value if date else None
 
-    # Pattern 1: Traditional statement format "Date | Description | Amount"
-    transaction_patterns = [
-        r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+([A-Za-z0-9\s&.,\-]+?)\s+([\-\+]?\$?\d{1,3}(?:[,.]\d{3})*(?:\.\d{2})?)",
-    ]
-    
-    transactions = []
-    for pattern in transaction_patterns:
-        matches = re.finditer(pattern, text, re.MULTILINE)
-        for match in matches:
-            transactions.append({
-                "date": match.group(1),
-                "description": match.group(2).strip(),
-                "amount_str": match.group(3),
-            })
-
-    # Pattern 2: Simple format "VENDOR/LOCATION $amount" (common in credit card statements)
-    # This pattern matches: "THE HOME DEPOT 2676 $433.96" or "DUNKIN #331430 $5.55"
-    # Also handles: "THE HOME DEPOT #2676 LEOMINSTER MA $115.81"
-    # Pattern: Match vendor (may include store #), optionally followed by location "CITY ST", then $amount
-    # We match vendor up to a point where we see a location pattern or directly see the $amount
-    simple_pattern = r"([A-Z][A-Z0-9\s&#.,/\-]+?)\s+(?:([A-Z][A-Z\s]+\s+[A-Z]{2})\s+)?\$(\d{1,3}(?:[,.]\d{3})*(?:\.\d{2})?)"
-    simple_matches = re.finditer(simple_pattern, text)
-    for match in simple_matches:
-        vendor_desc = match.group(1).strip()
-        location = match.group(2)  # Optional location like "LEOMINSTER MA"
-        amount_str = match.group(3)
-        
-        # Clean up vendor name - remove trailing numbers/locations
-        vendor_clean = vendor_desc.strip()
-        
-        # Remove trailing state codes like "MA", "NH", etc.
-        vendor_clean = re.sub(r'\s+[A-Z]{2}\s*$', '', vendor_clean)
-        
-        # Remove trailing store numbers/IDs that appear after vendor name
-        # Patterns: "#2676", "2676", "LEOMINSTER MA" at the end
-        vendor_clean = re.sub(r'\s+#?\d+\s*$', '', vendor_clean)  # Remove trailing numbers
-        vendor_clean = re.sub(r'\s+[A-Z\s]+\s+[A-Z]{2}\s*$', '', vendor_clean)  # Remove "LOCATION MA" pattern
-        vendor_clean = vendor_clean.strip()
-        
-        # Skip if looks like a location instead of vendor (e.g., "LUNENBURG MA")
-        words = vendor_clean.split()
-        if len(words) <= 2:
-            # Check if it's likely a location (all caps, long words typical of city names)
-            if any(len(w) >= 6 and w.isupper() for w in words):
-                continue
-        
-        # Skip if vendor name is too short or looks like garbage
-        if len(vendor_clean) < 3 or len(vendor_clean) > 80:
-            continue
-        
-        # Must contain at least one letter
-        if not any(c.isalpha() for c in vendor_clean):
-            continue
-        
-        try:
-            amount = float(amount_str.replace(",", ""))
-            if amount > 0:  # Only consider positive amounts (charges)
-                transactions.append({
-                    "date": None,  # Date not in this format
-                    "description": vendor_clean,
-                    "amount_str": f"${amount:.2f}",
-                    "amount": amount,
-                })
-        except ValueError:
-            continue
+    transactions = list(_iter_transactions(text))
 
     # Process transactions - prefer largest amount (likely most significant transaction)
     if transactions:
@@ -118,47 +92,223 @@ def extract_statement_fields(text: str) -> Dict:
         
         tx = transactions[0]
         
-        result["date"] = tx.get("date") or result["date"]  # Use extracted date if available
+        # Use the transaction's date if it parses (YYYY-MM-DD, like the scanned date)
+        if tx.get("date"):
+            result["date"] = parse_date(tx["date"], lexed.date_formats) or result["date"]
         result["description"] = tx["description"]
-        
-        # Parse amount
-        if "amount" in tx:
-            result["amount"] = tx["amount"]
-        else:
-            amount_str = tx["amount_str"].replace("$", "").replace(",", "").strip()
-            if amount_str.startswith("-") or amount_str.startswith("+"):
-                sign = amount_str[0]
-                amount_str = amount_str[1:]
-                result["transaction_type"] = "debit" if sign == "-" else "credit"
-            else:
-                # Try to infer from context
-                desc_lower = tx["description"].lower()
-                if any(word in desc_lower for word in ["withdrawal", "debit", "payment", "charge"]):
-                    result["transaction_type"] = "debit"
-                elif any(word in desc_lower for word in ["deposit", "credit", "payment received"]):
-                    result["transaction_type"] = "credit"
-
-            try:
-                amount = float(amount_str)
-                if result["transaction_type"] == "debit":
-                    amount = -abs(amount)  # Ensure negative for debits
-                result["amount"] = amount
-            except ValueError:
-                pass
+        result["amount"], result["transaction_type"] = _amount_and_type(tx)
 
     # Extract balance if present
-    balance_patterns = [
-        r"BALANCE[:\s]+\$?(\d{1,3}(?:[,.]\d{3})*(?:\.\d{2})?)",
-        r"ENDING\s+BALANCE[:\s]+\$?(\d{1,3}(?:[,.]\d{3})*(?:\.\d{2})?)",
-    ]
-    for pattern in balance_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            try:
-                result["balance"] = float(match.group(1).replace(",", ""))
-                break
-            except ValueError:
-                continue
+    match = lexed.search_at(_BALANCE, lexed.keyword("balance"))
+    if match:
+        result["balance"] = float(match.group(1).replace(",", ""))
 
     return result
 
+
+def iter_statement_transactions(
+    text: str,
+    date_formats: List[str] | None = None,
+    lexed: LexedText | None = None,
+) -> Iterator[Dict]:
+    """
+    Yield every transaction of a bank statement, in text order.
+
+    Rows are parsed one line at a time as they are consumed, so long
+    statements are never held as a list of transactions. Dates are
+    YYYY-MM-DD; undated rows (and rows whose date doesn't parse) get the
+    statement date.
+
+    Args:
+        text: OCR text from statement
+        date_formats: strftime formats to try (rules.yaml date_formats)
+        lexed: Span index of text (lexed once per document and shared)
+
+    Yields:
+        Dicts with: date, description, amount, transaction_type
+    """
+    if lexed is not None:
+        text, date_formats = lexed.text, lexed.date_formats
+    statement_date, scanned = None, False
+    for tx in _iter_transactions(text):
+        date = parse_date(tx["date"], date_formats) if tx["date"] else None
+        if date is None:
+            if not scanned:  # Date scan only for statements with undated rows
+                if lexed is None:
+                    lexed = lex(text, date_formats)
+                best = lexed.best_date()
+                statement_date, scanned = (best.value if best else None), True
+            date = statement_date
+        amount, transaction_type = _amount_and_type(tx)
+        yield {
+            "date": date,
+            "description": tx["description"],
+            "amount": amount,
+            "transaction_type": transaction_type,
+        }
+
+
+def _amount_and_type(tx: Dict) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Signed amount and transaction type ("debit", "credit" or None) of a parsed row.
+
+    Args:
+        tx: Row from _iter_transactions
+
+    Returns:
+        Tuple of (amount, transaction_type)
+    """
+    if "amount" in tx:
+        return tx["amount"], None
+
+    transaction_type = None
+    amount_str = tx["amount_str"].replace("$", "").replace(",", "").strip()
+    if amount_str.startswith("-") or amount_str.startswith("+"):
+        sign = amount_str[0]
+        amount_str = amount_str[1:]
+        transaction_type = "debit" if sign == "-" else "credit"
+    else:
+        # Try to infer from context
+        desc_lower = tx["description"].lower()
+        if any(word in desc_lower for word in ["withdrawal", "debit", "payment", "charge"]):
+            transaction_type = "debit"
+        elif any(word in desc_lower for word in ["deposit", "credit", "payment received"]):
+            transaction_type = "credit"
+
+    try:
+        amount = float(amount_str)
+    except ValueError:
+        return None, transaction_type
+    if transaction_type == "debit":
+        amount = -abs(amount)  # Ensure negative for debits
+    return amount, transaction_type
+
+
+def _iter_transactions(text: str) -> Iterator[Dict]:
+    """
+    Transaction rows of a statement, in text order.
+
+    Rows starting with a date column are dated transactions; other rows
+    count when the amount has a "$", with the vendor taken from the text
+    before it. Summary rows (balances, minimum payment, credit limit, fees
+    and interest charged) are skipped.
+
+    Args:
+        text: OCR text from statement
+    """
+    for line in text.splitlines():
+        words = line.split()
+        column = _amount_column(words)
+        if column is None:
+            continue
+        index, sign, symbol, digits = column
+        if _ROW_DATE.fullmatch(words[0]):
+            description = " ".join(words[1:index])
+            if index > 1 and not _SUMMARY_LINE.search(description):
+                yield {
+                    "date": words[0],
+                    "description": description,
+                    "amount_str": sign + digits,
+                }
+        elif symbol and not _SUMMARY_LINE.search(line):
+            vendor = _vendor_name(words[:index])
+            amount = float(digits.replace(",", ""))
+            if vendor and amount > 0:  # Only consider positive amounts (charges)
+                yield {
+                    "date": None,  # Date not in this format
+                    "description": vendor,
+                    "amount_str": f"${amount:.2f}",
+                    "amount": amount,
+                }
+
+
+def _amount_column(words: List[str]) -> Optional[tuple]:
+    """
+    Amount column of a row split into words.
+
+    The amount is the last amount token, or the one before it when both of
+    the last two tokens are amounts (amount, then running balance). A lone
+    "$" or sign token before the amount is part of it ("- $ 12.00").
+
+    Args:
+        words: Row text split on whitespace
+
+    Returns:
+        (index of the first amount word, sign, "$" or "", digits), or None
+        if the row doesn't end in an amount
+    """
+    amount = _AMOUNT_TOKEN.fullmatch(words[-1]) if words else None
+    if amount is None:
+        return None
+    index = len(words) - 1
+    if index > 0:
+        previous = _AMOUNT_TOKEN.fullmatch(words[index - 1])
+        if previous is not None:
+            index, amount = index - 1, previous
+    sign, symbol, digits = amount.groups()
+    if index > 0 and words[index - 1] == "$" and not symbol:
+        index, symbol = index - 1, "$"
+    if index > 0 and words[index - 1] in ("-", "+", "-$", "+$") and not sign:
+        index, sign, symbol = index - 1, words[index - 1][0], symbol or words[index - 1][1:]
+    return index, sign, symbol, digits
+
+
+def _vendor_name(words: List[str]) -> Optional[str]:
+    """
+    Vendor of an undated "VENDOR [#STORE] [LOCATION ST] $amount" row.
+
+    Args:
+        words: Row words before the amount
+
+    Returns:
+        Cleaned vendor name, or None if the words don't look like one
+    """
+    # The description is the trailing run of vendor characters, from its first capital letter
+    start = len(words)
+    while start > 0 and _VENDOR_WORD.fullmatch(words[start - 1]):
+        start -= 1
+    run = words[start:]
+    if start > 0:  # The run can begin inside a word ("Paid:ACME")
+        word = words[start - 1]
+        cut = len(word)
+        while cut > 0 and word[cut - 1] in _VENDOR_CHARS:
+            cut -= 1
+        if cut < len(word):
+            run.insert(0, word[cut:])
+    for first, word in enumerate(run):
+        capital = _CAPITAL.search(word)
+        if capital:
+            words = run[first:]
+            words[0] = word[capital.start():]
+            break
+    else:
+        return None
+
+    # Location before the amount ("LEOMINSTER MA"): the longest run of
+    # all-letter words ending in a state code, keeping at least one word
+    words = _strip_location(words)
+    # Trailing state code, store number ("#2676", "0042"), then "LOCATION MA"
+    if len(words) >= 2 and _STATE_CODE.fullmatch(words[-1]):
+        words.pop()
+    if len(words) >= 2 and _STORE_NUMBER.fullmatch(words[-1]):
+        words.pop()
+    words = _strip_location(words)
+
+    # Skip if looks like a location instead of vendor (e.g., "LUNENBURG MA")
+    if len(words) <= 2 and any(len(word) >= 6 and word.isupper() for word in words):
+        return None
+    vendor = " ".join(words)
+    # Skip if vendor name is too short or looks like garbage (it starts with a letter)
+    if len(vendor) < 3 or len(vendor) > 80:
+        return None
+    return vendor
+
+
+def _strip_location(words: List[str]) -> List[str]:
+    """words without a trailing "CITY [CITY...] ST" run of at least two words (one word always stays)."""
+    if len(words) < 3 or not _STATE_CODE.fullmatch(words[-1]):
+        return words
+    cut = len(words) - 1
+    while cut > 1 and _LOCATION_WORD.fullmatch(words[cut - 1]):
+        cut -= 1
+    return words[:cut] if cut < len(words) - 1 else words
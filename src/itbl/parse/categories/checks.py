@@ -1,21 +1,68 @@
 """Extractor for check documents."""
 
 import re
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional
 
-from itbl.parse.common import extract_date
+from itbl.parse.lexer import LexedText, lex
 
+# Payee: (pattern, anchor keywords). Patterns run at keyword spans instead of
+# scanning the whole text. Handles common OCR errors: "1Q" -> "TO", "0" -> "O".
+_PAYEE_PATTERNS = [
+    (  # Stop at common check text
+        re.compile(
+            r"PAY\s+(?:TO|1Q|T0)\s+THE\s+ORDER\s+OF[:\s]+([A-Za-z0-9\s&.,\-'']+?)(?:\s+CUSTOMER|\s+DETAILS|\s+NON|\s+COPY|$)",
+            re.IGNORECASE | re.MULTILINE,
+        ),
+        ("pay to the order",),
+    ),
+    (
+        re.compile(
+            r"PAY\s+(?:TO|1Q|T0)[:\s]+([A-Za-z0-9\s&.,\-'']+?)(?:\s+CUSTOMER|\s+DETAILS|\s+COPY|$)",
+            re.IGNORECASE | re.MULTILINE,
+        ),
+        ("pay to the order", "pay to"),
+    ),
+    (re.compile(r"PAYEE[:\s]+([A-Za-z0-9\s&.,\-'']+)", re.IGNORECASE | re.MULTILINE), ("payee",)),
+]
+_AMOUNT_LABEL = re.compile(r"AMOUNT[:\s]+\$?\s*(\d+(?:\.\d{2})?)", re.IGNORECASE)  # "AMOUNT: $123.45"
+_DOLLARS_AFTER = re.compile(r"\s*dollar", re.IGNORECASE)  # 123.45 DOLLARS
+_AMOUNT_WORDS = re.compile(r"(\w+(?:\s+\w+)*)\s+Dollars?", re.IGNORECASE)
+# Amount at end of line (common in check amount box)
+_LINE_END_AMOUNT = re.compile(r"\d{1,5}(?:\.\d{2})?")
+# Check number: (pattern, anchor); None anchors the pattern at line starts
+_CHECK_NUMBER_PATTERNS = [
+    (re.compile(r"CHECK\s*#?\s*(\d+(?:[-\s]\d+)*)", re.IGNORECASE), "check"),
+    (re.compile(r"CHECK\s+NUMBER[:\s]+(\d+(?:[-\s]\d+)*)", re.IGNORECASE), "check"),
+    (re.compile(r"#\s*(\d{3,}(?:[-\s]\d+)*)"), "#"),  # Common check number format
+    (re.compile(r"(\d{2,}[-\s]\d{3,})"), None),  # At start: "52-0133" or "52 0133"
+    (re.compile(r"(\d{4,})"), None),  # At start: plain number 4+ digits
+]
+_MEMO_PATTERNS = [
+    (re.compile(r"MEMO[:\s]+(.+)", re.IGNORECASE), "memo"),
+    (re.compile(r"FOR[:\s]+(.+)", re.IGNORECASE), "for"),
+]
 
-def extract_check_fields(text: str) -> Dict:
+
+def extract_check_fields(
+    text: str,
+    date_formats: List[str] | None = None,
+    lexed: LexedText | None = None,
+) -> Dict:
     """
     Extract fields from a check image.
     
     Args:
         text: OCR text from check
+        date_formats: strftime formats to try (rules.yaml date_formats)
+        lexed: Span index of text (lexed once per document and shared)
     
     Returns:
         Dict with: date, payee, amount_digits, amount_words, check_number, memo
     """
+    if lexed is None:
+        lexed = lex(text, date_formats)
+    text = lexed.text
+
     result = {
         "date": None,
         "payee": None,
@@ -27,18 +74,12 @@ def extract_check_fields(text: str) -> Dict:
     }
 
     # Extract date (usually top-right on check)
-    date, _ = extract_date(text)
-    result["date"] = date
+    date = lexed.best_date()
+    result["date"] = date.value if date else None
 
     # Extract payee (usually "PAY TO THE ORDER OF")
-    # Handle common OCR errors: "1Q" -> "TO", "0" -> "O", etc.
-    payee_patterns = [
-        r"PAY\s+(?:TO|1Q|T0)\s+THE\s+ORDER\s+OF[:\s]+([A-Za-z0-9\s&.,\-'']+?)(?:\s+CUSTOMER|\s+DETAILS|\s+NON|\s+COPY|$)",  # Stop at common check text
-        r"PAY\s+(?:TO|1Q|T0)[:\s]+([A-Za-z0-9\s&.,\-'']+?)(?:\s+CUSTOMER|\s+DETAILS|\s+COPY|$)",
-        r"PAYEE[:\s]+([A-Za-z0-9\s&.,\-'']+)",
-    ]
-    for pattern in payee_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    for pattern, anchors in _PAYEE_PATTERNS:
+        match = lexed.search_at(pattern, lexed.keyword(*anchors))
         if match:
             payee = match.group(1).strip()
             # Clean up common OCR artifacts
@@ -48,58 +89,41 @@ def extract_check_fields(text: str) -> Dict:
                 break
 
     # Extract amount in digits (usually after $ or in amount box)
-    amount_patterns = [
-        r"\$\s*(\d{1,3}(?:[,.]\d{3})*(?:\.\d{2})?)",  # Standard $123.45
-        r"(\d{1,3}(?:[,.]\d{3})*\.\d{2})\s*(?:dollars?|DOLLARS?)",  # 123.45 DOLLARS
-        r"\$\s*(\d+)\.?(\d{0,2})",  # $123 or $123.45 (flexible)
-        r"AMOUNT[:\s]+\$?\s*(\d+(?:\.\d{2})?)",  # "AMOUNT: $123.45"
-        r"(\d{1,5}(?:\.\d{2})?)\s*$",  # Amount at end of line (common in check amount box)
-    ]
     candidates = []
-    for pattern in amount_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-        for match in matches:
-            try:
-                if len(match.groups()) == 2:
-                    # Handle pattern with optional cents
-                    dollars = match.group(1)
-                    cents = match.group(2) if match.group(2) else "00"
-                    amount_str = f"{dollars}.{cents.zfill(2)}"
-                else:
-                    amount_str = match.group(1)
-                amount_str = amount_str.replace(",", "")
-                amount = float(amount_str)
-                if amount > 0 and amount < 1000000:  # Reasonable check range
-                    candidates.append((amount, len(match.group(0))))  # Store with length for preference
-            except (ValueError, IndexError):
-                continue
+    for span in lexed.numeric:
+        if span.value is None or span.in_date:
+            continue
+        amount = abs(span.value)  # Signs are not part of check amounts
+        if span.symbol == "$":
+            candidates.append(amount)  # Standard $123.45
+        elif span.cents and _DOLLARS_AFTER.match(text, span.end):
+            candidates.append(amount)  # 123.45 DOLLARS
+        elif (
+            _LINE_END_AMOUNT.fullmatch(text[span.number_start:span.end].replace(",", ""))
+            and not text[span.end:_line_end(text, span.end)].strip()
+        ):
+            candidates.append(amount)
+    for match in lexed.iter_matches(_AMOUNT_LABEL, (span.start for span in lexed.keyword("amount"))):
+        candidates.append(float(match.group(1)))
     
     # Pick the largest reasonable amount (usually the check amount)
+    candidates = [amount for amount in candidates if 0 < amount < 1000000]  # Reasonable check range
     if candidates:
-        # Sort by amount descending, then by match length (longer matches are more specific)
-        candidates.sort(key=lambda x: (x[0], x[1]), reverse=True)
-        result["amount_digits"] = candidates[0][0]
+        result["amount_digits"] = max(candidates)
 
     # Extract amount in words (for cross-check)
-    words_patterns = [
-        r"(\w+(?:\s+\w+)*)\s+Dollars?",
-        r"(\w+(?:\s+\w+)*)\s+DOLLARS?",
-    ]
-    for pattern in words_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for anchor in lexed.keyword("dollars", "dollar"):
+        match = _AMOUNT_WORDS.match(text, _word_run_start(text, anchor.start))
         if match:
             result["amount_words"] = match.group(1).strip()
+            break
 
     # Extract check number (can be at start of text, with or without dashes)
-    check_num_patterns = [
-        r"CHECK\s*#?\s*(\d+(?:[-\s]\d+)*)",
-        r"CHECK\s+NUMBER[:\s]+(\d+(?:[-\s]\d+)*)",
-        r"#\s*(\d{3,}(?:[-\s]\d+)*)",  # Common check number format
-        r"^(\d{2,}[-\s]\d{3,})",  # At start: "52-0133" or "52 0133"
-        r"^(\d{4,})",  # At start: plain number 4+ digits
-    ]
-    for pattern in check_num_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    for pattern, anchor in _CHECK_NUMBER_PATTERNS:
+        if anchor is None:
+            match = next(lexed.iter_matches(pattern, lexed.line_starts), None)
+        else:
+            match = lexed.search_at(pattern, lexed.keyword(anchor))
         if match:
             check_num = match.group(1).strip().replace(' ', '')  # Remove spaces
             if len(check_num.replace('-', '')) >= 4:  # At least 4 digits
@@ -107,12 +131,8 @@ def extract_check_fields(text: str) -> Dict:
                 break
 
     # Extract memo
-    memo_patterns = [
-        r"MEMO[:\s]+(.+)",
-        r"FOR[:\s]+(.+)",
-    ]
-    for pattern in memo_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    for pattern, anchor in _MEMO_PATTERNS:
+        match = lexed.search_at(pattern, lexed.keyword(anchor))
         if match:
             result["memo"] = match.group(1).strip()[:100]  # Limit length
             break
@@ -126,6 +146,22 @@ def extract_check_fields(text: str) -> Dict:
     return result
 
 
+def _line_end(text: str, offset: int) -> int:
+    """Offset of the line break after offset (or the text length)."""
+    end = text.find("\n", offset)
+    return end if end >= 0 else len(text)
+
+
+def _word_run_start(text: str, offset: int) -> int:
+    """Start of the first word in the run of word characters and whitespace ending at offset."""
+    start = offset
+    while start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_" or text[start - 1].isspace()):
+        start -= 1
+    while start < offset and text[start].isspace():
+        start += 1
+    return start
+
+
 def words_to_number(words: str) -> Optional[float]:
     """
     Convert written amount to number (simplified).
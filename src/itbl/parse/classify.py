@@ -1,10 +1,13 @@
 """Classification: vendor map, heuristics, confidence scoring."""
 
-import re
 from typing import Dict, List, Optional, Tuple
 
+from itbl.parse.matching import AhoCorasick, VendorMatcher
 from itbl.util.config import load_vendors_config
 
+# Characters of low-confidence OCR token text included in the heuristic text view
+OCR_SNIPPET_CHARS = 256
+
 
 class Classifier:
     """Classifies documents into P&L categories."""
@@ -17,8 +20,18 @@ class Classifier:
             config_dir: Optional config directory path (str or Path)
         """
         self.vendor_map = load_vendors_config(config_dir) if config_dir else load_vendors_config()
+        self.vendor_matcher = VendorMatcher(self.vendor_map or [])
         self.category_keywords = self._build_keyword_map()
 
+        # One automaton over every category's keywords; pattern id -> category index
+        self._categories = list(self.category_keywords)
+        keywords, self._keyword_categories = [], []
+        for index, category_keywords in enumerate(self.category_keywords.values()):
+            for keyword in category_keywords:
+                keywords.append(keyword.lower())
+                self._keyword_categories.append(index)
+        self._keywords = AhoCorasick(keywords)
+
     def classify(
         self,
         extracted: Dict,
@@ -59,47 +72,31 @@ class Classifier:
         return "Unclassified", 0.0, {}
 
     def _match_vendor(self, vendor: str) -> Optional[Dict]:
-        """Match vendor against vendor map."""
-        if not vendor:
-            return None
-
-        vendor_lower = vendor.lower()
-
-        for entry in self.vendor_map:
-            # Exact match
-            if "match" in entry:
-                match_str = entry["match"].lower()
-                if match_str in vendor_lower or vendor_lower in match_str:
-                    return entry
-
-            # Regex match
-            if "match_regex" in entry:
-                pattern = entry["match_regex"]
-                try:
-                    if re.search(pattern, vendor, re.IGNORECASE):
-                        return entry
-                except re.error:
-                    continue
-
-        return None
+        """Match vendor against vendor map (first matching entry in file order)."""
+        return self.vendor_matcher.match(vendor)
 
     def _classify_by_heuristics(self, extracted: Dict) -> Optional[Tuple[str, float]]:
-        """Classify using keyword heuristics."""
-        text = str(extracted).lower()
-        vendor = (extracted.get("vendor") or "").lower()
+        """
+        Classify using keyword heuristics.
 
-        # Check each category's keywords
-        for category, keywords in self.category_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in text or keyword in vendor:
-                    score += 1
+        Every category is scored in one pass over the heuristic text view (one
+        point per distinct keyword found); the highest score wins, ties going
+        to the category listed first.
+        """
+        text = heuristic_text(extracted)
+        if not text:
+            return None
 
-            if score > 0:
-                confidence = min(0.85, 0.60 + (score * 0.10))
-                return category, confidence
+        hits = {pattern_id for _, pattern_id in self._keywords.iter_matches(text)}
+        if not hits:
+            return None
+        scores = [0] * len(self._categories)
+        for pattern_id in hits:
+            scores[self._keyword_categories[pattern_id]] += 1
 
-        return None
+        best = max(range(len(scores)), key=lambda index: (scores[index], -index))
+        confidence = min(0.85, 0.60 + (scores[best] * 0.10))
+        return self._categories[best], confidence
 
     def _build_keyword_map(self) -> Dict[str, List[str]]:
         """Build keyword-to-category mapping."""
@@ -149,3 +146,40 @@ class Classifier:
             ],
         }
 
+
+def heuristic_text(extracted: Dict, snippet_chars: int = OCR_SNIPPET_CHARS) -> str:
+    """
+    Lowercased text the keyword heuristics look at.
+
+    Visible string fields (vendor, description, memo, ...) one per line, plus
+    the first snippet_chars characters of low-confidence OCR token text.
+    Internal fields and token boxes are left out, so the view stays small
+    however many tokens a page has.
+
+    Args:
+        extracted: Dict from FieldExtractor or the check/statement extractors
+        snippet_chars: Cap on OCR token text
+
+    Returns:
+        Newline-joined lowercase text
+    """
+    parts = [
+        value for key, value in extracted.items()
+        if not key.startswith("_") and isinstance(value, str) and value
+    ]
+
+    # TokenTable, or a legacy list of token dicts
+    tokens = extracted.get("_low_conf_tokens")
+    token_texts = getattr(tokens, "text", None)
+    if token_texts is None and isinstance(tokens, list):
+        token_texts = [token.get("text", "") if isinstance(token, dict) else str(token) for token in tokens]
+    if token_texts and snippet_chars > 0:
+        snippet, size = [], 0
+        for token_text in token_texts:
+            if size >= snippet_chars:
+                break
+            snippet.append(token_text)
+            size += len(token_text) + 1
+        parts.append(" ".join(snippet)[:snippet_chars])
+
+    return "\n".join(parts).lower()
@@ -1,146 +1,117 @@
 """Common parsing utilities and patterns."""
 
 import re
-from datetime import datetime
 from typing import List, Optional, Tuple
 
-from dateutil import parser as date_parser
+from itbl.parse.dates import DEFAULT_DATE_FORMATS, get_date_scanner
+from itbl.parse.lexer import DEFAULT_CURRENCY_SYMBOLS, LexedText, lex
 
+# Labels an amount with cents may follow ("Total: $12.34")
+AMOUNT_LABELS = ("total", "subtotal", "grand total", "amount", "due")
+# Between a label and its amount (a currency symbol is part of the amount span)
+_LABEL_GAP = re.compile(r"[:\s]+")
+_BUSINESS_SUFFIX = re.compile(r"\b(?:Inc|LLC|Corp|Ltd|Co|Company|LLP)\b", re.IGNORECASE)
 
-def extract_date(text: str, date_formats: List[str] | None = None) -> Tuple[Optional[str], float]:
+
+def extract_date(
+    text: str,
+    date_formats: List[str] | None = None,
+    lexed: LexedText | None = None,
+) -> Tuple[Optional[str], float]:
     """
     Extract date from text.
     
+    Configured formats are tried in order (first match in the text wins),
+    then dateutil on date-like shapes. The scan is shared: extractors calling
+    this on the same text reuse one pass (see itbl.parse.dates).
+    
     Args:
         text: Input text
         date_formats: Optional list of strftime formats to try
+        lexed: Span index of text (its date formats are used)
     
     Returns:
         Tuple of (normalized_date_str YYYY-MM-DD, confidence)
     """
-    if date_formats is None:
-        date_formats = ["%m/%d/%Y", "%Y-%m-%d", "%b %d, %Y"]
-
-    # Try explicit formats first
-    for fmt in date_formats:
-        pattern = _strftime_to_regex(fmt)
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            try:
-                dt = datetime.strptime(match.group(0), fmt)
-                return dt.strftime("%Y-%m-%d"), 0.95
-            except ValueError:
-                continue
-
-    # Fallback to dateutil (flexible parsing)
-    try:
-        # Look for date-like patterns
-        date_patterns = [
-            r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",  # MM/DD/YYYY
-            r"\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b",  # YYYY-MM-DD
-            r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}\b",  # Mon DD, YYYY
-        ]
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    dt = date_parser.parse(match.group(0), fuzzy=False)
-                    return dt.strftime("%Y-%m-%d"), 0.90
-                except (ValueError, TypeError):
-                    continue
-    except Exception:
-        pass
-
-    return None, 0.0
+    if lexed is not None:
+        candidate = lexed.best_date()
+    else:
+        formats = tuple(date_formats) if date_formats is not None else DEFAULT_DATE_FORMATS
+        candidate = get_date_scanner(formats).best(text)
+    if candidate is None:
+        return None, 0.0
+    return candidate.value, candidate.confidence
 
 
-def _strftime_to_regex(fmt: str) -> str:
-    """Convert strftime format to regex pattern (simplified)."""
-    # Common replacements
-    replacements = {
-        "%m": r"\d{1,2}",
-        "%d": r"\d{1,2}",
-        "%Y": r"\d{4}",
-        "%y": r"\d{2}",
-        "%b": r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)",
-    }
-    pattern = fmt
-    for old, new in replacements.items():
-        pattern = pattern.replace(old, new)
-    # Escape other special chars
-    pattern = re.escape(pattern)
-    # Unescape our patterns
-    for old, new in replacements.items():
-        escaped_old = re.escape(old)
-        if escaped_old in pattern:
-            pattern = pattern.replace(escaped_old, new)
-    return pattern
-
-
-def extract_amount(text: str, currency_symbols: List[str] | None = None) -> Tuple[Optional[float], float]:
+def extract_amount(
+    text: str,
+    currency_symbols: List[str] | None = None,
+    lexed: LexedText | None = None,
+) -> Tuple[Optional[float], float]:
     """
     Extract monetary amount from text.
     
+    Candidates are amounts after a currency symbol, amounts with cents at the
+    end of a line (optionally followed by a symbol), and amounts with cents
+    after a Total/Amount/Due/Subtotal label; the largest wins.
+    
     Args:
         text: Input text
         currency_symbols: List of currency symbols (default: ["$", "USD"])
+        lexed: Span index of text (lexed with currency_symbols)
     
     Returns:
         Tuple of (amount_float, confidence)
     """
-    if currency_symbols is None:
-        currency_symbols = ["$", "USD"]
-
-    # Patterns for amounts
-    # Look for: $123.45, 123.45, Total: $123.45, Amount Due: 123.45
-    patterns = [
-        # Currency symbol + number
-        r"(?:{})\s*(\d{{1,3}}(?:[,.]\d{{3}})*(?:\.\d{{2}})?)".format(
-            "|".join(re.escape(s) for s in currency_symbols)
-        ),
-        # Number at end of line (common for totals)
-        r"(\d{{1,3}}(?:[,.]\d{{3}})*\.\d{{2}})\s*(?:{})?\s*$".format(
-            "|".join(re.escape(s) for s in currency_symbols)
-        ),
-        # Common labels
-        r"(?:Total|Amount|Due|Subtotal|Grand Total)[:\s]+\s*(?:{})?\s*(\d{{1,3}}(?:[,.]\d{{3}})*\.\d{{2}})".format(
-            "|".join(re.escape(s) for s in currency_symbols)
-        ),
-    ]
+    if lexed is None:
+        lexed = lex(text, currency_symbols=currency_symbols)
+    text = lexed.text
+    symbols = {symbol.lower() for symbol in (currency_symbols or DEFAULT_CURRENCY_SYMBOLS)}
 
     candidates = []
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-        for match in matches:
-            amount_str = match.group(1).replace(",", "")
-            try:
-                amount = float(amount_str)
-                if amount > 0:
-                    candidates.append((amount, 0.95))
-            except ValueError:
-                continue
+    for span in lexed.numeric:
+        if span.value is None or span.value <= 0 or span.in_date:
+            continue
+        if span.symbol:
+            # Currency symbol + number
+            candidates.append(span.value)
+        elif span.cents:
+            # Number at end of line (common for totals)
+            line_end = text.find("\n", span.end)
+            rest = text[span.end:line_end if line_end >= 0 else len(text)].strip().lower()
+            if not rest or rest in symbols:
+                candidates.append(span.value)
+
+    # Common labels
+    for label in lexed.keyword(*AMOUNT_LABELS):
+        span = lexed.next_numeric(label.end)
+        if (
+            span is not None and span.cents and span.value is not None and span.value > 0
+            and text[span.start] not in "+-" and _LABEL_GAP.fullmatch(text, label.end, span.start)
+        ):
+            candidates.append(span.value)
 
     if not candidates:
         return None, 0.0
 
     # Return the largest amount (likely the total)
-    best = max(candidates, key=lambda x: x[0])
-    return best[0], best[1]
+    return max(candidates), 0.95
 
 
-def extract_vendor(text: str) -> Tuple[Optional[str], float]:
+def extract_vendor(text: str, lexed: LexedText | None = None) -> Tuple[Optional[str], float]:
     """
     Extract vendor/payee name from text.
     
     Args:
         text: Input text
+        lexed: Span index of text (its line table is reused)
     
     Returns:
         Tuple of (vendor_name, confidence)
     """
     # Look for company names at the beginning of lines
     # Common patterns: COMPANY NAME, Inc., LLC, Corp, etc.
-    lines = text.split("\n")
+    lines = lexed.lines if lexed is not None else text.split("\n")
     if not lines:
         return None, 0.0
 
@@ -174,9 +145,7 @@ def extract_vendor(text: str) -> Tuple[Optional[str], float]:
         if is_valid_vendor_name(line):
             line_clean = line.strip()
             # Check for common business suffixes (high confidence)
-            if re.search(
-                r"\b(?:Inc|LLC|Corp|Ltd|Co|Company|LLP)\b", line_clean, re.IGNORECASE
-            ):
+            if _BUSINESS_SUFFIX.search(line_clean):
                 return line_clean, 0.85
             # Otherwise, take first substantial line (medium confidence)
             if len(line_clean) > 10:
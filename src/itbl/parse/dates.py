@@ -0,0 +1,294 @@
+"""Date scanning: configured strftime formats compiled into one pattern, with memoized parsing."""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from dateutil import parser as date_parser
+
+DEFAULT_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%b %d, %Y")
+
+# Patterns are written in lowercase: they run case-sensitively on lowercased
+# text, which keeps re's fast prefix scan that IGNORECASE turns off
+_MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)"
+_MONTH_INITIALS = "jfmasond"
+
+# Date-like shapes handed to dateutil when no configured format parses
+FALLBACK_PATTERNS = (
+    r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",  # MM/DD/YYYY
+    r"\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b",  # YYYY-MM-DD
+    r"\b" + _MONTHS + r"[a-z]*\s+\d{1,2},?\s+\d{4}\b",  # Mon DD, YYYY
+)
+
+# strftime directives understood by the scanner
+_DIRECTIVES = {
+    "%m": r"\d{1,2}",
+    "%d": r"\d{1,2}",
+    "%Y": r"\d{4}",
+    "%y": r"\d{2}",
+    "%b": _MONTHS,
+}
+_DIRECTIVE = re.compile(r"(%[a-zA-Z%])")
+# Digits strptime accepts for the numeric directives
+_NUMERIC_FIELDS = {"%m": r"1[0-2]|0[1-9]|[1-9]", "%d": r"3[01]|[12]\d|0[1-9]|[1-9]", "%Y": r"\d{4}", "%y": r"\d{2}"}
+# Characters each directive can start with (for the scanner's first-character guard)
+_DIRECTIVE_INITIALS = {"%m": "0-9", "%d": "0-9", "%Y": "0-9", "%y": "0-9", "%b": _MONTH_INITIALS}
+_FALLBACK_INITIALS = ("0-9", "0-9", _MONTH_INITIALS)
+
+FORMAT_CONFIDENCE = 0.95
+FALLBACK_CONFIDENCE = 0.90
+
+# Distinct date strings (per format) remembered by the parse caches
+PARSE_CACHE_SIZE = 4096
+# Recent texts whose scan results are kept, so extractors run on the same text share one scan
+SCAN_CACHE_SIZE = 8
+
+
+class DateCandidate:
+    """A date found in text that parsed with one of the scanner's patterns."""
+
+    __slots__ = ("start", "end", "text", "value", "fmt", "rank", "confidence")
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        text: str,
+        value: str,
+        fmt: Optional[str],
+        rank: int,
+        confidence: float,
+    ):
+        """
+        Initialize date candidate.
+
+        Args:
+            start: Offset of the match in the scanned text
+            end: Offset just past the match
+            text: Matched text
+            value: Parsed date as YYYY-MM-DD
+            fmt: strftime format that parsed it (None for the dateutil fallback)
+            rank: Pattern priority (configured formats in order, then fallbacks)
+            confidence: Extraction confidence for this pattern kind
+        """
+        self.start = start
+        self.end = end
+        self.text = text
+        self.value = value
+        self.fmt = fmt
+        self.rank = rank
+        self.confidence = confidence
+
+    def __repr__(self) -> str:
+        return f"DateCandidate({self.value!r} at {self.start}, fmt={self.fmt!r})"
+
+
+class DateScanner:
+    """
+    Finds every date in a text in one regex pass.
+
+    The configured formats and the fallback shapes are joined into a single
+    alternation with one named group each. At every match start the
+    patterns that match there are tried in priority order until one parses,
+    so a string that fails one format (e.g. 25/12/2024 as %m/%d/%Y) can
+    still parse with a later one.
+    Candidates never overlap across different match starts (like
+    re.finditer), which only matters for formats that match inside each
+    other.
+
+    Parsing is memoized per distinct (date string, format), and recent scan
+    results are cached per text.
+    """
+
+    def __init__(self, date_formats: Sequence[str] = DEFAULT_DATE_FORMATS):
+        """
+        Compile the scanner.
+
+        Args:
+            date_formats: strftime formats in priority order
+        """
+        self.date_formats = tuple(date_formats)
+        sources = [_strftime_to_regex(fmt) for fmt in self.date_formats] + list(FALLBACK_PATTERNS)
+        # ASCII text is lowercased and matched case-sensitively; other text
+        # (where lower() may change offsets) uses IGNORECASE copies
+        self._patterns = [re.compile(source) for source in sources]
+        self._patterns_ci = [re.compile(source, re.IGNORECASE) for source in sources]
+        alternation = "|".join(f"(?P<d{rank}>{source})" for rank, source in enumerate(sources))
+        # A cheap lookahead on the first character skips most positions before
+        # the alternatives are tried one by one
+        initials = [_format_initials(fmt) for fmt in self.date_formats] + list(_FALLBACK_INITIALS)
+        if all(initials):
+            alternation = f"(?=[{''.join(sorted(set(initials)))}])(?:{alternation})"
+        self._combined = re.compile(alternation)
+        self._combined_ci = re.compile(alternation, re.IGNORECASE)
+        self.scan = lru_cache(maxsize=SCAN_CACHE_SIZE)(self._scan)
+
+    def _scan(self, text: str) -> Tuple[DateCandidate, ...]:
+        """
+        Find all parseable dates in text.
+
+        Returns:
+            Candidates in text order, one per offset: the highest-priority
+            pattern that matches there and parses
+        """
+        if text.isascii():
+            search_text, combined, patterns = text.lower(), self._combined, self._patterns
+        else:
+            search_text, combined, patterns = text, self._combined_ci, self._patterns_ci
+
+        candidates = []
+        format_count = len(self.date_formats)
+        for match in combined.finditer(search_text):
+            start = match.start()
+            first = int(match.lastgroup[1:])
+            for rank in range(first, len(patterns)):
+                found = match if rank == first else patterns[rank].match(search_text, start)
+                if found is None:
+                    continue
+                matched = text[start:found.end()]
+                if rank < format_count:
+                    fmt = self.date_formats[rank]
+                    value, confidence = _parse_with_format(matched, fmt), FORMAT_CONFIDENCE
+                else:
+                    fmt = None
+                    value, confidence = _parse_fuzzy(matched), FALLBACK_CONFIDENCE
+                if value is not None:
+                    candidates.append(DateCandidate(start, found.end(), matched, value, fmt, rank, confidence))
+                    break
+        return tuple(candidates)
+
+    def best(self, text: str) -> Optional[DateCandidate]:
+        """
+        The date extract_date reports: the first candidate of the highest-priority
+        pattern (configured formats in order, then the fallback shapes).
+        """
+        return best_candidate(self.scan(text))
+
+
+@lru_cache(maxsize=32)
+def get_date_scanner(date_formats: Tuple[str, ...] = DEFAULT_DATE_FORMATS) -> DateScanner:
+    """
+    Shared scanner for a format list (compiled once per process).
+
+    Args:
+        date_formats: strftime formats as a tuple (hashable)
+    """
+    return DateScanner(date_formats)
+
+
+def scan_dates(text: str, date_formats: Sequence[str] | None = None) -> List[DateCandidate]:
+    """
+    Every parseable date in text with its offset.
+
+    Args:
+        text: Input text
+        date_formats: strftime formats in priority order (default: DEFAULT_DATE_FORMATS)
+    """
+    scanner = get_date_scanner(tuple(date_formats) if date_formats is not None else DEFAULT_DATE_FORMATS)
+    return list(scanner.scan(text))
+
+
+def parse_date(text: str, date_formats: Sequence[str] | None = None) -> Optional[str]:
+    """
+    A standalone date string (e.g. a statement's date column) as YYYY-MM-DD.
+
+    Configured formats are tried in order before the dateutil fallback, as in a scan.
+
+    Args:
+        text: Date text, nothing else
+        date_formats: strftime formats in priority order (default: DEFAULT_DATE_FORMATS)
+
+    Returns:
+        ISO date, or None if text isn't a valid date
+    """
+    for fmt in date_formats if date_formats is not None else DEFAULT_DATE_FORMATS:
+        value = _parse_with_format(text, fmt)
+        if value is not None:
+            return value
+    return _parse_fuzzy(text)
+
+
+def best_candidate(candidates: Sequence[DateCandidate]) -> Optional[DateCandidate]:
+    """First candidate of the highest-priority pattern (see DateScanner.best)."""
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: (candidate.rank, candidate.start))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_with_format(text: str, fmt: str) -> Optional[str]:
+    numeric = _numeric_format(fmt)
+    try:
+        if numeric is not None:
+            # Same result as strptime for numeric formats, without its per-call overhead
+            match = numeric.fullmatch(text)
+            if match is None:
+                return None
+            fields = match.groupdict()
+            year = int(fields["Y"]) if "Y" in fields else _two_digit_year(int(fields["y"]))
+            return datetime(year, int(fields["m"]), int(fields["d"])).strftime("%Y-%m-%d")
+        return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _numeric_format(fmt: str) -> Optional["re.Pattern"]:
+    """
+    Pattern with one group per field for formats made of %m, %d and %Y/%y only.
+
+    Returns:
+        Compiled pattern, or None if the format needs strptime (other
+        directives, repeated fields, or a missing month/day/year)
+    """
+    parts, fields = [], []
+    for index, part in enumerate(_DIRECTIVE.split(fmt)):
+        if not index % 2:
+            parts.append(re.escape(part))
+        elif part in _NUMERIC_FIELDS and part[1] not in fields:
+            fields.append(part[1])
+            parts.append(f"(?P<{part[1]}>{_NUMERIC_FIELDS[part]})")
+        else:
+            return None
+    if sorted(field.lower() for field in fields) != ["d", "m", "y"]:
+        return None
+    return re.compile("".join(parts))
+
+
+def _two_digit_year(year: int) -> int:
+    """Century for %y, as strptime picks it (69-99 -> 1900s, 00-68 -> 2000s)."""
+    return year + (1900 if year >= 69 else 2000)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_fuzzy(text: str) -> Optional[str]:
+    try:
+        return date_parser.parse(text, fuzzy=False).strftime("%Y-%m-%d")
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _strftime_to_regex(fmt: str) -> str:
+    """
+    Convert strftime format to a lowercase regex pattern (simplified).
+
+    Literal text is escaped; directives other than those in _DIRECTIVES stay
+    literal text.
+    """
+    parts = []
+    for index, part in enumerate(_DIRECTIVE.split(fmt)):
+        if index % 2 and part in _DIRECTIVES:
+            parts.append(_DIRECTIVES[part])
+        else:
+            parts.append(re.escape(part.lower()))
+    return "".join(parts)
+
+
+def _format_initials(fmt: str) -> Optional[str]:
+    """Regex character-class body for the first character of a format's matches (None if unknown)."""
+    if fmt[:2] in _DIRECTIVE_INITIALS:
+        return _DIRECTIVE_INITIALS[fmt[:2]]
+    if not fmt or fmt[0] == "%":
+        return None
+    return re.escape(fmt[0].lower())
@@ -4,6 +4,7 @@ from typing import Dict, Optional
 
 from itbl.ocr.base import OCRResult
 from itbl.parse.common import extract_amount, extract_date, extract_vendor
+from itbl.parse.lexer import LexedText, lex
 
 
 class FieldExtractor:
@@ -24,27 +25,28 @@ class FieldExtractor:
         self.date_formats = date_formats
         self.currency_symbols = currency_symbols
 
-    def extract_all(self, ocr_result: OCRResult) -> Dict[str, any]:
+    def extract_all(self, ocr_result: OCRResult, lexed: Optional[LexedText] = None) -> Dict[str, any]:
         """
         Extract all common fields from OCR result.
         
         Args:
             ocr_result: OCRResult from OCR backend
+            lexed: Span index of the OCR text (lexed here if not given)
         
         Returns:
             Dict with fields: date, amount, vendor, and their confidences
         """
         text = ocr_result.text
+        if lexed is None:
+            lexed = lex(text, self.date_formats, self.currency_symbols)
 
         # Extract fields
-        date, date_conf = extract_date(text, self.date_formats)
-        amount, amount_conf = extract_amount(text, self.currency_symbols)
-        vendor, vendor_conf = extract_vendor(text)
+        date, date_conf = extract_date(text, lexed=lexed)
+        amount, amount_conf = extract_amount(text, self.currency_symbols, lexed=lexed)
+        vendor, vendor_conf = extract_vendor(text, lexed=lexed)
 
         # Check OCR token confidence for flagged fields
-        low_conf_tokens = [
-            token for token in ocr_result.tokens if token.get("confidence", 1.0) < 0.80
-        ]
+        low_conf_tokens = ocr_result.token_table.low_confidence(0.80)
 
         result = {
             "date": date,
@@ -0,0 +1,416 @@
+"""Lexer for OCR text: typed spans (dates, amounts, numbers, keywords) indexed by line, shared by all extractors."""
+
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from itbl.parse.dates import DEFAULT_DATE_FORMATS, DateCandidate, best_candidate, get_date_scanner
+
+DEFAULT_CURRENCY_SYMBOLS = ("$", "USD")
+
+# Span kinds
+DATE = "date"
+MONEY = "money"
+NUMBER = "number"
+KEYWORD = "keyword"
+
+# Keywords the extractors and document-type detection anchor on: (name, lowercase
+# regex). Matched as substrings, like the `word in text.lower()` checks they
+# replace; a longer keyword must come before any keyword that is its prefix.
+KEYWORDS = (
+    ("pay to the order", r"pay\s+(?:to|1q|t0)\s+the\s+order"),
+    ("pay to", r"pay\s+(?:to|1q|t0)"),
+    ("payee", r"payee"),
+    ("grand total", r"grand total"),
+    ("subtotal", r"subtotal"),
+    ("total", r"total"),
+    ("amount", r"amount"),
+    ("due", r"due"),
+    ("dollars", r"dollars"),
+    ("dollar", r"dollar"),
+    ("check", r"check"),
+    ("memo", r"memo"),
+    ("for", r"for"),
+    ("balance", r"balance"),
+    ("statement", r"statement"),
+    ("transaction", r"transaction"),
+    ("account", r"account"),
+    ("card", r"card"),
+    ("#", r"#"),
+)
+
+# Texts whose lexed form is kept, so detection and extractors share one pass
+LEX_CACHE_SIZE = 8
+
+
+class Span:
+    """One typed token of the lexed text."""
+
+    __slots__ = ("kind", "start", "end", "line", "name", "value", "symbol", "number_start", "cents", "in_date")
+
+    def __init__(
+        self,
+        kind: str,
+        start: int,
+        end: int,
+        line: int,
+        name: Optional[str] = None,
+        value=None,
+        symbol: Optional[str] = None,
+        number_start: Optional[int] = None,
+        cents: bool = False,
+    ):
+        """
+        Initialize span.
+
+        Args:
+            kind: DATE, MONEY, NUMBER or KEYWORD
+            start: Offset of the first character (sign or currency symbol included)
+            end: Offset just past the span
+            line: Line index of start
+            name: Keyword name, or the strftime format of a date (None for fallback dates)
+            value: Date as YYYY-MM-DD, or numeric value (None if unparseable)
+            symbol: Currency symbol before an amount (lowercase)
+            number_start: Offset of the first digit (amounts and numbers)
+            cents: Amount written with exactly two decimals
+        """
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.line = line
+        self.name = name
+        self.value = value
+        self.symbol = symbol
+        self.number_start = number_start
+        self.cents = cents
+        self.in_date = False  # Numbers that are part of a date (e.g. the year)
+
+    def __repr__(self) -> str:
+        label = self.name if self.kind == KEYWORD else self.value
+        return f"Span({self.kind}, {label!r}, {self.start}:{self.end}, line={self.line})"
+
+
+class LexedText:
+    """
+    Span index over one OCR text.
+
+    Amounts and numbers are every digit run (with , and . separators); runs
+    with a currency symbol or exactly two decimals are MONEY, the rest NUMBER.
+    Keywords are the KEYWORDS substrings, case-insensitive. Dates are the
+    shared DateScanner candidates. All spans carry their line index.
+
+    Each kind is tokenized on first use and kept, so an extractor that only
+    needs keywords and dates never pays for the numbers.
+    """
+
+    def __init__(self, text: str, date_formats: Tuple[str, ...], lexer: "Lexer"):
+        """
+        Initialize span index (use lex() to build one).
+
+        Args:
+            text: Lexed text
+            date_formats: strftime formats for date spans
+            lexer: Compiled patterns (see get_lexer)
+        """
+        self.text = text
+        self.date_formats = date_formats
+        self.lexer = lexer
+        self.line_starts = [0]
+        for line in text.split("\n")[:-1]:
+            self.line_starts.append(self.line_starts[-1] + len(line) + 1)
+        self._keywords: Optional[Dict[str, List[Span]]] = None
+        self._numeric: Optional[List[Span]] = None
+        self._numeric_starts: Optional[List[int]] = None
+        self._date_candidates: Optional[Tuple[DateCandidate, ...]] = None
+        self._dates: Optional[List[Span]] = None
+        self._lines: Optional[List[str]] = None
+
+    @property
+    def keywords(self) -> Dict[str, List[Span]]:
+        """Keyword name -> KEYWORD spans in text order."""
+        if self._keywords is None:
+            self._keywords = self.lexer.keywords(self.text, self.line_starts)
+        return self._keywords
+
+    @property
+    def numeric(self) -> List[Span]:
+        """MONEY and NUMBER spans in text order."""
+        if self._numeric is None:
+            # Keywords go first: digits they contain ("pay 1q") are not numbers
+            consumed = [
+                (span.start, span.end)
+                for name in _DIGIT_KEYWORDS for span in self.keywords.get(name, ())
+                if any(char.isdigit() for char in self.text[span.start:span.end])
+            ]
+            self._numeric = self.lexer.numbers(self.text, self.line_starts, consumed)
+            _mark_date_numbers(self.dates, self._numeric)
+            self._numeric_starts = [span.start for span in self._numeric]
+        return self._numeric
+
+    @property
+    def date_candidates(self) -> Tuple[DateCandidate, ...]:
+        """DateScanner.scan result for the text."""
+        if self._date_candidates is None:
+            self._date_candidates = get_date_scanner(self.date_formats).scan(self.text)
+        return self._date_candidates
+
+    @property
+    def dates(self) -> List[Span]:
+        """DATE spans in text order (value YYYY-MM-DD, name the format)."""
+        if self._dates is None:
+            self._dates = [
+                Span(DATE, candidate.start, candidate.end, self.line_of(candidate.start),
+                     name=candidate.fmt, value=candidate.value)
+                for candidate in self.date_candidates
+            ]
+        return self._dates
+
+    @property
+    def lines(self) -> List[str]:
+        """Text split into lines (without line breaks)."""
+        if self._lines is None:
+            self._lines = self.text.split("\n")
+        return self._lines
+
+    @property
+    def money(self) -> List[Span]:
+        """MONEY spans in text order."""
+        return [span for span in self.numeric if span.kind == MONEY]
+
+    def keyword(self, *names: str) -> List[Span]:
+        """KEYWORD spans with any of the names, in text order."""
+        if len(names) == 1:
+            return self.keywords.get(names[0], [])
+        spans = [span for name in names for span in self.keywords.get(name, [])]
+        spans.sort(key=lambda span: span.start)
+        return spans
+
+    def has_keyword(self, *names: str) -> bool:
+        """Whether any of the keywords occurs."""
+        return any(name in self.keywords for name in names)
+
+    def line_of(self, offset: int) -> int:
+        """Line index of a text offset."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def next_numeric(self, offset: int) -> Optional[Span]:
+        """First MONEY/NUMBER span starting at or after offset."""
+        numeric = self.numeric
+        index = bisect_left(self._numeric_starts, offset)
+        return numeric[index] if index < len(numeric) else None
+
+    def best_date(self) -> Optional[DateCandidate]:
+        """The date extract_date reports (configured formats first, see DateScanner.best)."""
+        return best_candidate(self.date_candidates)
+
+    def iter_matches(self, pattern: "re.Pattern", positions: Iterable[int]) -> Iterator["re.Match"]:
+        """
+        Match a pattern at each anchor position, skipping positions inside the previous match.
+
+        For patterns that can only start at those positions, this yields the
+        same matches as pattern.finditer(text) without scanning the whole text.
+
+        Args:
+            pattern: Compiled pattern (applied to the original text)
+            positions: Anchor offsets in increasing order
+        """
+        end = 0
+        for position in positions:
+            if position < end:
+                continue
+            match = pattern.match(self.text, position)
+            if match:
+                end = match.end()
+                yield match
+
+    def search_at(self, pattern: "re.Pattern", anchors: Sequence[Span]) -> Optional["re.Match"]:
+        """First match of pattern starting at an anchor span (re.search for anchor-led patterns)."""
+        return next(self.iter_matches(pattern, (span.start for span in anchors)), None)
+
+
+class Lexer:
+    """Compiled keyword and number patterns for one set of currency symbols."""
+
+    def __init__(self, currency_symbols: Sequence[str] = DEFAULT_CURRENCY_SYMBOLS):
+        """
+        Compile the lexer.
+
+        Args:
+            currency_symbols: Symbols that mark an amount when right before it
+        """
+        self.currency_symbols = tuple(currency_symbols)
+        symbols = sorted({symbol.lower() for symbol in self.currency_symbols if symbol}, key=len, reverse=True)
+        # Plain branches keep re's first-character prefix scan; a named group
+        # per keyword turns it off and makes the search ~20x slower
+        keywords = "|".join(f"(?:{regex})" for _, regex in KEYWORDS)
+        # A sign only counts when it isn't a hyphen inside a word ("XXXX-1234");
+        # the lookahead skips positions that can't start a number
+        initials = "".join(sorted({symbol[0] for symbol in symbols} | set("+-")))
+        number = (
+            rf"(?=[{re.escape(initials)}\d])"
+            r"(?:(?<![\w.,])([-+])\s*)?"
+            + (f"(?:({'|'.join(re.escape(symbol) for symbol in symbols)})\\s*)?" if symbols else "()")
+            + r"(\d+(?:[,.]\d+)*)"
+        )
+        # Lowercased ASCII text is matched case-sensitively (see DateScanner)
+        self._keywords = re.compile(keywords)
+        self._keywords_ci = re.compile(keywords, re.IGNORECASE)
+        self._number = re.compile(number)
+        self._number_ci = re.compile(number, re.IGNORECASE)
+
+    def lex(self, text: str, date_formats: Tuple[str, ...] = DEFAULT_DATE_FORMATS) -> LexedText:
+        """
+        Span index for text (spans are tokenized on first use).
+
+        Args:
+            text: OCR text
+            date_formats: strftime formats for date spans
+        """
+        return LexedText(text, date_formats, self)
+
+    def keywords(self, text: str, line_starts: List[int]) -> Dict[str, List[Span]]:
+        """
+        Find all keywords in one pass.
+
+        Args:
+            text: OCR text
+            line_starts: Offset of the first character of each line
+
+        Returns:
+            Keyword name -> KEYWORD spans in text order
+        """
+        if text.isascii():
+            search_text, pattern, lower = text.lower(), self._keywords, False
+        else:
+            search_text, pattern, lower = text, self._keywords_ci, True
+
+        keywords: Dict[str, List[Span]] = {}
+        for match in pattern.finditer(search_text):
+            matched = match.group()
+            name = _keyword_name(matched.lower() if lower else matched)
+            start = match.start()
+            keywords.setdefault(name, []).append(
+                Span(KEYWORD, start, match.end(), bisect_right(line_starts, start) - 1, name=name)
+            )
+        return keywords
+
+    def numbers(self, text: str, line_starts: List[int], consumed: Sequence[Tuple[int, int]] = ()) -> List[Span]:
+        """
+        Find all amounts and numbers in one pass.
+
+        Args:
+            text: OCR text
+            line_starts: Offset of the first character of each line
+            consumed: Ranges that belong to keywords (digits there are skipped)
+
+        Returns:
+            MONEY and NUMBER spans in text order
+        """
+        ascii_text = text.isascii()
+        if ascii_text:
+            search_text, number = text.lower(), self._number
+        else:
+            search_text, number = text, self._number_ci
+
+        numeric: List[Span] = []
+        line = 0
+        for match in _iter_outside(number, search_text, consumed):
+            start = match.start()
+            while line + 1 < len(line_starts) and start >= line_starts[line + 1]:
+                line += 1
+            sign, symbol, digits = match.groups()
+            value = _number_value(digits)
+            if value is not None and sign == "-":
+                value = -value
+            cents = digits[-3:-2] == "."  # Exactly two digits after the last "."
+            if symbol and not ascii_text:
+                symbol = symbol.lower()
+            numeric.append(Span(
+                MONEY if symbol or cents else NUMBER, start, match.end(), line, None, value, symbol or None,
+                match.start(3), cents,
+            ))
+        return numeric
+
+
+@lru_cache(maxsize=8)
+def get_lexer(currency_symbols: Tuple[str, ...] = DEFAULT_CURRENCY_SYMBOLS) -> Lexer:
+    """Shared lexer for a currency symbol list (compiled once per process)."""
+    return Lexer(currency_symbols)
+
+
+def lex(
+    text: str,
+    date_formats: Sequence[str] | None = None,
+    currency_symbols: Sequence[str] | None = None,
+) -> LexedText:
+    """
+    Span index for text (cached for recent texts, so callers share the spans).
+
+    Args:
+        text: OCR text
+        date_formats: strftime formats (default: DEFAULT_DATE_FORMATS)
+        currency_symbols: Currency symbols (default: DEFAULT_CURRENCY_SYMBOLS)
+    """
+    return _lex_cached(
+        text,
+        tuple(date_formats) if date_formats is not None else DEFAULT_DATE_FORMATS,
+        tuple(currency_symbols) if currency_symbols is not None else DEFAULT_CURRENCY_SYMBOLS,
+    )
+
+
+@lru_cache(maxsize=LEX_CACHE_SIZE)
+def _lex_cached(text: str, date_formats: Tuple[str, ...], currency_symbols: Tuple[str, ...]) -> LexedText:
+    return get_lexer(currency_symbols).lex(text, date_formats)
+
+
+# Keywords whose regex is plain text: the matched text is the name
+_LITERAL_KEYWORDS = {regex: name for name, regex in KEYWORDS if not set(regex) & set("\\.^$*+?{}[]()|")}
+_KEYWORD_PATTERNS = [(name, re.compile(regex, re.IGNORECASE)) for name, regex in KEYWORDS]
+# Keywords that can match digits (OCR variants such as "pay 1q")
+_DIGIT_KEYWORDS = tuple(name for name, regex in KEYWORDS if any(char.isdigit() for char in regex) or "\\d" in regex)
+# Thousands separators must group digits by three ("1,234.56", not OCR's "1,234,56")
+_GROUPED = re.compile(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+
+
+def _number_value(digits: str) -> Optional[float]:
+    """Numeric value of a digit run; None if the separators are ambiguous."""
+    if "," in digits:
+        if not _GROUPED.fullmatch(digits):
+            return None
+        digits = digits.replace(",", "")
+    if digits.count(".") > 1:
+        return None
+    return float(digits)
+
+
+def _keyword_name(matched: str) -> str:
+    """KEYWORDS name of a lowercased keyword match (the first keyword that matches all of it)."""
+    name = _LITERAL_KEYWORDS.get(matched)
+    if name is not None:
+        return name
+    return next(name for name, pattern in _KEYWORD_PATTERNS if pattern.fullmatch(matched))
+
+
+def _iter_outside(pattern: "re.Pattern", text: str, consumed: Sequence[Tuple[int, int]]) -> Iterator["re.Match"]:
+    """pattern.finditer(text), with scanning resumed after any consumed range a match would start in."""
+    if not consumed:
+        yield from pattern.finditer(text)
+        return
+    match = pattern.search(text)
+    while match:
+        end = next((end for start, end in consumed if start <= match.start() < end), None)
+        if end is None:
+            yield match
+            end = match.end()
+        match = pattern.search(text, end)
+
+
+def _mark_date_numbers(dates: List[Span], numeric: List[Span]) -> None:
+    """Flag numbers that lie inside a date span (both lists in text order)."""
+    index = 0
+    for span in numeric:
+        while index < len(dates) and dates[index].end <= span.number_start:
+            index += 1
+        if index < len(dates) and dates[index].start <= span.number_start < dates[index].end:
+            span.in_date = True
@@ -0,0 +1,239 @@
+"""Multi-pattern matching: Aho-Corasick automaton and the compiled vendor-map index."""
+
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Inline global flags at the start of a pattern, e.g. "(?i)google ads"
+_LEADING_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+# Characters that make a pattern more than a literal
+_REGEX_SYNTAX = re.compile(r"[\\.^$*+?{}\[\]()|]")
+# Backreferences change meaning once patterns are joined (group numbers shift)
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Distinct vendor strings remembered per matcher
+VENDOR_CACHE_SIZE = 4096
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton: finds every occurrence of many literal patterns in
+    one pass over the text.
+
+    Matching is case-sensitive; lowercase patterns and text for case-insensitive
+    search.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: Literal patterns (empty patterns are ignored)
+        """
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # Pattern ids ending at each node (incl. via fail links)
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append(pattern_id)
+
+        # Breadth-first: fail links point to the longest proper suffix in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Find all pattern occurrences (overlapping ones included).
+
+        Args:
+            text: Text to search
+
+        Yields:
+            (start index, pattern id) in order of end position
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in out[node]:
+                yield index + 1 - len(patterns[pattern_id]), pattern_id
+
+
+class VendorMatcher:
+    """
+    Compiled index over a vendor map (the vendors.yaml entry list).
+
+    Same result as checking entries one by one in file order: the first entry
+    whose `match` string contains or is contained in the vendor (case-insensitive),
+    or whose `match_regex` finds the vendor (IGNORECASE), wins.
+
+    Literal entries, and regex entries that are just alternations of literals
+    (e.g. "(?i)google ads|meta ads"), are found with Aho-Corasick automata; the
+    "match contains vendor" direction is one search over all match strings joined
+    together. Other regexes are only tried when a combined alternation of all of
+    them matches, and only those earlier in the file than the best hit so far.
+    Results are memoized per vendor string.
+    """
+
+    def __init__(self, vendor_map: Sequence[Dict], cache_size: int = VENDOR_CACHE_SIZE):
+        """
+        Compile the vendor map.
+
+        Args:
+            vendor_map: Entries with "match" and/or "match_regex" keys
+            cache_size: Distinct vendor strings to memoize
+        """
+        self.vendor_map = list(vendor_map)
+
+        literal_ids, literals = [], []
+        alternative_ids, alternatives = [], []
+        self._regexes: List[Tuple[int, "re.Pattern"]] = []  # Regexes not reducible to literals
+        self._all_regexes: List[Tuple[int, "re.Pattern"]] = []
+        for entry_id, entry in enumerate(self.vendor_map):
+            if "match" in entry:
+                literal_ids.append(entry_id)
+                literals.append(str(entry["match"]).lower())
+            if "match_regex" in entry:
+                try:
+                    pattern = re.compile(entry["match_regex"], re.IGNORECASE)
+                except re.error:
+                    continue  # Invalid patterns never match (as before)
+                self._all_regexes.append((entry_id, pattern))
+                parts = _literal_alternatives(entry["match_regex"])
+                if parts is None:
+                    self._regexes.append((entry_id, pattern))
+                else:
+                    alternative_ids.extend([entry_id] * len(parts))
+                    alternatives.extend(parts)
+
+        self._literal_ids = literal_ids
+        self._literals = AhoCorasick(literals)
+        self._alternative_ids = alternative_ids
+        self._alternatives = AhoCorasick(alternatives)
+        # An empty match string is contained in every vendor
+        self._empty_literal = next((literal_ids[i] for i, text in enumerate(literals) if not text), None)
+        # All match strings in file order; the first hit of vendor in here is the earliest entry
+        self._joined = "\0".join(literals)
+        self._offsets = []
+        offset = 0
+        for text in literals:
+            self._offsets.append(offset)
+            offset += len(text) + 1
+        self._regex_prefilter = _combine_patterns([pattern for _, pattern in self._regexes])
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, vendor: str) -> Optional[Dict]:
+        """Find the vendor map entry for a vendor name (see class docstring)."""
+        if not vendor:
+            return None
+        vendor_lower = vendor.lower()
+        best = self._literal_match(vendor_lower)
+
+        if vendor.isascii():
+            # Literal alternations: lowercase substring search is exact for ASCII text
+            hits = [self._alternative_ids[i] for _, i in self._alternatives.iter_matches(vendor_lower)]
+            if hits:
+                best = min(hits) if best is None else min(best, *hits)
+            regexes, prefilter = self._regexes, self._regex_prefilter
+        else:
+            regexes, prefilter = self._all_regexes, None
+
+        if regexes and (prefilter is None or prefilter.search(vendor)):
+            for entry_id, pattern in regexes:
+                if best is not None and entry_id >= best:
+                    break
+                if pattern.search(vendor):
+                    best = entry_id
+                    break
+
+        return self.vendor_map[best] if best is not None else None
+
+    def _literal_match(self, vendor_lower: str) -> Optional[int]:
+        """Earliest entry whose match string contains, or is contained in, the vendor."""
+        candidates = [self._literal_ids[i] for _, i in self._literals.iter_matches(vendor_lower)]
+        if self._empty_literal is not None:
+            candidates.append(self._empty_literal)
+
+        position = self._joined.find(vendor_lower) if "\0" not in vendor_lower else -1
+        if position >= 0:
+            # vendor_lower has no separator, so the hit lies inside one match string
+            index = bisect_right(self._offsets, position) - 1
+            candidates.append(self._literal_ids[index])
+
+        return min(candidates) if candidates else None
+
+
+def _literal_alternatives(source: str) -> Optional[List[str]]:
+    """
+    Lowercased alternatives of a regex that is only literals joined by "|".
+
+    Returns:
+        The literal alternatives, or None if the pattern uses any other regex
+        syntax (or non-ASCII text, where case folding differs from lower())
+    """
+    flags = _LEADING_FLAGS.match(source)
+    if flags:
+        if set(flags.group(1)) - set("iau"):
+            return None
+        source = source[flags.end():]
+    parts = source.split("|")
+    if not source.isascii() or any(not part or _REGEX_SYNTAX.search(part) for part in parts):
+        return None
+    return [part.lower() for part in parts]
+
+
+def _combine_patterns(patterns: Sequence["re.Pattern"]) -> Optional["re.Pattern"]:
+    """
+    One alternation matching wherever any of the patterns matches.
+
+    Leading inline flags become scoped groups so patterns can be joined.
+
+    Returns:
+        Compiled alternation, or None if the patterns can't be combined (e.g.
+        backreferences or duplicate group names); callers then try each pattern
+    """
+    if not patterns:
+        return None
+    parts = []
+    for pattern in patterns:
+        source = pattern.pattern
+        if _BACKREFERENCE.search(source):
+            return None
+        flags = _LEADING_FLAGS.match(source)
+        if flags:
+            scoped = flags.group(1).replace("L", "").replace("u", "")
+            rest = source[flags.end():]
+            source = f"(?{scoped}:{rest})" if scoped else rest
+        parts.append(f"(?:{source})")
+    try:
+        return re.compile("|".join(parts), re.IGNORECASE)
+    except (re.error, OverflowError, RecursionError):
+        return None
@@ -0,0 +1,442 @@
+"""Per-image processing pipeline shared by serial and multi-process runs."""
+
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from itbl.ingest.loader import PDFPage, load_image, render_pdf_page
+from itbl.ingest.pdf_text import extract_pdf_text_layer
+from itbl.ingest.preprocess import DEFAULT_PREPROCESS_PROFILE, get_preprocess_options, preprocess_image
+from itbl.normalize.schemas import build_normalized_row, update_row_with_explanations
+from itbl.normalize.validate import Validator
+from itbl.ocr.base import OCRResult
+from itbl.ocr.cache import DEFAULT_MAX_BYTES, OCRCache
+from itbl.ocr.retry import OCRRunner
+from itbl.ocr.tesseract import TesseractBackend
+from itbl.ocr.tesseract_api import TesseractAPIBackend
+from itbl.parse.categories.bank_statements import extract_statement_fields, iter_statement_transactions
+from itbl.parse.categories.checks import extract_check_fields
+from itbl.parse.classify import Classifier
+from itbl.parse.extractors import FieldExtractor
+from itbl.parse.lexer import LexedText, lex
+from itbl.review.triage import TriageEngine
+from itbl.util.config import get_config_dir, load_rules_config
+from itbl.util.hashing import compute_row_hash, hash_file
+from itbl.util.logging import setup_logging
+
+logger = setup_logging()
+
+# Preprocessing applied before OCR on top of the selected profile (part of the OCR cache key)
+PREPROCESS_OPTIONS = {"binarize": True, "enhance_contrast": True}
+
+# Document type cues (substrings, case-insensitive)
+CHECK_KEYWORDS = ("pay to the order", "check", "dollars")
+STATEMENT_KEYWORDS = ("statement", "balance", "transaction", "account", "card")
+# Cues only a check face has ("check" alone also matches "CHECKING ACCOUNT")
+CHECK_FACE_KEYWORDS = ("pay to the order", "dollars")
+
+_DOLLAR_AMOUNT = re.compile(r"\$\d+\.\d{2}")
+# Uppercase vendor name (letters, spaces, "&") running up to the end of the searched
+# text, i.e. right before a "$". The lookbehind only lets a match start where such a
+# run starts, so a search scans the line once.
+_VENDOR_BEFORE_AMOUNT = re.compile(r"(?<![A-Z\s&])[\s&]*[A-Z][A-Z\s&]+\Z")
+
+# Supported OCR engines (name -> backend class)
+OCR_ENGINES = {
+    "tesseract": TesseractBackend,
+    "tesseract-api": TesseractAPIBackend,  # In-process libtesseract, models stay loaded
+}
+
+
+def _looks_like_statement(lexed: LexedText) -> bool:
+    """Heuristic: does text look like a bank/credit card statement with multiple transactions?"""
+    # Look for pattern: multiple lines with amounts (likely multiple transactions)
+    text = lexed.text
+    amounts = [
+        span for span in lexed.numeric
+        if span.symbol == "$" and _DOLLAR_AMOUNT.match(text, span.number_start - 1)
+    ]
+    # If we see 3+ dollar amounts, likely a statement
+    if len(amounts) >= 3:
+        return True
+    # Also check for patterns like "VENDOR $amount" appearing multiple times
+    matches = 0
+    for span in amounts:
+        dollar = span.number_start - 1
+        line = lexed.line_of(dollar)
+        line_start = lexed.line_starts[line]
+        if _VENDOR_BEFORE_AMOUNT.search(lexed.lines[line], 0, dollar - line_start):
+            matches += 1
+    return matches >= 2
+
+
+def _ingest_path(img_path: "Path | PDFPage", ocr_result: OCRResult) -> str:
+    """How a work item's text was obtained: "image", "pdf-ocr" or "pdf-text"."""
+    if not isinstance(img_path, PDFPage):
+        return "image"
+    return "pdf-text" if ocr_result.layout.get("mode") == "pdf-text" else "pdf-ocr"
+
+
+class ImagePipeline:
+    """Runs OCR, extraction, classification, validation and triage for single images."""
+
+    def __init__(
+        self,
+        config_dir: Optional[Path] = None,
+        engine: str = "tesseract",
+        strict_level: str = "medium",
+        triage: bool = False,
+        dry_run: bool = False,
+        ocr_cache_dir: Optional[Path] = None,
+        ocr_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+        ocr_retry: str = "auto",
+        preprocess_profile: str = DEFAULT_PREPROCESS_PROFILE,
+        split_statements: bool = False,
+    ):
+        """
+        Initialize pipeline components.
+
+        Args:
+            config_dir: Config directory (default: auto-detected)
+            engine: OCR engine name (see OCR_ENGINES)
+            strict_level: "low", "medium", or "high"
+            triage: Whether to run the triage engine on each row
+            dry_run: Log extraction details for previewing
+            ocr_cache_dir: OCR result cache directory (None = caching disabled)
+            ocr_cache_max_bytes: Size limit for the OCR cache
+            ocr_retry: Low-confidence retry mode ("auto", "serial" or "speculative")
+            preprocess_profile: "fast", "balanced" or "max-quality"
+            split_statements: One row per statement transaction instead of one per statement
+        """
+        if engine not in OCR_ENGINES:
+            raise ValueError(f"Unknown OCR engine: {engine}")
+        if config_dir is None:
+            config_dir = get_config_dir()
+
+        rules_config = load_rules_config(config_dir)
+        date_formats = rules_config.get("date_formats", ["%m/%d/%Y", "%Y-%m-%d"])
+        currency_symbols = rules_config.get("currency_symbols", ["$", "USD"])
+
+        self.config_dir = config_dir
+        self.dry_run = dry_run
+        self.split_statements = split_statements
+        self.preprocess_profile = preprocess_profile
+        self.preprocess_options = {**get_preprocess_options(preprocess_profile), **PREPROCESS_OPTIONS}
+        self.ocr_backend = OCR_ENGINES[engine]()
+        self.ocr_runner = OCRRunner(self.ocr_backend, mode=ocr_retry)
+        self.extractor = FieldExtractor(date_formats=date_formats, currency_symbols=currency_symbols)
+        # Pass config_dir as str - Classifier will handle it
+        self.classifier = Classifier(config_dir=str(config_dir))
+        self.validator = Validator(strict_level=strict_level)
+        self.triage_engine = TriageEngine(strict_level=strict_level, config_dir=config_dir) if triage else None
+        self.ocr_cache = (
+            OCRCache(ocr_cache_dir, max_bytes=ocr_cache_max_bytes) if ocr_cache_dir else None
+        )
+
+    def process(self, img_path: "Path | PDFPage") -> List[Dict]:
+        """
+        Process one image (or PDF page) into normalized rows.
+
+        Errors are logged and yield no rows so a single bad image never aborts a batch.
+
+        Args:
+            img_path: Image file path or PDFPage reference
+
+        Returns:
+            List of normalized rows (not yet deduplicated)
+        """
+        try:
+            return self._process(img_path)
+        except Exception as e:
+            logger.error(f"Error processing {img_path.name}: {e}", exc_info=True)
+            return []
+
+    def iter_rows(self, img_path: "Path | PDFPage") -> Iterator[Dict]:
+        """
+        Process one image (or PDF page), yielding normalized rows as they are built.
+
+        Like process(), but split statements are classified and normalized one
+        transaction at a time. An error ends the rows for this image (rows
+        already yielded stand) and is logged.
+
+        Args:
+            img_path: Image file path or PDFPage reference
+
+        Yields:
+            Normalized rows (not yet deduplicated)
+        """
+        try:
+            yield from self._iter_rows(img_path)
+        except Exception as e:
+            logger.error(f"Error processing {img_path.name}: {e}", exc_info=True)
+
+    def _process(self, img_path: "Path | PDFPage") -> List[Dict]:
+        """Process one image (exceptions propagate)."""
+        return list(self._iter_rows(img_path))
+
+    def _iter_rows(self, img_path: "Path | PDFPage") -> Iterator[Dict]:
+        """Process one image, yielding its rows (exceptions propagate)."""
+        dry_run = self.dry_run
+        logger.info(f"Processing {img_path.name}...")
+
+        ocr_result = self._run_ocr(img_path)
+
+        # Log OCR text for debugging in dry-run mode
+        if dry_run:
+            ocr_preview = ocr_result.text[:500].replace('\n', ' ').strip() if ocr_result.text else "(empty)"
+            logger.info(f"OCR confidence: {ocr_result.confidence:.2f}")
+            if ocr_result.confidence < 0.50:
+                logger.warning(f"⚠️  Low OCR confidence - extracted text may be unreliable")
+            if ocr_result.text:
+                logger.info(f"OCR extracted text (first 500 chars): {ocr_preview}...")
+                if len(ocr_result.text) > 500:
+                    logger.info(f"... (total {len(ocr_result.text)} characters)")
+            else:
+                logger.warning(f"⚠️  OCR extracted no text from {img_path.name} - image might be too blurry, dark, or contain no text")
+
+        # Tokenize once; detection and all extractors query the same span index
+        lexed = lex(ocr_result.text, self.extractor.date_formats, self.extractor.currency_symbols)
+
+        # Detect document type (checks/statements vs receipts/invoices)
+        # Simple heuristic: check for check keywords
+        is_check = lexed.has_keyword(*CHECK_KEYWORDS)
+        # Bank/credit card statements: look for keywords OR pattern of multiple transactions with amounts
+        is_statement = (
+            lexed.has_keyword(*STATEMENT_KEYWORDS) or
+            _looks_like_statement(lexed)  # Pattern-based detection
+        )
+
+        if dry_run:
+            if is_statement:
+                logger.info("Detected document type: Bank/Credit Card Statement")
+            elif is_check:
+                logger.info("Detected document type: Check")
+            else:
+                logger.info("Detected document type: Receipt/Invoice")
+
+        # One row per transaction; a statement without transaction rows still gets one row.
+        # A statement wins over the bare "check" keyword unless the text has a check face.
+        has_check_face = is_check and lexed.has_keyword(*CHECK_FACE_KEYWORDS)
+        if self.split_statements and is_statement and not has_check_face:
+            count = 0
+            for row in self._iter_statement_rows(img_path, ocr_result, lexed):
+                count += 1
+                yield row
+            if count:
+                if dry_run:
+                    logger.info(f"Split statement into {count} transaction rows")
+                return
+
+        # Extract fields
+        if is_check:
+            check_data = extract_check_fields(ocr_result.text, lexed=lexed)
+            extracted = {
+                "date": check_data.get("date"),
+                "vendor": check_data.get("payee"),
+                "amount": check_data.get("amount_digits"),
+                "amount_words": check_data.get("amount_words"),
+                "check_number": check_data.get("check_number"),
+                "memo": check_data.get("memo"),
+                "_ocr_confidence": ocr_result.confidence,
+                "_low_conf_tokens": ocr_result.token_table.low_confidence(0.80),
+            }
+            # Log what was extracted for debugging
+            if dry_run:
+                logger.info(f"Extracted from check - Date: {extracted.get('date')}, Payee: {extracted.get('vendor')}, Amount: {extracted.get('amount')}, Check #: {extracted.get('check_number')}")
+                if not any([extracted.get('vendor'), extracted.get('amount'), extracted.get('date')]):
+                    logger.warning("⚠️  Check extraction found minimal fields - OCR may need improvement")
+        elif is_statement:
+            stmt_data = extract_statement_fields(ocr_result.text, lexed=lexed)
+            extracted = {
+                "date": stmt_data.get("date"),
+                "vendor": stmt_data.get("description"),
+                "amount": stmt_data.get("amount"),
+                "description": stmt_data.get("description"),
+                "_ocr_confidence": ocr_result.confidence,
+                "_low_conf_tokens": ocr_result.token_table.low_confidence(0.80),
+            }
+            # Log what was extracted for debugging
+            if dry_run:
+                logger.info(f"Extracted from statement - Date: {extracted.get('date')}, Amount: {extracted.get('amount')}, Vendor: {extracted.get('vendor')}")
+                if not extracted.get("vendor") and not extracted.get("amount"):
+                    logger.warning("⚠️  Statement extraction found no transactions - check OCR text quality")
+        else:
+            # Standard receipt/invoice
+            extracted = self.extractor.extract_all(ocr_result, lexed=lexed)
+            # Log what was extracted for debugging
+            if dry_run:
+                logger.info(f"Extracted fields - Date: {extracted.get('date')}, Amount: {extracted.get('amount')}, Vendor: {extracted.get('vendor')}")
+
+        extracted["_ocr_strategy"] = ocr_result.layout.get("retry_strategy")
+        extracted["_ingest_path"] = _ingest_path(img_path, ocr_result)
+        yield self._build_row(extracted, str(img_path))
+
+    def _iter_statement_rows(
+        self,
+        img_path: "Path | PDFPage",
+        ocr_result: OCRResult,
+        lexed: LexedText,
+    ) -> Iterator[Dict]:
+        """
+        One normalized row per statement transaction, built as the transactions are parsed.
+
+        Rows of one statement that share a deduplication key (e.g. two identical
+        coffees on the same day) are numbered in "_occurrence", so deduplication
+        keeps each of them while a rescan of the same statement is still dropped.
+        """
+        page_fields = {
+            "_ocr_confidence": ocr_result.confidence,
+            "_low_conf_tokens": ocr_result.token_table.low_confidence(0.80),
+            "_ocr_strategy": ocr_result.layout.get("retry_strategy"),
+            "_ingest_path": _ingest_path(img_path, ocr_result),
+        }
+        occurrences = Counter()
+        for transaction in iter_statement_transactions(ocr_result.text, lexed=lexed):
+            extracted = {
+                "date": transaction["date"],
+                "vendor": transaction["description"],
+                "amount": transaction["amount"],
+                "description": transaction["description"],
+                **page_fields,
+            }
+            row = self._build_row(extracted, str(img_path))
+            key = compute_row_hash(row)
+            row["_occurrence"] = occurrences[key]
+            occurrences[key] += 1
+            yield row
+
+    def _run_ocr(self, img_path: "Path | PDFPage") -> OCRResult:
+        """Load, preprocess and OCR an image, using the OCR cache when enabled."""
+        dpi = getattr(self.ocr_backend, "dpi", None)
+        if isinstance(img_path, PDFPage):
+            # Born-digital pages: read the embedded text layer instead of rasterizing
+            text_result = extract_pdf_text_layer(img_path.path, img_path.page_number, dpi=dpi or 300)
+            if text_result is not None:
+                logger.info(f"Using PDF text layer for {img_path.name} (OCR skipped)")
+                return text_result
+
+        cache_key = None
+        if self.ocr_cache is not None:
+            # The load resolution (OCR DPI, alongside the profile's max_side) changes the result
+            options = {**self.preprocess_options, "load_dpi": dpi}
+            if isinstance(img_path, PDFPage):
+                file_hash = hash_file(img_path.path)
+                options["pdf_page"] = img_path.page_number
+            else:
+                file_hash = hash_file(img_path)
+            cache_key = OCRCache.make_key(file_hash, options, self.ocr_backend.settings_key())
+            cached = self.ocr_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached OCR result for {img_path.name}")
+                cached.layout["retry_strategy"] = "cached"
+                return cached
+
+        # Load (decoding straight at the resolution the OCR DPI / profile needs) and preprocess
+        max_side = self.preprocess_options.get("max_side")
+        if isinstance(img_path, PDFPage):
+            # Rasterize only this page
+            image = render_pdf_page(img_path.path, img_path.page_number, dpi=dpi or 300, max_side=max_side)
+        else:
+            image = load_image(img_path, dpi=dpi, max_side=max_side)
+        source_size = image.info["source_size"]
+        # Try enhanced preprocessing for better OCR (binarization helps low-quality images)
+        start = time.perf_counter()
+        processed = preprocess_image(image, **self.preprocess_options)
+        logger.info(
+            f"Preprocessed {img_path.name} ({self.preprocess_profile}) "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+        # OCR - default settings, retrying with automatic page segmentation if
+        # confidence is low (concurrently for images predicted to be low quality)
+        ocr_result = self.ocr_runner.extract(processed, source_image=image)
+        logger.debug(f"OCR strategy for {img_path.name}: {ocr_result.layout['retry_strategy']}")
+
+        # Token boxes are in processed-image pixels; divide by source_scale for original pixels
+        ocr_result.layout["source_size"] = list(source_size)
+        ocr_result.layout["source_scale"] = max(processed.size) / max(source_size)
+
+        if cache_key is not None:
+            self.ocr_cache.put(cache_key, ocr_result)
+        return ocr_result
+
+    def _build_row(self, extracted: Dict, source_file: str) -> Dict:
+        """Classify, normalize, validate and triage one extracted record."""
+        # Classify
+        category, category_conf, hints = self.classifier.classify(extracted)
+
+        # Build normalized row
+        row = build_normalized_row(extracted, source_file, category, hints, config_dir=self.config_dir)
+
+        # Validate
+        violations = self.validator.validate_row(row, category)
+
+        # Triage
+        if self.triage_engine:
+            row = self.triage_engine.analyze_row(row, violations)
+
+        # Update missing fields with explanations based on flags
+        return update_row_with_explanations(row)
+
+
+# Per-process pipeline instance used by pool workers (built once by the initializer)
+_worker_pipeline: Optional[ImagePipeline] = None
+
+
+def _init_worker(pipeline_kwargs: Dict) -> None:
+    """Process pool initializer: build one pipeline per worker process."""
+    global _worker_pipeline
+    _worker_pipeline = ImagePipeline(**pipeline_kwargs)
+
+
+def _process_in_worker(img_path: "Path | PDFPage") -> List[Dict]:
+    """Process one image or PDF page with the worker's pipeline."""
+    return _worker_pipeline.process(img_path)
+
+
+def process_images(
+    image_files: Iterable["Path | PDFPage"],
+    workers: int = 1,
+    **pipeline_kwargs,
+) -> Iterator[Tuple[Path, Iterable[Dict]]]:
+    """
+    Process images, yielding (path, rows) in input order.
+
+    With workers > 1 the per-image work is fanned out to a process pool. Results are
+    still yielded in input order, so downstream deduplication and grouping see exactly
+    the same sequence as a serial run. A serial run yields each image's rows as an
+    iterator that builds them on demand; consume it before advancing to the next image.
+
+    Args:
+        image_files: Image paths / PDFPage references (any iterable; consumed lazily)
+        workers: Number of worker processes (1 = run in this process)
+        **pipeline_kwargs: Arguments for ImagePipeline
+
+    Yields:
+        Tuples of (image_path, rows)
+    """
+    if workers <= 1:
+        pipeline = ImagePipeline(**pipeline_kwargs)
+        for img_path in image_files:
+            yield img_path, pipeline.iter_rows(img_path)
+        return
+
+    # Keep a bounded window of in-flight images so results stream back in order
+    # without submitting the whole batch up front.
+    window = workers * 2
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(pipeline_kwargs,),
+    ) as executor:
+        pending = deque()
+        for img_path in image_files:
+            pending.append((img_path, executor.submit(_process_in_worker, img_path)))
+            if len(pending) >= window:
+                path, future = pending.popleft()
+                yield path, future.result()
+        for path, future in pending:
+            yield path, future.result()
@@ -1,16 +1,179 @@
 """Generate review report with triage metrics."""
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from itbl.util.logging import setup_logging
 
 logger = setup_logging()
 
+# Report labels for ingestion paths (see ImagePipeline / row["_ingest_path"])
+INGEST_PATH_LABELS = {
+    "image": "Images (OCR)",
+    "pdf-ocr": "PDF pages (rasterized + OCR)",
+    "pdf-text": "PDF pages (text layer, OCR skipped)",
+    "failed": "Failed",
+}
+
+
+class ReportAccumulator:
+    """
+    Collects report statistics row by row.
+
+    Only counters are kept (no rows), so streaming runs can build the report
+    without holding every row in memory.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.total_rows = 0
+        self.total_flagged = 0
+        self.categories: Dict[str, Dict] = {}  # category -> per-category counters
+        self.vendor_counts: Dict[str, int] = {}
+        self.ingest_counts: Dict[str, int] = {}
+
+    def add(self, row: Dict, category: Optional[str] = None) -> None:
+        """
+        Count one written row.
+
+        Args:
+            row: Normalized row dict
+            category: Category/tab name (default: row["_category"])
+        """
+        category = category or row.get("_category", "Unclassified")
+        stats = self.categories.get(category)
+        if stats is None:
+            stats = self.categories[category] = {
+                "rows": 0,
+                "flagged": 0,
+                "field_flags": {},
+                "reason_counts": {},
+            }
+
+        flags = row.get("_flags", [])
+        stats["rows"] += 1
+        self.total_rows += 1
+        if flags:
+            stats["flagged"] += 1
+            self.total_flagged += 1
+
+        # Count flags by field
+        for flag in flags:
+            stats["reason_counts"][flag] = stats["reason_counts"].get(flag, 0) + 1
+        for cell in row.get("_highlight_cells", []):
+            stats["field_flags"][cell] = stats["field_flags"].get(cell, 0) + 1
+
+        # Collect vendors that appear frequently but aren't mapped
+        vendor = row.get("Vendor") or row.get("Vendor/Supplier") or row.get("Vendor/Payee")
+        if vendor and flags:
+            self.vendor_counts[vendor] = self.vendor_counts.get(vendor, 0) + 1
+
+    def add_ingest(self, ingest_path: str) -> None:
+        """
+        Count one processed image/page by ingestion path.
+
+        Args:
+            ingest_path: "image", "pdf-ocr", "pdf-text" or "failed"
+        """
+        self.ingest_counts[ingest_path] = self.ingest_counts.get(ingest_path, 0) + 1
+
+    def render(self) -> str:
+        """Render report.md content."""
+        total_rows = self.total_rows
+        total_flagged = self.total_flagged
+        report_lines = [
+            "# Image-to-Bookkeeping-Log Run Report",
+            "",
+            "## Summary",
+            "",
+            f"- Total rows processed: {total_rows}",
+            f"- Rows flagged for review: {total_flagged}",
+            f"- Flag rate: {total_flagged / total_rows * 100:.1f}%" if total_rows > 0 else "- Flag rate: 0%",
+            "",
+        ]
+
+        if self.ingest_counts:
+            report_lines.extend(["## Ingestion", ""])
+            for path, count in self.ingest_counts.items():
+                report_lines.append(f"- {INGEST_PATH_LABELS.get(path, path)}: {count}")
+            report_lines.append("")
+
+        report_lines.extend([
+            "## Triage Metrics by Category",
+            "",
+        ])
+
+        # Per-category breakdown
+        for category, stats in self.categories.items():
+            report_lines.extend([
+                f"### {category}",
+                f"- Total rows: {stats['rows']}",
+                f"- Flagged rows: {stats['flagged']}",
+                "",
+            ])
+
+            field_flags = stats["field_flags"]
+            reason_counts = stats["reason_counts"]
+            if field_flags:
+                report_lines.append("**Flagged fields:**")
+                for field, count in sorted(field_flags.items(), key=lambda x: -x[1]):
+                    report_lines.append(f"- {field}: {count} cells")
+
+            if reason_counts:
+                report_lines.append("**Top reasons:**")
+                for reason, count in sorted(reason_counts.items(), key=lambda x: -x[1])[:5]:
+                    report_lines.append(f"- {reason}: {count}")
+
+            report_lines.append("")
+
+        # Vendor map recommendations
+        report_lines.extend([
+            "## Vendor Map Recommendations",
+            "",
+            "Consider adding these vendors to `config/vendors.yaml` to reduce flags:",
+            "",
+        ])
+
+        top_vendors = sorted(self.vendor_counts.items(), key=lambda x: -x[1])[:10]
+        if top_vendors:
+            for vendor, count in top_vendors:
+                report_lines.append(f"- `{vendor}` ({count} flagged rows)")
+        else:
+            report_lines.append("- No vendor recommendations (all mapped or low frequency)")
+
+        report_lines.extend([
+            "",
+            "## Notes",
+            "",
+            "- Review flagged cells in output files",
+            "- Update vendor map to improve classification accuracy",
+            "- Check OCR quality for low-confidence tokens",
+            "",
+        ])
+        return "\n".join(report_lines)
+
+    def write(self, output_path: Path) -> Path:
+        """
+        Write report.md next to the output.
+
+        Args:
+            output_path: Output directory (or output file, report goes beside it)
+
+        Returns:
+            Path of the written report
+        """
+        report_path = output_path / "report.md" if output_path.is_dir() else output_path.parent / "report.md"
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+
+        logger.info(f"Report written to {report_path}")
+        return report_path
+
 
 def generate_report(
     rows_by_category: Dict[str, List[Dict]],
     output_path: Path,
+    ingest_counts: Optional[Dict[str, int]] = None,
 ) -> None:
     """
     Generate report.md with triage metrics and recommendations.
@@ -18,104 +181,11 @@ def generate_report(
     Args:
         rows_by_category: Dict mapping category names to lists of rows
         output_path: Path to write report.md
+        ingest_counts: Optional count of images/pages per ingestion path
     """
-    report_lines = [
-        "# Image-to-Bookkeeping-Log Run Report",
-        "",
-        "## Summary",
-        "",
-    ]
-
-    total_rows = sum(len(rows) for rows in rows_by_category.values())
-    total_flagged = sum(
-        len([r for r in rows if r.get("_flags")])
-        for rows in rows_by_category.values()
-    )
-
-    report_lines.extend([
-        f"- Total rows processed: {total_rows}",
-        f"- Rows flagged for review: {total_flagged}",
-        f"- Flag rate: {total_flagged / total_rows * 100:.1f}%" if total_rows > 0 else "- Flag rate: 0%",
-        "",
-        "## Triage Metrics by Category",
-        "",
-    ])
-
-    # Per-category breakdown
+    accumulator = ReportAccumulator()
     for category, rows in rows_by_category.items():
-        if not rows:
-            continue
-
-        flagged_count = len([r for r in rows if r.get("_flags")])
-        report_lines.extend([
-            f"### {category}",
-            f"- Total rows: {len(rows)}",
-            f"- Flagged rows: {flagged_count}",
-            "",
-        ])
-
-        # Count flags by field
-        field_flags = {}
-        reason_counts = {}
         for row in rows:
-            flags = row.get("_flags", [])
-            highlight_cells = row.get("_highlight_cells", [])
-
-            for flag in flags:
-                reason_counts[flag] = reason_counts.get(flag, 0) + 1
-
-            for cell in highlight_cells:
-                field_flags[cell] = field_flags.get(cell, 0) + 1
-
-        if field_flags:
-            report_lines.append("**Flagged fields:**")
-            for field, count in sorted(field_flags.items(), key=lambda x: -x[1]):
-                report_lines.append(f"- {field}: {count} cells")
-
-        if reason_counts:
-            report_lines.append("**Top reasons:**")
-            for reason, count in sorted(reason_counts.items(), key=lambda x: -x[1])[:5]:
-                report_lines.append(f"- {reason}: {count}")
-
-        report_lines.append("")
-
-    # Vendor map recommendations
-    report_lines.extend([
-        "## Vendor Map Recommendations",
-        "",
-        "Consider adding these vendors to `config/vendors.yaml` to reduce flags:",
-        "",
-    ])
-
-    # Collect vendors that appear frequently but aren't mapped
-    vendor_counts = {}
-    for rows in rows_by_category.values():
-        for row in rows:
-            vendor = row.get("Vendor") or row.get("Vendor/Supplier") or row.get("Vendor/Payee")
-            if vendor and row.get("_flags"):
-                vendor_counts[vendor] = vendor_counts.get(vendor, 0) + 1
-
-    top_vendors = sorted(vendor_counts.items(), key=lambda x: -x[1])[:10]
-    if top_vendors:
-        for vendor, count in top_vendors:
-            report_lines.append(f"- `{vendor}` ({count} flagged rows)")
-    else:
-        report_lines.append("- No vendor recommendations (all mapped or low frequency)")
-
-    report_lines.extend([
-        "",
-        "## Notes",
-        "",
-        "- Review flagged cells in output files",
-        "- Update vendor map to improve classification accuracy",
-        "- Check OCR quality for low-confidence tokens",
-        "",
-    ])
-
-    # Write report
-    report_path = output_path / "report.md" if output_path.is_dir() else output_path.parent / "report.md"
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(report_lines))
-
-    logger.info(f"Report written to {report_path}")
-
+            accumulator.add(row, category)
+    accumulator.ingest_counts = dict(ingest_counts or {})
+    accumulator.write(output_path)
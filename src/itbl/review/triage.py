@@ -1,6 +1,7 @@
 """Triage system for ambiguity detection and highlighting."""
 
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from itbl.util.config import load_rules_config
 
@@ -8,19 +9,25 @@ from itbl.util.config import load_rules_config
 class TriageEngine:
     """Detects ambiguities and flags cells for review."""
 
-    def __init__(self, strict_level: str = "medium", ocr_conf_threshold: float = 0.80):
+    def __init__(
+        self,
+        strict_level: str = "medium",
+        ocr_conf_threshold: float = 0.80,
+        config_dir: Optional[Path] = None,
+    ):
         """
         Initialize triage engine.
         
         Args:
             strict_level: "low", "medium", or "high"
             ocr_conf_threshold: Minimum OCR confidence (default 0.80)
+            config_dir: Config directory for rules.yaml (default: auto-detected)
         """
         self.strict_level = strict_level
         self.ocr_conf_threshold = ocr_conf_threshold
         
         # Load config for thresholds
-        rules_config = load_rules_config()
+        rules_config = load_rules_config(config_dir)
         triage_config = rules_config.get("triage", {})
         self.ocr_conf_threshold = triage_config.get("ocr_conf_threshold", ocr_conf_threshold)
         self.amount_delta_pct = triage_config.get("amount_delta_pct", 0.05)
@@ -102,21 +109,20 @@ class TriageEngine:
 
     def _get_low_conf_fields(self, row: Dict) -> List[str]:
         """Get field names that have low confidence tokens."""
-        low_conf_tokens = row.get("_low_conf_tokens", [])
+        # TokenTable (or legacy list of token dicts); only the count matters here
+        low_conf_tokens = row.get("_low_conf_tokens")
         if not low_conf_tokens:
             return []
 
         # Map tokens to likely fields (simplified)
-        # In a full implementation, we'd track which tokens map to which fields
+        # In a full implementation, we'd use token boxes to map tokens to fields
         fields = []
-        text_content = str(row).lower()
-        if any("date" in text_content or "vendor" in text_content for _ in low_conf_tokens):
-            # Conservative: flag common fields if any low conf tokens
-            if row.get("Date"):
-                fields.append("Date")
-            if row.get("Vendor"):
-                fields.append("Vendor")
-            if row.get("Amount"):
-                fields.append("Amount")
+        # Conservative: flag common fields if any low conf tokens
+        if row.get("Date"):
+            fields.append("Date")
+        if row.get("Vendor"):
+            fields.append("Vendor")
+        if row.get("Amount"):
+            fields.append("Amount")
         return fields
 
@@ -1,8 +1,9 @@
 """Configuration loading and management."""
 
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
@@ -19,7 +20,7 @@ def get_config_dir() -> Path:
 
 
 def load_yaml(config_name: str, config_dir: Path | str | None = None) -> Dict[str, Any]:
-    """Load a YAML config file."""
+    """Load a YAML config file (parsed on every call; see ConfigRegistry for cached access)."""
     if config_dir is None:
         config_dir = get_config_dir()
     elif isinstance(config_dir, str):
@@ -31,17 +32,117 @@ def load_yaml(config_name: str, config_dir: Path | str | None = None) -> Dict[st
         return yaml.safe_load(f)
 
 
+class FrozenDict(dict):
+    """Read-only dict for shared config snapshots (mutation raises TypeError)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("config snapshots are read-only; copy with dict() to modify")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        # Pickle via the constructor (the default would call __setitem__)
+        return (FrozenDict, (dict(self),))
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ConfigRegistry:
+    """
+    Process-wide cache of parsed config files.
+
+    Each file is parsed once and shared as an immutable snapshot. With
+    reload_on_change, the file's mtime is checked on every lookup and a changed
+    file is parsed again (for long-lived processes); otherwise a snapshot lives
+    until invalidate() is called.
+    """
+
+    def __init__(self, reload_on_change: bool = False):
+        """
+        Initialize config registry.
+
+        Args:
+            reload_on_change: Re-parse files whose mtime changed since loading
+        """
+        self.reload_on_change = reload_on_change
+        self._snapshots: Dict[Path, Tuple[int, Any]] = {}  # path -> (mtime_ns, snapshot)
+        self._paths: Dict[Tuple[str, Optional[str]], Path] = {}  # (name, dir as given) -> path
+        self._lock = threading.Lock()
+
+    def get(self, config_name: str, config_dir: Path | str | None = None) -> Any:
+        """
+        Get the parsed config file as a read-only snapshot.
+
+        Args:
+            config_name: File name within the config directory (e.g. "sheets.yaml")
+            config_dir: Config directory (default: auto-detected)
+
+        Returns:
+            Parsed YAML with dicts as FrozenDict and lists as tuples
+        """
+        key = (config_name, None if config_dir is None else str(config_dir))
+        with self._lock:
+            config_path = self._paths.get(key)
+            if config_path is None:
+                config_path = self._paths[key] = _config_path(config_name, config_dir)
+            cached = self._snapshots.get(config_path)
+            if cached is not None and not self.reload_on_change:
+                return cached[1]
+            try:
+                mtime_ns = config_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Config file not found: {config_path}") from None
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+            snapshot = _freeze(load_yaml(config_name, config_path.parent))
+            self._snapshots[config_path] = (mtime_ns, snapshot)
+            return snapshot
+
+    def invalidate(self, config_name: Optional[str] = None, config_dir: Path | str | None = None) -> None:
+        """
+        Drop cached snapshots so the next lookup re-parses.
+
+        Args:
+            config_name: File to drop (default: all files)
+            config_dir: Config directory of config_name (default: auto-detected)
+        """
+        with self._lock:
+            if config_name is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(_config_path(config_name, config_dir), None)
+
+
+def _config_path(config_name: str, config_dir: Path | str | None) -> Path:
+    """Absolute path of a config file (the cache key)."""
+    if config_dir is None:
+        config_dir = get_config_dir()
+    return (Path(config_dir) / config_name).resolve()
+
+
+# Shared by everything in the process
+config_registry = ConfigRegistry(reload_on_change=os.getenv("ITBL_CONFIG_RELOAD", "") not in ("", "0"))
+
+
 def load_sheets_config(config_dir: Path | str | None = None) -> Dict[str, Any]:
-    """Load sheets.yaml configuration."""
-    return load_yaml("sheets.yaml", config_dir)
+    """Load sheets.yaml configuration (cached, read-only snapshot)."""
+    return config_registry.get("sheets.yaml", config_dir)
 
 
 def load_rules_config(config_dir: Path | str | None = None) -> Dict[str, Any]:
-    """Load rules.yaml configuration."""
-    return load_yaml("rules.yaml", config_dir)
+    """Load rules.yaml configuration (cached, read-only snapshot)."""
+    return config_registry.get("rules.yaml", config_dir)
 
 
 def load_vendors_config(config_dir: Path | str | None = None) -> Dict[str, Any]:
-    """Load vendors.yaml configuration."""
-    return load_yaml("vendors.yaml", config_dir)
-
+    """Load vendors.yaml configuration (cached, read-only snapshot)."""
+    return config_registry.get("vendors.yaml", config_dir)
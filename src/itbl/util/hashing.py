@@ -20,12 +20,16 @@ def hash_content(content: bytes) -> str:
 
 
 def compute_row_hash(row: Dict[str, Any]) -> str:
-    """Compute hash for deduplication based on vendor, date, amount."""
+    """Compute hash for deduplication based on vendor, date, amount (and statement occurrence)."""
     # Create a stable string representation
     vendor = str(row.get("_vendor") or row.get("Vendor") or "").lower().strip()
     date = str(row.get("Date") or "").strip()
     amount = str(row.get("Amount") or 0).strip()
 
-    content = f"{vendor}|{date}|{amount}".encode("utf-8")
+    content = f"{vendor}|{date}|{amount}"
+    # Repeated identical transactions on one statement are distinct rows
+    if row.get("_occurrence"):
+        content += f"|{row['_occurrence']}"
+    content = content.encode("utf-8")
     return hashlib.md5(content).hexdigest()  # MD5 is sufficient for dedupe
 
@@ -0,0 +1,61 @@
+"""Token-bucket rate limiting for quota-limited APIs."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens refill continuously at rate per `per` seconds up to capacity; each
+    call takes one token and blocks until one is available. A full bucket
+    allows a burst of `capacity` calls.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 60.0,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per period
+            per: Period length in seconds (default: one minute)
+            capacity: Maximum stored tokens (default: rate)
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+        self.fill_rate = rate / per  # Tokens per second
+        self.capacity = capacity if capacity is not None else rate
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting for the bucket to refill if it is empty.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the wait this caller owes (later callers queue behind it)
+            wait = -self._tokens / self.fill_rate if self._tokens < 0 else 0.0
+        if wait:
+            self.sleep(wait)
+        return wait
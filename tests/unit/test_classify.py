@@ -0,0 +1,61 @@
+"""Unit tests for classification heuristics."""
+
+from itbl.ocr.base import TokenTable
+from itbl.parse.classify import Classifier, heuristic_text
+
+
+def _naive_scores(classifier, text):
+    """Per-category keyword counts, as the original per-category loop computed them."""
+    return {
+        category: sum(1 for keyword in keywords if keyword in text)
+        for category, keywords in classifier.category_keywords.items()
+    }
+
+
+def test_heuristic_text_skips_internal_fields_and_caps_ocr_snippet():
+    tokens = TokenTable({"text": ["premium"] * 1000, "confidence": [0.3] * 1000})
+    extracted = {
+        "vendor": "Acme Consulting",
+        "description": "Monthly retainer",
+        "amount": 125.0,
+        "_ocr_strategy": "speculative",
+        "_low_conf_tokens": tokens,
+    }
+    text = heuristic_text(extracted, snippet_chars=40)
+    assert text.startswith("acme consulting\nmonthly retainer\n")
+    assert "speculative" not in text and "125" not in text
+    assert len(text.split("\n")[-1]) <= 40
+
+    legacy = heuristic_text({"_low_conf_tokens": [{"text": "Toner", "left": 10}]})
+    assert legacy == "toner"
+
+
+def test_best_scoring_category_wins():
+    """The category with most distinct keywords wins, not the first with any hit."""
+    classifier = Classifier()
+    category, confidence = classifier._classify_by_heuristics(
+        {"vendor": "Paper Co", "description": "cloud hosting server for inventory"}
+    )
+    assert category == "COGS"
+    assert confidence == 0.85
+
+    assert classifier._classify_by_heuristics({"vendor": "Zzz", "_low_conf_tokens": []}) is None
+
+
+def test_scores_match_per_category_substring_counts():
+    """The automaton counts the same keywords as `keyword in text` per category."""
+    classifier = Classifier()
+    samples = [
+        "starbucks coffee and lunch",
+        "att wireless phone bill",
+        "uber to attorney office depot",
+        "research software development tool api",
+        "bank fee overdraft service charge",
+    ]
+    for text in samples:
+        expected = _naive_scores(classifier, text)
+        best = max(expected.values())
+        category, confidence = classifier._classify_by_heuristics({"description": text})
+        assert expected[category] == best
+        assert category == next(c for c, score in expected.items() if score == best)
+        assert confidence == min(0.85, 0.60 + best * 0.10)
@@ -0,0 +1,71 @@
+"""Unit tests for the config registry."""
+
+import os
+import pickle
+
+import pytest
+
+from itbl.util import config as config_module
+from itbl.util.config import ConfigRegistry, FrozenDict, load_sheets_config
+
+
+def _write(path, text, mtime_ns=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_each_file_is_parsed_once(tmp_path, monkeypatch):
+    """Repeated lookups return the same snapshot without re-reading YAML."""
+    _write(tmp_path / "sheets.yaml", "tabs:\n  Travel: [Date, Amount]\n")
+    calls = []
+    real_load_yaml = config_module.load_yaml
+    monkeypatch.setattr(config_module, "load_yaml", lambda *a: calls.append(a) or real_load_yaml(*a))
+
+    registry = ConfigRegistry()
+    first = registry.get("sheets.yaml", tmp_path)
+    assert registry.get("sheets.yaml", str(tmp_path)) is first
+    assert len(calls) == 1
+    assert first["tabs"]["Travel"] == ("Date", "Amount")
+
+
+def test_snapshots_are_read_only_and_picklable(tmp_path):
+    """Snapshots can't be mutated by one caller for everyone, but still pickle."""
+    _write(tmp_path / "rules.yaml", "triage:\n  ocr_conf_threshold: 0.8\n")
+    snapshot = ConfigRegistry().get("rules.yaml", tmp_path)
+
+    with pytest.raises(TypeError):
+        snapshot["triage"]["ocr_conf_threshold"] = 0.1
+    with pytest.raises(TypeError):
+        snapshot.update({})
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert isinstance(restored, FrozenDict) and restored == snapshot
+
+
+def test_reload_on_change_and_invalidate(tmp_path):
+    """A changed mtime re-parses with reload_on_change; otherwise invalidate() is needed."""
+    path = tmp_path / "sheets.yaml"
+    _write(path, "tabs: {}\n", mtime_ns=1_000_000_000)
+    static, live = ConfigRegistry(), ConfigRegistry(reload_on_change=True)
+    static.get("sheets.yaml", tmp_path)
+    live.get("sheets.yaml", tmp_path)
+
+    _write(path, "tabs:\n  Meals: [Date]\n", mtime_ns=2_000_000_000)
+    assert live.get("sheets.yaml", tmp_path)["tabs"] == {"Meals": ("Date",)}
+    assert static.get("sheets.yaml", tmp_path)["tabs"] == {}
+    static.invalidate("sheets.yaml", tmp_path)
+    assert "Meals" in static.get("sheets.yaml", tmp_path)["tabs"]
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ConfigRegistry().get("sheets.yaml", tmp_path)
+
+
+def test_triage_engine_uses_config_dir(tmp_path):
+    """TriageEngine reads rules.yaml from the given config directory."""
+    from itbl.review.triage import TriageEngine
+
+    _write(tmp_path / "rules.yaml", "triage:\n  ocr_conf_threshold: 0.33\n")
+    assert TriageEngine(config_dir=tmp_path).ocr_conf_threshold == 0.33
+    assert "tabs" in load_sheets_config()
@@ -0,0 +1,66 @@
+"""Unit tests for the date scanner."""
+
+import random
+from datetime import datetime
+
+from itbl.parse.categories.checks import extract_check_fields
+from itbl.parse.common import extract_date
+from itbl.parse.dates import DateScanner, _parse_with_format, get_date_scanner, parse_date, scan_dates
+
+
+def test_configured_formats_match_and_win_in_order():
+    """A configured format beats the dateutil fallback, and earlier formats beat later ones."""
+    assert extract_date("Issued Dec 5, 2023") == ("2023-12-05", 0.95)
+    assert extract_date("Reçu le DEC 5, 2023") == ("2023-12-05", 0.95)  # Non-ASCII text, any case
+    text = "Posted 2024-02-01, purchased 01/15/2024"
+    assert extract_date(text) == ("2024-01-15", 0.95)
+    assert extract_date(text, ["%Y-%m-%d", "%m/%d/%Y"]) == ("2024-02-01", 0.95)
+
+
+def test_failed_format_falls_through_at_same_offset():
+    """25/12/2023 fails %m/%d/%Y but parses with a later format or the fallback."""
+    assert extract_date("Date 25/12/2023", ["%m/%d/%Y", "%d/%m/%Y"]) == ("2023-12-25", 0.95)
+    assert extract_date("Date 25/12/2023") == ("2023-12-25", 0.90)
+    assert extract_date("Date 99/99/2023") == (None, 0.0)
+
+
+def test_scan_returns_every_date_with_offsets():
+    text = "01/02/2024 COFFEE 4.50\n01/03/2024 FUEL 40.00"
+    candidates = scan_dates(text, ["%m/%d/%Y"])
+    formatted = [c for c in candidates if c.fmt == "%m/%d/%Y"]
+    assert [(c.start, c.value) for c in formatted] == [(0, "2024-01-02"), (23, "2024-01-03")]
+    assert all(text[c.start:c.end] == c.text for c in candidates)
+
+
+def test_scanners_and_scans_are_shared():
+    """One compiled scanner per format list; extractors on the same text reuse the scan."""
+    formats = ("%m/%d/%Y", "%Y-%m-%d")
+    scanner = get_date_scanner(formats)
+    assert get_date_scanner(formats) is scanner and isinstance(scanner, DateScanner)
+
+    text = "PAY TO THE ORDER OF ACME SUPPLY\nDate 03/04/2024\n$125.00"
+    misses = scanner.scan.cache_info().misses
+    assert extract_check_fields(text, list(formats))["date"] == "2024-03-04"
+    assert extract_date(text, list(formats)) == ("2024-03-04", 0.95)
+    assert scanner.scan.cache_info().misses == misses + 1  # Scanned once
+
+
+def test_numeric_formats_parse_like_strptime():
+    """Numeric formats skip strptime but accept and reject the same strings."""
+    rng = random.Random(2)
+    pieces = ["0", "1", "2", "3", "9", "12", "31", "00", "2024", "1969", "/", "-", "."]
+    for _ in range(3000):
+        fmt = rng.choice(["%m/%d/%Y", "%Y-%m-%d", "%d.%m.%y", "%m-%d-%y"])
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 7)))
+        try:
+            expected = datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            expected = None
+        assert _parse_with_format.__wrapped__(text, fmt) == expected, (text, fmt)
+
+
+def test_parse_date_normalizes_standalone_dates():
+    assert parse_date("01/05/2024") == "2024-01-05"
+    assert parse_date("1-5-24") == "2024-01-05"  # dateutil fallback
+    assert parse_date("05/01/2024", ["%d/%m/%Y"]) == "2024-01-05"
+    assert parse_date("13/45/2024") is None
@@ -0,0 +1,374 @@
+"""Unit tests for the Google Sheets writer (against an in-memory fake service)."""
+
+import pytest
+
+gsheet_writer = pytest.importorskip("itbl.output.gsheet_writer")
+if not gsheet_writer.GOOGLE_AVAILABLE:
+    pytest.skip("Google API libraries not installed", allow_module_level=True)
+
+GoogleSheetsWriter = gsheet_writer.GoogleSheetsWriter
+
+
+def _tab(a1_range):
+    return a1_range.rsplit("!", 1)[0].strip("'").replace("''", "'")
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeSheetsService:
+    """Minimal stand-in for the discovery-built Sheets v4 service."""
+
+    def __init__(self, tabs=("Sheet1",)):
+        self.tabs = {title: {"id": index, "rows": []} for index, title in enumerate(tabs)}
+        self.calls = []
+        self.batches = []
+
+    # service.spreadsheets()
+    def spreadsheets(self):
+        return self
+
+    # service.spreadsheets().values()
+    def values(self):
+        return _Values(self)
+
+    def get(self, spreadsheetId, fields=None):
+        def run():
+            self.calls.append("get")
+            return {"sheets": [{"properties": {"title": t, "sheetId": tab["id"]}} for t, tab in self.tabs.items()]}
+        return _Request(run)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def run():
+            self.calls.append("batchUpdate")
+            self.batches.append(body["requests"])
+            replies = []
+            for request in body["requests"]:
+                if "addSheet" in request:
+                    title = request["addSheet"]["properties"]["title"]
+                    self.tabs[title] = {"id": 100 + len(self.tabs), "rows": []}
+                    replies.append({"addSheet": {"properties": {"title": title, "sheetId": self.tabs[title]["id"]}}})
+                else:
+                    replies.append({})
+            return {"replies": replies}
+        return _Request(run)
+
+
+class _Values:
+    def __init__(self, fake):
+        self.fake = fake
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        def run():
+            self.fake.calls.append("values.append")
+            tab = _tab(range)
+            rows = self.fake.tabs[tab]["rows"]
+            start = len(rows) + 1
+            rows.extend(body["values"])
+            end = len(rows)
+            return {"updates": {"updatedRange": f"'{tab}'!A{start}:C{end}", "updatedRows": len(body["values"])}}
+        return _Request(run)
+
+    def get(self, spreadsheetId, range):
+        def run():
+            self.fake.calls.append("values.get")
+            return {"values": self.fake.tabs[_tab(range)]["rows"]}
+        return _Request(run)
+
+
+def _rows(vendor, highlight=None):
+    return [{
+        "_flags": ["low_ocr_confidence"] if highlight else [],
+        "_highlight_cells": highlight or [],
+        "Date": "2024-01-15",
+        "Vendor": vendor,
+        "Amount": 12.5,
+    }]
+
+
+def test_metadata_fetched_once_and_updated_from_add_sheet_replies():
+    """Tab lookups hit the cache; new tabs are recorded from the addSheet reply."""
+    service = FakeSheetsService(tabs=["Office Supplies"])
+    writer = GoogleSheetsWriter("sheet", service=service)
+
+    writer.write(_rows("STAPLES"), None, "Office Supplies")
+    writer.write(_rows("UBER"), None, "Transportation")
+    writer.write(_rows("LYFT"), None, "Transportation")
+
+    assert service.calls.count("get") == 1
+    assert writer._get_tab_id("Transportation") == service.tabs["Transportation"]["id"]
+    assert len(service.tabs["Transportation"]["rows"]) == 2
+
+
+def test_invalidate_metadata_refetches():
+    """Tabs created elsewhere are seen after invalidate_metadata()."""
+    service = FakeSheetsService(tabs=["Office Supplies"])
+    writer = GoogleSheetsWriter("sheet", service=service)
+    assert writer._get_tab_id("Meals") is None
+
+    service.tabs["Meals"] = {"id": 7, "rows": []}
+    assert writer._get_tab_id("Meals") is None
+    writer.invalidate_metadata()
+    assert writer._get_tab_id("Meals") == 7
+    assert service.calls.count("get") == 2
+
+
+def test_highlights_use_append_response_range():
+    """Highlighted rows are located from updatedRange; nothing is read back."""
+    service = FakeSheetsService(tabs=["Office Supplies"])
+    service.tabs["Office Supplies"]["rows"] = [["Amount", "Date", "Vendor"]] + [["1", "d", "v"]] * 40
+    writer = GoogleSheetsWriter("sheet", service=service)
+
+    writer.write(_rows("STAPLES") + _rows("AMAZON", highlight=["Vendor", "Amount"]), None, "Office Supplies", apply_highlights=True)
+
+    assert "values.get" not in service.calls
+    assert service.calls.count("batchUpdate") == 1
+    requests = service.batches[-1]
+    assert len(requests) == 2
+    ranges = [(r["updateCells"]["range"]["startRowIndex"], r["updateCells"]["range"]["startColumnIndex"]) for r in requests]
+    assert ranges == [(42, 2), (42, 0)]  # Second appended row is sheet row 43
+    cell = requests[0]["updateCells"]["rows"][0]["values"][0]
+    assert "low_ocr_confidence" in cell["note"] and cell["userEnteredFormat"]["backgroundColor"]["blue"] < 1
+
+
+def test_range_start_row():
+    """Start rows are parsed from quoted and unquoted A1 ranges."""
+    assert gsheet_writer._range_start_row("'Office Supplies'!A12:F40") == 12
+    assert gsheet_writer._range_start_row("Sheet1!B3") == 3
+    assert gsheet_writer._range_start_row("'It''s!'!A7:C9") == 7
+    assert gsheet_writer._range_start_row("Sheet1!A:Z") is None
+
+
+class FakeSheetsServer:
+    """Local HTTP server speaking enough of the Sheets v4 REST API for the writer."""
+
+    def __init__(self, tabs=("Sheet1",)):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import unquote, urlparse
+
+        fake = self
+        self.tabs = {title: {"id": index, "rows": [], "notes": {}} for index, title in enumerate(tabs)}
+        self.log = []  # (method, path) of every request
+        self.failures = []  # Statuses to answer the next requests with
+        self.fail_at = {}  # Request number (1-based) -> status to answer it with
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method):
+                path = unquote(urlparse(self.path).path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                fake.log.append((method, path))
+                if fake.failures or len(fake.log) in fake.fail_at:
+                    status = fake.failures.pop(0) if fake.failures else fake.fail_at[len(fake.log)]
+                    return self._reply(status, {"error": {"code": status, "message": "try again"}})
+                if method == "GET":
+                    return self._reply(200, {"sheets": [
+                        {"properties": {"title": title, "sheetId": tab["id"]}} for title, tab in fake.tabs.items()
+                    ]})
+                if path.endswith(":batchUpdate"):
+                    return self._reply(200, fake.batch_update(body["requests"]))
+                return self._reply(404, {"error": {"code": 404, "message": path}})
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+
+    def batch_update(self, requests):
+        replies = []
+        by_id = {tab["id"]: tab for tab in self.tabs.values()}
+        for request in requests:
+            if "addSheet" in request:
+                properties = request["addSheet"]["properties"]
+                tab = {"id": properties["sheetId"], "rows": [], "notes": {}}
+                self.tabs[properties["title"]] = by_id[tab["id"]] = tab
+                replies.append({"addSheet": {"properties": properties}})
+            elif "appendCells" in request:
+                tab = by_id[request["appendCells"]["sheetId"]]
+                for row in request["appendCells"]["rows"]:
+                    tab["rows"].append([next(iter(c.get("userEnteredValue", {"": ""}).values())) for c in row["values"]])
+                    for col, cell in enumerate(row["values"]):
+                        if "note" in cell:
+                            tab["notes"][(len(tab["rows"]), col)] = cell["note"]
+                replies.append({})
+        return {"replies": replies}
+
+    def service(self):
+        import httplib2
+        from googleapiclient.discovery import build
+
+        endpoint = f"http://127.0.0.1:{self.httpd.server_port}"
+        return build("sheets", "v4", http=httplib2.Http(), client_options={"api_endpoint": endpoint}, static_discovery=True)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def sheets_server():
+    server = FakeSheetsServer(tabs=["Office Supplies"])
+    yield server
+    server.close()
+
+
+def _staged_writer(server):
+    return GoogleSheetsWriter("sheet", service=server.service(), staged=True)
+
+
+def test_staged_commit_sends_all_categories_in_one_batch_update(sheets_server):
+    """One metadata read and one batchUpdate cover every category, with notes inline."""
+    writer = _staged_writer(sheets_server)
+    writer.write(_rows("STAPLES") + _rows("AMAZON", highlight=["Amount"]), None, "Office Supplies", apply_highlights=True)
+    writer.write(_rows("UBER"), None, "Transportation", apply_highlights=True)
+    writer.write(_rows("HILTON"), None, "Travel", apply_highlights=True)
+    assert sheets_server.log == []
+    writer.close()
+
+    assert [method for method, _ in sheets_server.log] == ["GET", "POST"]
+    assert sheets_server.log[1][1].endswith(":batchUpdate")
+    assert set(sheets_server.tabs) == {"Office Supplies", "Transportation", "Travel"}
+    office = sheets_server.tabs["Office Supplies"]
+    assert office["rows"] == [[12.5, "2024-01-15", "STAPLES"], [12.5, "2024-01-15", "AMAZON"]]
+    assert list(office["notes"]) == [(2, 0)]
+    assert sheets_server.tabs["Travel"]["rows"][0][2] == "HILTON"
+    assert writer._get_tab_id("Travel") == sheets_server.tabs["Travel"]["id"]
+
+
+def test_staged_commit_chunks_large_runs(sheets_server, monkeypatch):
+    """Rows are split into batchUpdates of at most COMMIT_CHUNK_ROWS rows."""
+    monkeypatch.setattr(gsheet_writer, "COMMIT_CHUNK_ROWS", 2)
+    writer = _staged_writer(sheets_server)
+    writer.write(_rows("A") + _rows("B") + _rows("C"), None, "Office Supplies")
+    writer.write(_rows("D") + _rows("E"), None, "Transportation")
+    writer.close()
+
+    assert [method for method, _ in sheets_server.log].count("POST") == 3
+    assert [row[2] for row in sheets_server.tabs["Office Supplies"]["rows"]] == ["A", "B", "C"]
+    assert [row[2] for row in sheets_server.tabs["Transportation"]["rows"]] == ["D", "E"]
+
+
+def test_failed_commit_keeps_unsent_rows_for_retry(sheets_server, monkeypatch):
+    """Rows of applied batches are dropped; a retried commit sends only the rest."""
+    monkeypatch.setattr(gsheet_writer, "COMMIT_CHUNK_ROWS", 2)
+    writer = _staged_writer(sheets_server)
+    writer.write(_rows("A") + _rows("B") + _rows("C"), None, "Office Supplies")
+    writer.write(_rows("D") + _rows("E"), None, "Transportation")
+
+    sheets_server.fail_at = {3: 400}  # GET, first batch, then the second batch fails
+    with pytest.raises(gsheet_writer.HttpError):
+        writer.commit()
+    assert [row[2] for row in sheets_server.tabs["Office Supplies"]["rows"]] == ["A", "B"]
+
+    writer.commit()
+    assert [row[2] for row in sheets_server.tabs["Office Supplies"]["rows"]] == ["A", "B", "C"]
+    assert [row[2] for row in sheets_server.tabs["Transportation"]["rows"]] == ["D", "E"]
+    assert writer._staged == {}
+
+
+def test_quota_and_server_errors_are_retried_with_backoff(sheets_server, monkeypatch):
+    """429/5xx responses are retried with growing delays; appends retry only 429."""
+    delays = []
+    monkeypatch.setattr(gsheet_writer.time, "sleep", delays.append)
+    writer = _staged_writer(sheets_server)
+    writer.write(_rows("STAPLES"), None, "Office Supplies")
+
+    sheets_server.failures = [429, 503, 429]  # Metadata read twice, then the batchUpdate
+    writer.close()
+
+    assert len(delays) == 3
+    assert delays[0] <= gsheet_writer.BACKOFF_BASE < delays[2]
+    assert len(sheets_server.tabs["Office Supplies"]["rows"]) == 1
+
+    writer.write(_rows("AMAZON"), None, "Office Supplies")
+    sheets_server.fail_at = {len(sheets_server.log) + 1: 503}  # The appendCells batchUpdate
+    with pytest.raises(gsheet_writer.HttpError):
+        writer.close()
+    assert len(delays) == 3
+    assert len(sheets_server.tabs["Office Supplies"]["rows"]) == 1
+
+    sheets_server.fail_at = {}
+    sheets_server.failures = [400]
+    with pytest.raises(gsheet_writer.HttpError):
+        writer.close()
+    assert len(delays) == 3
+
+
+def test_token_bucket_waits_once_burst_is_spent():
+    """A full bucket allows `capacity` calls; further calls wait for refill."""
+    from itbl.util.ratelimit import TokenBucket
+
+    now = [0.0]
+    waits = []
+    bucket = TokenBucket(60, per=60.0, capacity=2, clock=lambda: now[0], sleep=waits.append)
+
+    assert bucket.acquire() == 0.0 and bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert bucket.acquire() == pytest.approx(2.0)  # Queued behind the previous caller
+    now[0] = 10.0
+    assert bucket.acquire() == 0.0
+    assert waits == [pytest.approx(1.0), pytest.approx(2.0)]
+
+
+def test_write_command_resumes_from_checkpoint(sheets_server, tmp_path, monkeypatch):
+    """An interrupted upload continues after the last committed chunk, without duplicates."""
+    from itbl import cli
+    from itbl.output.csv_writer import CSVWriter
+    from itbl.output.staging import CHECKPOINT_FILE
+
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    rows = [_rows(f"V{i}", highlight=["Amount"] if i == 4 else None)[0] for i in range(5)]
+    CSVWriter().write(rows, staging, "Office Supplies")
+    CSVWriter().write(_rows("UBER"), staging, "Transportation")
+
+    service = sheets_server.service()
+    monkeypatch.setattr(
+        cli, "GoogleSheetsWriter",
+        lambda **kwargs: GoogleSheetsWriter(service=service, **kwargs),
+    )
+    upload = dict(target="google-sheets", sheet_id="sheet", input_path=staging, chunk_size=2, apply_highlights=True)
+
+    sheets_server.fail_at = {3: 400}  # GET, first chunk, then the second chunk fails
+    assert cli.write_command(**upload) == 3
+    assert [row[2] for row in sheets_server.tabs["Office Supplies"]["rows"]] == ["V0", "V1"]
+    assert (staging / CHECKPOINT_FILE).exists()
+
+    assert cli.write_command(**upload) == 0
+    assert [row[2] for row in sheets_server.tabs["Office Supplies"]["rows"]] == ["V0", "V1", "V2", "V3", "V4"]
+    assert sheets_server.tabs["Office Supplies"]["rows"][0][0] == 12.5
+    assert list(sheets_server.tabs["Office Supplies"]["notes"]) == [(5, 0)]
+    assert sheets_server.tabs["Transportation"]["rows"] == [[12.5, "2024-01-15", "UBER"]]
+
+    # Everything is recorded as uploaded, so a third run sends nothing
+    requests = len(sheets_server.log)
+    assert cli.write_command(**upload) == 0
+    assert len(sheets_server.log) == requests
+
+    # A chunk larger than one batch could not be checkpointed atomically
+    upload["chunk_size"] = gsheet_writer.COMMIT_CHUNK_ROWS + 1
+    assert cli.write_command(**dict(upload, restart=True)) == 3
+    assert len(sheets_server.log) == requests
@@ -0,0 +1,85 @@
+"""Unit tests for the OCR text lexer and the extractors built on it."""
+
+import random
+import re
+
+from itbl.parse.categories.bank_statements import extract_statement_fields
+from itbl.parse.categories.checks import extract_check_fields
+from itbl.parse.common import extract_amount
+from itbl.parse.lexer import DATE, MONEY, NUMBER, _lex_cached, lex
+from itbl.pipeline import _looks_like_statement
+
+
+def test_spans_carry_kind_value_and_line():
+    lexed = lex("STAPLES #12\n01/05/2024 PAPER -$1,234.50\nQty 3 @ 4.5 USD 7.25")
+    numeric = [(span.kind, span.value, span.symbol, span.line) for span in lexed.numeric]
+    assert numeric == [
+        (NUMBER, 12.0, None, 0),
+        (NUMBER, 1.0, None, 1), (NUMBER, 5.0, None, 1), (NUMBER, 2024.0, None, 1),
+        (MONEY, -1234.5, "$", 1),
+        (NUMBER, 3.0, None, 2), (NUMBER, 4.5, None, 2), (MONEY, 7.25, "usd", 2),
+    ]
+    assert [span.in_date for span in lexed.numeric[1:4]] == [True, True, True]
+    assert [(span.kind, span.value, span.line) for span in lexed.dates] == [(DATE, "2024-01-05", 1)]
+    assert [span.start for span in lexed.keyword("#")] == [8]
+    assert lexed.line_of(lexed.money[0].start) == 1
+
+
+def test_ambiguous_separators_have_no_value():
+    """OCR'd decimal commas ("1,368,21") and repeated dots are not read as one number."""
+    values = [span.value for span in lex("$1,368,21 $3.2.55 1234,5 $2,871.93").numeric]
+    assert values == [None, None, None, 2871.93]
+
+
+def test_keywords_are_case_insensitive_substrings():
+    lexed = lex("Pay  t0 The Order of ACME\nCHECKING Statement")
+    assert lexed.has_keyword("pay to the order", "check", "statement")
+    assert not lexed.has_keyword("pay to", "balance")  # The longer keyword wins at the same offset
+    assert lex("Reçu: PAY TO ACME").has_keyword("pay to")  # Non-ASCII text
+
+
+def test_amount_rules():
+    assert extract_amount("Total: $123.45") == (123.45, 0.95)
+    assert extract_amount("Amount Due: 1,234.56") == (1234.56, 0.95)
+    assert extract_amount("Refund -45.00\nTotal 12.00") == (12.00, 0.95)
+    assert extract_amount("Invoice 2023-12-25 55.00") == (55.00, 0.95)
+    assert extract_amount("Paid $5409.84 on 01/02/2024") == (5409.84, 0.95)
+
+
+def test_check_amount_ignores_dates_and_reads_grouped_amounts():
+    assert extract_check_fields("Invoice date: 2023-12-25")["amount_digits"] is None
+    assert extract_check_fields("Amount Due: 1,234.56")["amount_digits"] == 1234.56
+    fields = extract_check_fields("PAY TO THE ORDER OF Acme Supply\n$ 250.00\nMemo: Two hundred fifty DOLLARS")
+    assert (fields["payee"], fields["amount_digits"]) == ("Acme Supply", 250.0)
+    assert fields["amount_words"] == "Two hundred fifty"
+
+
+def test_extractors_share_one_lex():
+    text = "ACCOUNT STATEMENT\n01/02/2024 COFFEE SHOP $4.50\n01/03/2024 FUEL STOP $40.00\nBalance: $955.50"
+    _lex_cached.cache_clear()
+    lexed = lex(text)
+    assert extract_statement_fields(text, lexed=lexed)["balance"] == 955.50
+    assert extract_amount(text) == (955.50, 0.95)
+    assert _lex_cached.cache_info().misses == 1
+
+
+def _looks_like_statement_regex(text):
+    """The detection regexes lexed detection replaced, with vendor names ending at line breaks."""
+    vendor_amounts = sum(len(re.findall(r"[A-Z][A-Z\s&]+?\$\d+\.\d{2}", line)) for line in text.split("\n"))
+    return len(re.findall(r"\$\d+\.\d{2}", text)) >= 3 or vendor_amounts >= 2
+
+
+def test_statement_detection_matches_regexes():
+    rng = random.Random(5)
+    pieces = ["ACME", "Shop", " ", "&", "$", "$4.50", "$12.345", "$1,000.00", "\n", "x", "-", "7", "$ 3.10", "B$9.99",
+              "A", "\t", "a&B "]
+    for _ in range(500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 14)))
+        assert _looks_like_statement(lex(text)) == _looks_like_statement_regex(text), repr(text)
+
+
+def test_statement_vendor_amounts():
+    assert _looks_like_statement(lex("COFFEE & CO $4.50\nFUEL STOP $40.00"))
+    assert not _looks_like_statement(lex("Coffee $4.50\nFUEL STOP $40.00"))
+    assert not _looks_like_statement(lex("B$4.50 C$40.00"))  # A lone letter is no vendor name
+    assert not _looks_like_statement(lex("COFFEE\n$4.50 FUEL\n$40.00"))  # Name and amount on different lines
@@ -0,0 +1,180 @@
+"""Unit tests for image loading."""
+
+import os
+
+import pytest
+from PIL import Image
+
+from itbl.ingest.loader import find_image_files, find_pdf_files, iter_image_files, load_image
+from itbl.ingest.preprocess import DEFAULT_PREPROCESS_PROFILE, get_preprocess_options
+
+
+def _save(tmp_path, name, size=(4000, 3000), **save_kwargs):
+    path = tmp_path / name
+    Image.new("RGB", size, "white").save(path, **save_kwargs)
+    return path
+
+
+def test_load_full_resolution_by_default(tmp_path):
+    """Without dpi/max_side the image keeps its size and scale 1.0."""
+    image = load_image(_save(tmp_path, "a.jpg"))
+
+    assert image.size == (4000, 3000)
+    assert image.info["source_scale"] == 1.0
+
+
+def test_jpeg_decoded_at_reduced_dct_scale(tmp_path):
+    """A quarter-size target is served by JPEG draft mode without a resample."""
+    image = load_image(_save(tmp_path, "a.jpg"), max_side=1000)
+
+    assert image.size == (1000, 750)
+    assert image.format == "JPEG"  # Still the lazily decoded JPEG, not a resized copy
+    assert image.info["source_size"] == (4000, 3000)
+    assert image.info["source_scale"] == 0.25
+
+
+def test_phone_photo_kept_at_default_settings(tmp_path):
+    """Photos without DPI metadata (or at camera 72 DPI) are not capped by the OCR DPI."""
+    max_side = get_preprocess_options(DEFAULT_PREPROCESS_PROFILE)["max_side"]
+    for name, save_kwargs in (("a.jpg", {}), ("b.jpg", {"dpi": (72, 72)})):
+        image = load_image(_save(tmp_path, name, **save_kwargs), dpi=300, max_side=max_side)
+
+        assert image.size == (4000, 3000)
+        assert image.info["source_scale"] == 1.0
+
+
+def test_high_dpi_scan_decoded_at_target_dpi(tmp_path):
+    """A 600 DPI JPEG scan is decoded at half size for 300 DPI OCR."""
+    image = load_image(_save(tmp_path, "a.jpg", dpi=(600, 600)), dpi=300)
+
+    assert image.size == (2000, 1500)
+    assert image.info["source_size"] == (4000, 3000)
+    assert image.info["source_scale"] == 0.5
+
+
+def test_other_formats_resampled_to_target_dpi(tmp_path):
+    """Non-JPEG scans are resampled down to the target DPI."""
+    image = load_image(_save(tmp_path, "a.png", dpi=(400, 400)), dpi=100)
+
+    assert image.size == (1000, 750)
+    assert image.info["source_scale"] == 0.25
+
+
+def test_small_images_never_enlarged(tmp_path):
+    """Images already under the target keep their size."""
+    image = load_image(_save(tmp_path, "a.png", size=(800, 600)), dpi=300, max_side=2400)
+    assert image.size == (800, 600)
+
+
+def test_exif_orientation_survives_resample(tmp_path):
+    """EXIF orientation is still readable from a resampled image."""
+    exif = Image.Exif()
+    exif[274] = 6
+    image = load_image(_save(tmp_path, "a.jpg", exif=exif.tobytes()), max_side=1500)
+
+    assert image.format is None  # Resampled copy
+    assert image.getexif().get(274) == 6
+
+
+def _touch(root, *names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+
+def test_scan_matches_extensions_case_insensitively_in_sorted_order(tmp_path):
+    """One walk finds every case variant, in the same order as sorting the full list."""
+    _touch(tmp_path, "b.JPG", "a.png", "sub/c.Tiff", "sub/deeper/d.jpeg", "notes.txt", "z.pdf")
+
+    found = find_image_files(tmp_path)
+
+    assert found == sorted(found)
+    assert [p.relative_to(tmp_path).as_posix() for p in found] == [
+        "a.png", "b.JPG", "sub/c.Tiff", "sub/deeper/d.jpeg",
+    ]
+    assert [p.name for p in find_pdf_files(tmp_path)] == ["z.pdf"]
+
+
+def test_scan_is_lazy_and_honours_recursive(tmp_path):
+    """iter_image_files is a generator; recursive=False stays in the top directory."""
+    _touch(tmp_path, "a.png", "sub/b.png")
+
+    first = next(iter_image_files(tmp_path))
+    assert first.name == "a.png"
+    assert [p.name for p in find_image_files(tmp_path, recursive=False)] == ["a.png"]
+
+
+def test_scan_exclude_patterns(tmp_path):
+    """Exclude globs match names or relative paths and prune directories."""
+    _touch(tmp_path, "keep.png", "skip.tmp.png", "archive/old.png", "sub/archive/x.png", "sub/y.png")
+
+    found = find_image_files(tmp_path, exclude=["*.tmp.png", "archive"])
+    assert [p.relative_to(tmp_path).as_posix() for p in found] == ["keep.png", "sub/y.png"]
+
+    found = find_image_files(tmp_path, exclude=["sub/*"])
+    assert [p.relative_to(tmp_path).as_posix() for p in found] == ["archive/old.png", "keep.png", "skip.tmp.png"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks not supported")
+def test_scan_does_not_follow_symlinked_directories(tmp_path):
+    """Symlinked directories are skipped (no duplicates or cycles)."""
+    _touch(tmp_path, "real/a.png")
+    try:
+        os.symlink(tmp_path / "real", tmp_path / "link", target_is_directory=True)
+    except OSError:
+        pytest.skip("cannot create symlinks")
+
+    assert [p.relative_to(tmp_path).as_posix() for p in find_image_files(tmp_path)] == ["real/a.png"]
+
+
+def _make_pdf(tmp_path, pages=3):
+    """Image-only PDF with letter-size pages (8.5x11in at 100 DPI)."""
+    images = [Image.new("RGB", (850, 1100), (255, 255 - i, 255)) for i in range(pages)]
+    path = tmp_path / "statement.pdf"
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=100.0)
+    return path
+
+
+def test_pdf_pages_expand_to_work_items(tmp_path):
+    """Each PDF page becomes a PDFPage work item; images pass through."""
+    pytest.importorskip("pypdfium2")
+    from itbl.ingest.loader import PDFPage, iter_input_files, iter_work_items
+
+    _make_pdf(tmp_path)
+    _save(tmp_path, "receipt.png", size=(10, 10))
+
+    items = list(iter_work_items(iter_input_files(tmp_path)))
+
+    assert items[0].name == "receipt.png"
+    assert [str(item) for item in items[1:]] == [
+        f"{tmp_path / 'statement.pdf'}#page={n}" for n in (1, 2, 3)
+    ]
+    assert all(isinstance(item, PDFPage) and item.page_count == 3 for item in items[1:])
+
+
+def test_render_pdf_page_at_target_dpi(tmp_path):
+    """Pages render at the requested DPI, capped by max_side, with scale recorded."""
+    pytest.importorskip("pypdfium2")
+    from itbl.ingest.loader import render_pdf_page
+
+    path = _make_pdf(tmp_path)
+
+    page = render_pdf_page(path, 2, dpi=200)
+    assert page.size == (1700, 2200)
+    assert page.info["source_size"] == (612.0, 792.0)
+
+    capped = render_pdf_page(path, 2, dpi=300, max_side=1100)
+    assert max(capped.size) == 1100
+    assert abs(capped.info["source_scale"] - 1100 / 792) < 1e-6
+
+
+def test_split_pdf_pages_is_a_generator(tmp_path):
+    """split_pdf_pages renders lazily, one page per iteration."""
+    pytest.importorskip("pypdfium2")
+    from itbl.ingest.loader import split_pdf_pages
+
+    pages = split_pdf_pages(_make_pdf(tmp_path), dpi=72)
+    first = next(pages)
+    assert first.size == (612, 792)
+    assert len(list(pages)) == 2
@@ -0,0 +1,103 @@
+"""Unit tests for the Aho-Corasick automaton and vendor matcher."""
+
+import random
+import re
+
+from itbl.parse.matching import AhoCorasick, VendorMatcher
+
+
+def _naive_matches(patterns, text):
+    return sorted(
+        (start, pattern_id)
+        for pattern_id, pattern in enumerate(patterns) if pattern
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    )
+
+
+def _naive_vendor_match(vendor_map, vendor):
+    """The original Classifier._match_vendor loop."""
+    if not vendor:
+        return None
+    vendor_lower = vendor.lower()
+    for entry in vendor_map:
+        if "match" in entry:
+            match_str = entry["match"].lower()
+            if match_str in vendor_lower or vendor_lower in match_str:
+                return entry
+        if "match_regex" in entry:
+            try:
+                if re.search(entry["match_regex"], vendor, re.IGNORECASE):
+                    return entry
+            except re.error:
+                continue
+    return None
+
+
+def test_aho_corasick_finds_overlapping_matches():
+    """All occurrences are reported, including patterns inside other patterns."""
+    patterns = ["he", "she", "his", "hers", "", "e"]
+    matches = list(AhoCorasick(patterns).iter_matches("ushers his"))
+    assert sorted(matches) == _naive_matches(patterns, "ushers his")
+
+
+def test_aho_corasick_matches_naive_search_on_random_text():
+    rng = random.Random(7)
+    patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    automaton = AhoCorasick(patterns)
+    for _ in range(50):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 40)))
+        assert sorted(automaton.iter_matches(text)) == _naive_matches(patterns, text)
+
+
+VENDOR_MAP = [
+    {"match": "Amazon Web Services", "category": "COGS"},
+    {"match_regex": "(?i)google ads|meta ads", "category": "Marketing"},
+    {"match": "Amazon", "category": "Office Supplies"},
+    {"match_regex": "[unclosed", "category": "Broken"},
+    {"match_regex": r"^(\w)\1", "category": "Doubled"},
+    {"match": "Staples", "match_regex": "stpl", "category": "Office Supplies"},
+    {"match_regex": r"\buber\b", "category": "Transportation"},
+]
+
+
+def test_vendor_matcher_keeps_first_match_priority():
+    """Earlier entries win, in both substring directions and for regexes."""
+    matcher = VendorMatcher(VENDOR_MAP)
+    assert matcher.match("AMAZON WEB SERVICES INC")["category"] == "COGS"
+    assert matcher.match("Amazon Mktp")["category"] == "Office Supplies"
+    assert matcher.match("amazon web")["category"] == "COGS"  # Vendor inside a match string
+    assert matcher.match("Google Ads / Amazon")["category"] == "Marketing"  # Regex entry comes first
+    assert matcher.match("aaron's")["category"] == "Doubled"  # Backreference still honoured
+    assert matcher.match("UBER *TRIP")["category"] == "Transportation"
+    assert matcher.match("Shell") is None
+    assert matcher.match("") is None
+
+
+def test_vendor_matcher_equals_linear_scan():
+    """Randomized vendor maps and names give the same entry as the original loop."""
+    rng = random.Random(11)
+    words = ["acme", "cloud", "office", "depot", "fuel", "ads", "bank", "fee", "co", "inc", "air"]
+    vendor_map = []
+    for i in range(400):
+        name = " ".join(rng.sample(words, rng.randint(1, 3)))
+        roll = rng.random()
+        if roll < 0.1:
+            vendor_map.append({"match_regex": rf"(?i)\b{name.split()[0]}\b.*{i % 7}", "category": f"R{i}"})
+        elif roll < 0.2:
+            vendor_map.append({"match_regex": "|".join(rng.sample(words, 2)), "category": f"A{i}"})
+        else:
+            vendor_map.append({"match": name.title(), "category": f"L{i}"})
+    matcher = VendorMatcher(vendor_map)
+
+    for _ in range(300):
+        vendor = " ".join(rng.sample(words, rng.randint(1, 4))) + rng.choice(["", " 3", " #5", " x", " café"])
+        vendor = vendor.upper() if rng.random() < 0.5 else vendor
+        assert matcher.match(vendor) is _naive_vendor_match(vendor_map, vendor), vendor
+
+
+def test_vendor_matches_are_memoized():
+    matcher = VendorMatcher(VENDOR_MAP)
+    matcher.match("Staples #123")
+    matcher.match("Staples #123")
+    assert matcher.match.cache_info().hits == 1
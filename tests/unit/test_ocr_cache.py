@@ -0,0 +1,61 @@
+"""Unit tests for the OCR result cache."""
+
+import os
+
+from itbl.ocr.base import OCRResult
+from itbl.ocr.cache import OCRCache
+
+
+def _result(text: str) -> OCRResult:
+    return OCRResult(
+        text=text,
+        confidence=0.91,
+        tokens=[{"text": text, "confidence": 0.91, "left": 1, "top": 2, "width": 3, "height": 4}],
+        layout={"mode": "tesseract"},
+    )
+
+
+def test_cache_round_trip(tmp_path):
+    """Cached results come back with text, confidence, tokens and layout intact."""
+    cache = OCRCache(tmp_path)
+    key = OCRCache.make_key("abc", {"binarize": True}, "tesseract --psm 6")
+
+    assert cache.get(key) is None
+    cache.put(key, _result("STAPLES"))
+
+    cached = cache.get(key)
+    assert cached.text == "STAPLES"
+    assert cached.confidence == 0.91
+    assert cached.tokens[0]["left"] == 1
+    assert cached.layout == {"mode": "tesseract"}
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_cache_key_depends_on_settings():
+    """Changing preprocessing or OCR settings changes the key."""
+    base = OCRCache.make_key("abc", {"binarize": True}, "tesseract --psm 6")
+    assert base == OCRCache.make_key("abc", {"binarize": True}, "tesseract --psm 6")
+    assert base != OCRCache.make_key("abd", {"binarize": True}, "tesseract --psm 6")
+    assert base != OCRCache.make_key("abc", {"binarize": False}, "tesseract --psm 6")
+    assert base != OCRCache.make_key("abc", {"binarize": True}, "tesseract --psm 3")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Eviction removes the oldest entries first once over the size limit."""
+    cache = OCRCache(tmp_path, max_bytes=10**9)
+    keys = [OCRCache.make_key(str(i), {}, "s") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, _result("x" * 200))
+        path = cache._entry_path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    # Touch the oldest entry so it becomes most recently used
+    assert cache.get(keys[0]) is not None
+
+    entry_size = cache._entry_path(keys[1]).stat().st_size
+    cache.max_bytes = int(entry_size * 2.5)
+    cache.evict()
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
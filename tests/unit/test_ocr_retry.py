@@ -0,0 +1,153 @@
+"""Unit tests for low-confidence OCR retry strategies."""
+
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from itbl.ocr.base import OCRBackend, OCRResult
+from itbl.ocr.retry import OCRRunner, predict_low_quality
+
+
+class FakeBackend(OCRBackend):
+    """Returns a fixed confidence per psm, optionally after a delay."""
+
+    def __init__(self, confidences, delays=None):
+        self.confidences = confidences
+        self.delays = delays or {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def extract(self, image, **kwargs):
+        psm = kwargs.get("psm", 6)
+        with self.lock:
+            self.calls.append(psm)
+        time.sleep(self.delays.get(psm, 0))
+        return OCRResult(f"psm {psm}", self.confidences[psm], layout={"mode": "fake"})
+
+    def get_confidence_per_token(self, result):
+        return []
+
+
+def _text_like_image():
+    """High-contrast, sharp stripes (looks like printed text to the predictor)."""
+    pixels = np.full((800, 800), 255, dtype=np.uint8)
+    pixels[::8, :] = 0
+    pixels[:, ::16] = 0
+    return Image.fromarray(pixels)
+
+
+def test_predict_low_quality():
+    """Flat, blurry or tiny images are predicted low quality; sharp text is not."""
+    assert predict_low_quality(Image.new("L", (800, 800), 200))
+    assert predict_low_quality(Image.new("L", (300, 200), 0))
+    assert not predict_low_quality(_text_like_image())
+
+
+def test_serial_skips_retry_when_confident():
+    """A confident first pass is used as-is."""
+    backend = FakeBackend({6: 0.9, 3: 0.95})
+    result = OCRRunner(backend, mode="serial").extract(_text_like_image())
+
+    assert backend.calls == [6]
+    assert result.text == "psm 6"
+    assert result.layout["retry_strategy"] == "single"
+
+
+def test_serial_retry_keeps_more_confident_result():
+    """Low confidence triggers the retry; the better result wins."""
+    backend = FakeBackend({6: 0.3, 3: 0.6})
+    result = OCRRunner(backend, mode="serial").extract(_text_like_image())
+
+    assert backend.calls == [6, 3]
+    assert result.text == "psm 3"
+    assert result.layout["retry_strategy"] == "serial-retry"
+
+
+def test_speculative_returns_first_result_over_threshold():
+    """The fast pass that clears the threshold wins without waiting for the slow one."""
+    backend = FakeBackend({6: 0.3, 3: 0.7}, delays={6: 1.0})
+    runner = OCRRunner(backend, mode="speculative")
+
+    start = time.perf_counter()
+    result = runner.extract(_text_like_image())
+    elapsed = time.perf_counter() - start
+    runner.close()
+
+    assert result.text == "psm 3"
+    assert result.layout["retry_strategy"] == "speculative"
+    assert elapsed < 0.9
+
+
+def test_speculative_falls_back_to_more_confident_result():
+    """When neither pass clears the threshold the more confident one is kept."""
+    backend = FakeBackend({6: 0.45, 3: 0.2})
+    runner = OCRRunner(backend, mode="speculative")
+    result = runner.extract(_text_like_image())
+    runner.close()
+
+    assert sorted(backend.calls) == [3, 6]
+    assert result.text == "psm 6"
+
+
+def test_auto_uses_speculative_only_for_predicted_low_quality():
+    """Auto mode picks the strategy from the source image statistics."""
+    backend = FakeBackend({6: 0.9, 3: 0.9})
+    runner = OCRRunner(backend, mode="auto")
+
+    sharp = runner.extract(_text_like_image())
+    blurry = runner.extract(_text_like_image(), source_image=Image.new("L", (800, 800), 128))
+    runner.close()
+
+    assert sharp.layout["retry_strategy"] == "single"
+    assert blurry.layout["retry_strategy"] == "speculative"
+
+
+class CancellableBackend(FakeBackend):
+    """FakeBackend whose slow passes stop as soon as their cancel event is set."""
+
+    supports_cancel = True
+
+    def __init__(self, confidences, delays=None):
+        super().__init__(confidences, delays)
+        self.cancelled = []
+
+    def extract(self, image, **kwargs):
+        psm = kwargs.get("psm", 6)
+        if kwargs["cancel"].wait(self.delays.get(psm, 0)):
+            with self.lock:
+                self.cancelled.append(psm)
+            raise RuntimeError("cancelled")
+        return OCRResult(f"psm {psm}", self.confidences[psm], layout={"mode": "fake"})
+
+
+def test_speculative_cancels_losing_pass():
+    """The losing pass is stopped once the other one clears the threshold."""
+    backend = CancellableBackend({6: 0.3, 3: 0.7}, delays={6: 5.0})
+    runner = OCRRunner(backend, mode="speculative")
+    result = runner.extract(_text_like_image())
+
+    deadline = time.perf_counter() + 2.0
+    while not backend.cancelled and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    runner.close()
+
+    assert result.text == "psm 3"
+    assert backend.cancelled == [6]
+
+
+def test_running_abandoned_pass_makes_next_image_serial():
+    """A backend that can't cancel never has more than one abandoned pass in flight."""
+    backend = FakeBackend({6: 0.3, 3: 0.7}, delays={6: 0.5})
+    runner = OCRRunner(backend, mode="speculative")
+
+    first = runner.extract(_text_like_image())
+    second = runner.extract(_text_like_image())
+    time.sleep(0.6)
+    third = runner.extract(_text_like_image())
+    runner.close()
+
+    assert first.layout["retry_strategy"] == "speculative"
+    assert second.layout["retry_strategy"] == "serial-retry"
+    assert third.layout["retry_strategy"] == "speculative"
@@ -0,0 +1,55 @@
+"""Unit tests for parallel batch processing."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from itbl import pipeline
+from itbl.normalize.dedupe import Deduplicator
+from itbl.ocr.base import OCRResult
+
+# OCR text per image name; the third image rescans the first
+OCR_TEXTS = {
+    "staples.png": "STAPLES\n01/15/2024\nPens and paper\nTOTAL $25.99",
+    "uber.png": "UBER TRIP\n02/03/2024\nTOTAL $18.50",
+    "staples_rescan.png": "STAPLES\n01/15/2024\nPens and paper\nTOTAL $25.99",
+    "blank.png": "",
+}
+
+
+def _stub_ocr(self, img_path):
+    return OCRResult(OCR_TEXTS[img_path.name], 0.9, [])
+
+
+def _run(workers):
+    """(image name, kept rows) per image, deduplicated like the CLI does."""
+    deduplicator = Deduplicator()
+    results = []
+    for img_path, rows in pipeline.process_images([Path(name) for name in OCR_TEXTS], workers=workers):
+        kept = [
+            # Row ids and timestamps differ per run; token tables compare as lists
+            {
+                key: list(value) if key == "_low_conf_tokens" else value
+                for key, value in row.items()
+                if key not in ("_row_id", "_created_at")
+            }
+            for row in rows
+            if not deduplicator.is_duplicate(row)
+        ]
+        results.append((img_path.name, kept))
+    return results
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers only inherit the stubbed OCR when forked",
+)
+def test_parallel_run_matches_serial_run(monkeypatch):
+    """workers=2 yields the same (path, rows) sequence as workers=1, duplicate dropped alike."""
+    monkeypatch.setattr(pipeline.ImagePipeline, "_run_ocr", _stub_ocr)
+
+    serial = _run(workers=1)
+    assert [name for name, _ in serial] == list(OCR_TEXTS)
+    assert [len(rows) for _, rows in serial] == [1, 1, 0, 1]  # The rescan is the dropped duplicate
+    assert _run(workers=2) == serial
@@ -0,0 +1,93 @@
+"""Unit tests for the born-digital PDF text-layer fast path."""
+
+import pytest
+
+pytest.importorskip("pypdfium2")
+
+from itbl import pipeline
+from itbl.ingest.loader import PDFPage
+from itbl.ingest.pdf_text import extract_pdf_text_layer
+from itbl.ocr.base import OCRBackend
+
+
+def _write_text_pdf(path, pages):
+    """Minimal PDF drawing (x, y, text) Helvetica lines on letter-size pages."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        ops = " ".join(f"BT /F1 12 Tf {x} {y} Td ({text}) Tj ET" for x, y, text in lines)
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+    return path
+
+
+RECEIPT_PAGE = [
+    (72, 720, "STAPLES INC  Store 42"),
+    (72, 704, "Date: 01/15/2024"),
+    (72, 650, "Total: $25.99"),
+]
+
+
+def test_text_layer_builds_tokens_in_pixel_space(tmp_path):
+    """Words, lines and paragraphs come from the text layer with boxes at the OCR DPI."""
+    path = _write_text_pdf(tmp_path / "receipt.pdf", [RECEIPT_PAGE])
+
+    result = extract_pdf_text_layer(path, 1, dpi=300)
+
+    assert result.text == "STAPLES INC Store 42\nDate: 01/15/2024\n\nTotal: $25.99"
+    assert result.confidence == 1.0
+    assert result.layout["mode"] == "pdf-text"
+    first = result.token_table[0]
+    assert first["text"] == "STAPLES" and first["confidence"] == 1.0
+    assert abs(first["left"] - 72 * 300 / 72) < 5
+    assert first["top"] < (792 - 720) * 300 / 72  # Top-left origin, above the baseline
+    assert result.token_table.word[:4] == [1, 2, 3, 4]
+    assert len(result.token_table.low_confidence()) == 0
+
+
+def test_page_without_text_layer_returns_none(tmp_path):
+    """Empty/scanned pages fall back to OCR."""
+    path = _write_text_pdf(tmp_path / "mixed.pdf", [RECEIPT_PAGE, []])
+    assert extract_pdf_text_layer(path, 2) is None
+
+
+def test_pipeline_skips_ocr_for_text_layer_pages(tmp_path, monkeypatch):
+    """Text-layer pages never reach preprocessing or the OCR backend."""
+
+    class FailingBackend(OCRBackend):
+        def extract(self, image, **kwargs):
+            raise AssertionError("OCR should not run for text-layer pages")
+
+        def get_confidence_per_token(self, result):
+            return []
+
+    monkeypatch.setitem(pipeline.OCR_ENGINES, "tesseract", FailingBackend)
+    monkeypatch.setattr(pipeline, "preprocess_image", FailingBackend().extract)
+    path = _write_text_pdf(tmp_path / "receipt.pdf", [RECEIPT_PAGE])
+
+    rows = pipeline.ImagePipeline()._process(PDFPage(path, 1, 1))
+
+    assert len(rows) == 1
+    assert rows[0]["_ingest_path"] == "pdf-text"
+    assert rows[0]["_source_file"].endswith("receipt.pdf#page=1")
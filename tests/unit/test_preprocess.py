@@ -0,0 +1,83 @@
+"""Unit tests for image preprocessing profiles."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from itbl.ingest.preprocess import (
+    CV2_AVAILABLE,
+    PREPROCESS_PROFILES,
+    _deskew_image,
+    _estimate_skew_angle,
+    get_preprocess_options,
+    preprocess_image,
+)
+
+pytestmark = pytest.mark.skipif(not CV2_AVAILABLE, reason="OpenCV not installed")
+
+
+def _page(width=3000, height=2000):
+    """White page with a few dark text-like bars and some noise."""
+    rng = np.random.default_rng(0)
+    pixels = np.full((height, width), 235, dtype=np.int16)
+    for row in range(200, height - 200, 150):
+        pixels[row:row + 30, 200:width - 200] = 20
+    pixels += rng.integers(-15, 15, size=pixels.shape, dtype=np.int16)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+@pytest.mark.parametrize("profile", ["fast", "balanced"])
+def test_fast_profiles_downscale_long_side(profile):
+    """Fast profiles cap the longer side before filtering."""
+    options = {**get_preprocess_options(profile), "binarize": True}
+    result = preprocess_image(_page(), **options)
+
+    assert max(result.size) == PREPROCESS_PROFILES[profile]["max_side"]
+    assert result.size == (2400, 1600)
+
+
+def test_downscale_never_enlarges():
+    """Images already under max_side keep their size."""
+    result = preprocess_image(_page(800, 600), deskew=False, denoise=False, max_side=2400)
+    assert result.size == (800, 600)
+
+
+def test_denoise_methods_keep_text_dark():
+    """Cheap filters still leave text bars dark and the page light after binarization."""
+    for method in ["bilateral", "median"]:
+        result = np.asarray(
+            preprocess_image(_page(1200, 800), deskew=False, binarize=True, denoise_method=method)
+        )
+        assert result[215, 600] < 128
+        assert result[100, 600] > 128
+
+
+def test_unknown_profile_rejected():
+    """Profile names are validated."""
+    with pytest.raises(ValueError):
+        get_preprocess_options("ultra")
+
+
+def _rotated_page(angle, width=4000, height=3000):
+    """Text-line page rotated counterclockwise by angle degrees."""
+    import cv2
+
+    pixels = np.full((height, width), 255, dtype=np.uint8)
+    for row in range(300, height - 300, 90):
+        pixels[row:row + 30, 400:width - 400] = 0
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(pixels, matrix, (width, height), borderValue=255)
+
+
+@pytest.mark.parametrize("angle", [0.0, 1.5, -3.0, 7.0])
+def test_skew_estimate_on_pyramid_matches_rotation(angle):
+    """Estimating on the reduced level recovers the correcting angle within tolerance."""
+    estimate = _estimate_skew_angle(_rotated_page(angle))
+    assert estimate is not None
+    assert abs(estimate + angle) < 0.3
+
+
+def test_deskew_keeps_full_resolution():
+    """Rotation is applied to the full-resolution image."""
+    page = _rotated_page(4.0)
+    assert _deskew_image(page).shape == page.shape
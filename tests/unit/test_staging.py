@@ -0,0 +1,118 @@
+"""Unit tests for reading staged output back for upload."""
+
+import pytest
+
+from itbl.output.csv_writer import CSVWriter
+from itbl.output.staging import (
+    StagedSource,
+    UploadCheckpoint,
+    find_numeric_columns,
+    find_staged_sources,
+    iter_chunks,
+    parse_triage,
+)
+
+
+def _row(vendor, amount, flags=None, highlight=None):
+    return {
+        "_flags": flags or [],
+        "_highlight_cells": highlight or [],
+        "_ocr_confidence": 0.42,
+        "Date": "2024-01-15",
+        "Vendor": vendor,
+        "Amount": amount,
+        "Check #": "0042",
+    }
+
+
+ROWS = [_row("STAPLES", 25.99), _row("AMAZON", 10, flags=["low_ocr_confidence"], highlight=["Amount"])]
+
+
+def test_parse_triage():
+    """Flags and highlight markers are split apart."""
+    assert parse_triage("low_conf:amount; duplicate; highlight:Amount; highlight:Date") == (
+        ["low_conf:amount", "duplicate"], ["Amount", "Date"]
+    )
+    assert parse_triage("") == ([], [])
+
+
+def test_csv_staging_round_trip(tmp_path):
+    """CSV rows come back with categories, review info and numeric amounts."""
+    CSVWriter(annotate_inline=True).write(ROWS, tmp_path, "Office Supplies")
+    (tmp_path / "report.md").write_text("# report")
+
+    sources = find_staged_sources(tmp_path, tabs={"Office Supplies": ["Date", "Vendor", "Amount"]})
+    assert [(s.key, s.category) for s in sources] == [("Office_Supplies.csv", "Office Supplies")]
+
+    rows = list(sources[0].iter_rows())
+    assert [r["Vendor"] for r in rows] == ["STAPLES", "AMAZON"]
+    assert rows[0]["Amount"] == 25.99 and rows[1]["Amount"] == 10  # Inline annotation stripped
+    assert rows[1]["Check #"] == "0042"  # Leading zeros keep it text
+    assert rows[1]["_flags"] == ["low_ocr_confidence"]
+    assert rows[1]["_highlight_cells"] == ["Amount"]
+    assert rows[0]["_category"] == "Office Supplies"
+
+
+def test_csv_staging_converts_only_amount_columns(tmp_path):
+    """Numbers in text columns stay as written; amount columns become numbers."""
+    row = dict(ROWS[0], Vendor="7", Amount=1.5, **{"Item/Description": "1.50", "Invoice #": "2024"})
+    CSVWriter().write([row], tmp_path, "Office Supplies")
+
+    staged = next(find_staged_sources(tmp_path)[0].iter_rows())
+    text = (staged["Vendor"], staged["Item/Description"], staged["Invoice #"])
+    assert text == ("7", "1.50", "2024")
+    assert staged["Amount"] == 1.5
+
+
+def test_numeric_columns_come_from_sheets_tabs():
+    """Amount-type columns are found by name in every configured tab."""
+    tabs = {
+        "Transportation": ["Date", "From", "Miles", "Rate/Mile", "Amount"],
+        "Phone & Internet": ["Service Type", "Monthly Cost", "Business %", "Deductible Amount"],
+        "Custom": ["Vendor", "Total", "Amounts Note", "Costco Ref"],
+    }
+    assert find_numeric_columns(tabs) == {
+        "Miles", "Rate/Mile", "Amount", "Monthly Cost", "Deductible Amount", "Total",
+    }
+
+
+def test_xlsx_staging_round_trip(tmp_path):
+    """Every sheet is a source; highlights and comments become review info."""
+    pytest.importorskip("openpyxl")
+    from itbl.output.xlsx_writer import XLSXWriter
+
+    writer = XLSXWriter()
+    writer.write(ROWS, tmp_path / "ledger.xlsx", "Office Supplies", apply_highlights=True)
+    writer.write(ROWS[:1], tmp_path / "ledger.xlsx", "Travel", apply_highlights=True)
+    writer.close()
+
+    sources = find_staged_sources(tmp_path)
+    assert [s.key for s in sources] == ["ledger.xlsx#Office Supplies", "ledger.xlsx#Travel"]
+
+    rows = list(sources[0].iter_rows())
+    assert rows[1]["_highlight_cells"] == ["Amount"]
+    assert rows[1]["_flags"] == ["low_ocr_confidence"]
+    assert rows[1]["_ocr_confidence"] == 0.42
+    assert rows[0]["_highlight_cells"] == [] and rows[0]["Amount"] == 25.99
+    assert [r["Vendor"] for r in sources[1].iter_rows()] == ["STAPLES"]
+
+
+def test_iter_chunks_skips_uploaded_rows():
+    """Chunks start after the checkpointed row count."""
+    chunks = list(iter_chunks(iter(range(7)), 3, skip=2))
+    assert chunks == [[2, 3, 4], [5, 6]]
+
+
+def test_checkpoint_resumes_per_source_and_sheet(tmp_path):
+    """Progress survives a reload, but not a different sheet or a changed file."""
+    staged = tmp_path / "Office_Supplies.csv"
+    staged.write_text("Vendor\nA\nB\n")
+    source = StagedSource(staged, "Office Supplies")
+    path = tmp_path / "checkpoint.json"
+
+    UploadCheckpoint(path, "sheet-1").record(source, 2)
+    assert UploadCheckpoint(path, "sheet-1").rows_done(source) == 2
+    assert UploadCheckpoint(path, "sheet-2").rows_done(source) == 0
+
+    staged.write_text("Vendor\nA\nB\nC\n")
+    assert UploadCheckpoint(path, "sheet-1").rows_done(source) == 0
@@ -0,0 +1,144 @@
+"""Unit tests for the bank statement extractor."""
+
+import random
+import time
+from pathlib import Path
+
+from itbl import pipeline
+from itbl.normalize.dedupe import Deduplicator
+from itbl.ocr.base import OCRResult
+from itbl.parse.categories.bank_statements import (
+    _iter_transactions,
+    extract_statement_fields,
+    iter_statement_transactions,
+)
+
+
+def test_dated_row_takes_first_amount_of_its_line():
+    text = "ACCOUNT STATEMENT\n01/15/2024 STAPLES 0042  -$1,169.21  2,450.00\nBalance: $2,450.00"
+    fields = extract_statement_fields(text)
+    assert (fields["date"], fields["description"], fields["amount"]) == ("2024-01-15", "STAPLES 0042", -1169.21)
+    assert (fields["transaction_type"], fields["balance"]) == ("debit", 2450.00)
+
+
+def test_undated_rows_drop_store_numbers_and_locations():
+    text = "\n".join([
+        "THE HOME DEPOT #2676 LEOMINSTER MA $115.81",
+        "KFC #331430 $5.55",
+        "UBER *TRIP BOSTON MA $12.00",
+        "LUNENBURG MA $9.00",  # A location, not a vendor
+    ])
+    rows = [(tx["description"], tx["amount"]) for tx in _iter_transactions(text)]
+    assert rows == [("THE HOME DEPOT", 115.81), ("KFC", 5.55), ("UBER *TRIP", 12.00)]
+
+
+def test_rows_do_not_span_lines():
+    text = "Date: 12/12/2025\nPens 252.26\n01/02/2024\n$4.00"
+    assert list(_iter_transactions(text)) == []
+
+
+def test_pathological_statements_parse_in_linear_time():
+    """Inputs that made the old transaction regexes backtrack for minutes."""
+    cases = [
+        "\n".join("01/02/2024 " + "WORD " * 40 for _ in range(1000)),
+        "A" + " B" * 50000 + " $1.00",
+        "ACME STORE " * 20000 + "$",
+        " ".join(["$1.00"] * 20000),
+        "1" * 100000 + " $1.00",
+    ]
+    for text in cases:
+        start = time.perf_counter()
+        extract_statement_fields(text)
+        assert time.perf_counter() - start < 1.0, text[:40]
+
+
+def test_random_rows_keep_row_invariants():
+    rng = random.Random(11)
+    pieces = ["01/02/2024", "12-31-24", "ACME", "HOME DEPOT", "#2676", "MA", "BOSTON", "$", "$4.50",
+              "1,234.56", "-$12.00", "+3.10", "*", "'", ".", ",", "7", " ", " ", "\n", "\t", "~"]
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+        for tx in _iter_transactions(text):
+            assert tx["description"] and "\n" not in tx["description"], repr(text)
+            if tx["date"] is None:
+                assert 3 <= len(tx["description"]) <= 80 and tx["amount"] > 0, repr(text)
+        fields = extract_statement_fields(text)
+        assert fields["amount"] is None or fields["description"], repr(text)
+
+
+def test_statement_transactions_are_yielded_in_order():
+    text = "\n".join([
+        "Statement date 02/01/2024",
+        "01/05/2024 DEPOSIT PAYROLL +1,200.00",
+        "THE HOME DEPOT #2676 LEOMINSTER MA $115.81",
+        "1-9-24 ATM WITHDRAWAL 60.00",
+    ])
+    transactions = iter_statement_transactions(text)
+    assert not isinstance(transactions, list)
+    assert list(transactions) == [
+        {"date": "2024-01-05", "description": "DEPOSIT PAYROLL", "amount": 1200.00, "transaction_type": "credit"},
+        {"date": "2024-02-01", "description": "THE HOME DEPOT", "amount": 115.81, "transaction_type": None},
+        {"date": "2024-01-09", "description": "ATM WITHDRAWAL", "amount": -60.00, "transaction_type": "debit"},
+    ]
+
+
+def test_summary_block_rows_are_not_transactions():
+    text = "\n".join([
+        "CREDIT CARD STATEMENT",
+        "PREVIOUS BALANCE $1,020.00",
+        "NEW BALANCE $1,234.56",
+        "MINIMUM PAYMENT DUE $35.00",
+        "Payment Due Date 02/25/2024",
+        "CREDIT LIMIT $5,000.00",
+        "AVAILABLE CREDIT $3,765.44",
+        "FEES CHARGED $0.00",
+        "INTEREST CHARGED $12.34",
+        "01/31/2024 NEW BALANCE 1,234.56",
+        "01/05/2024 PAYMENT - THANK YOU -500.00",
+        "THE HOME DEPOT #2676 LEOMINSTER MA $115.81",
+    ])
+    rows = [(tx["description"], tx["amount"]) for tx in iter_statement_transactions(text)]
+    assert rows == [("PAYMENT - THANK YOU", -500.00), ("THE HOME DEPOT", 115.81)]
+    assert extract_statement_fields(text)["description"] == "PAYMENT - THANK YOU"
+
+
+def _split_rows(monkeypatch, text):
+    image_pipeline = pipeline.ImagePipeline(split_statements=True)
+    monkeypatch.setattr(image_pipeline, "_run_ocr", lambda img_path: OCRResult(text, 0.9, []))
+    return image_pipeline, list(image_pipeline.iter_rows(Path("statement.png")))
+
+
+def test_checking_account_statement_is_split(monkeypatch):
+    """"CHECKING" contains the check keyword; without a check face the statement is still split."""
+    text = "\n".join([
+        "CHECKING ACCOUNT STATEMENT",
+        "01/02/2024 STAPLES 0042 -$4.50",
+        "01/03/2024 CHECK 1042 -$120.00",
+    ])
+    _, rows = _split_rows(monkeypatch, text)
+    assert [(row["Date"], row["Amount"]) for row in rows] == [("2024-01-02", -4.50), ("2024-01-03", -120.00)]
+
+    check = "PAY TO THE ORDER OF ACME SUPPLY $120.00\nONE HUNDRED TWENTY DOLLARS\nChecking account 1042"
+    _, rows = _split_rows(monkeypatch, check)
+    assert len(rows) == 1
+
+
+def test_split_statement_rows_survive_dedupe(monkeypatch):
+    """Repeated transactions on a statement are separate rows; rescanning the statement adds none."""
+    text = "ACCOUNT STATEMENT\n" + "\n".join(
+        f"01/{day:02d}/2024 STAPLES 0042 $4.50" for day in (2, 2, 3)
+    ) + "\nBalance: $955.50"
+    image_pipeline = pipeline.ImagePipeline(split_statements=True)
+    monkeypatch.setattr(image_pipeline, "_run_ocr", lambda img_path: OCRResult(text, 0.9, []))
+
+    rows = image_pipeline.iter_rows(Path("statement.png"))
+    assert not isinstance(rows, list)
+    rows = list(rows)
+    assert [(row["Date"], row["Amount"], row["_occurrence"]) for row in rows] == [
+        ("2024-01-02", 4.50, 0), ("2024-01-02", 4.50, 1), ("2024-01-03", 4.50, 0),
+    ]
+
+    deduplicator = Deduplicator()
+    assert [deduplicator.is_duplicate(row) for row in rows] == [False, False, False]
+    rescan = image_pipeline.process(Path("statement.png"))
+    assert [deduplicator.is_duplicate(row) for row in rescan] == [True, True, True]
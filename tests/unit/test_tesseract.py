@@ -0,0 +1,168 @@
+"""Unit tests for Tesseract output handling (no Tesseract binary required)."""
+
+import sys
+import threading
+import time
+
+import pytest
+import pytesseract
+from PIL import Image
+
+from itbl.ocr.base import OCRResult, TokenTable
+from itbl.ocr.tesseract import (
+    TesseractBackend,
+    mean_confidence_from_tsv_data,
+    parse_tsv_text,
+    text_from_tsv_data,
+    token_table_from_tsv_data,
+)
+
+
+def _tsv_data(rows):
+    """Build image_to_data-style column dict from (level, block, par, line, word, conf, text) rows."""
+    columns = ["level", "block_num", "par_num", "line_num", "word_num", "conf", "text"]
+    data = {col: [] for col in columns + ["left", "top", "width", "height"]}
+    for i, row in enumerate(rows):
+        for col, value in zip(columns, row):
+            data[col].append(value)
+        data["left"].append(10 * i)
+        data["top"].append(5 * row[3])
+        data["width"].append(8)
+        data["height"].append(4)
+    return data
+
+
+SAMPLE = _tsv_data([
+    (1, 0, 0, 0, 0, -1, ""),
+    (2, 1, 0, 0, 0, -1, ""),
+    (3, 1, 1, 0, 0, -1, ""),
+    (4, 1, 1, 1, 0, -1, ""),
+    (5, 1, 1, 1, 1, 96, "STAPLES"),
+    (5, 1, 1, 1, 2, 91, "INC"),
+    (4, 1, 1, 2, 0, -1, ""),
+    (5, 1, 1, 2, 1, 88, "Total"),
+    (5, 1, 1, 2, 2, 45, "$"),
+    (5, 1, 1, 2, 3, 90, "5.00"),
+    (2, 2, 0, 0, 0, -1, ""),
+    (3, 2, 1, 0, 0, -1, ""),
+    (4, 2, 1, 1, 0, -1, ""),
+    (5, 2, 1, 1, 1, 70, "$"),
+    (5, 2, 1, 1, 2, 95, " "),
+])
+
+
+def test_text_from_tsv_data_rebuilds_lines_and_blocks():
+    """Words join with spaces, lines with newlines, blocks with a blank line."""
+    assert text_from_tsv_data(SAMPLE) == "STAPLES INC\nTotal $ 5.00\n\n$"
+
+
+def test_text_from_tsv_data_empty():
+    """No word rows means empty text."""
+    assert text_from_tsv_data(_tsv_data([(1, 0, 0, 0, 0, -1, "")])) == ""
+
+
+def test_token_table_uses_each_words_own_box():
+    """Repeated words keep their own bounding boxes and layout positions."""
+    table = token_table_from_tsv_data(SAMPLE)
+
+    assert table.text == ["STAPLES", "INC", "Total", "$", "5.00", "$"]
+    dollar_rows = [i for i, text in enumerate(table.text) if text == "$"]
+    assert [table.left[i] for i in dollar_rows] == [80, 130]
+    assert [table.block[i] for i in dollar_rows] == [1, 2]
+    assert table.line[2:5] == [2, 2, 2]
+    assert table.word[2:5] == [1, 2, 3]
+    assert table.confidence[0] == 0.96
+
+
+def test_token_table_low_confidence_and_dict_views():
+    """Low-confidence filtering keeps columns aligned; dict views match columns."""
+    table = token_table_from_tsv_data(SAMPLE)
+    low = table.low_confidence(0.80)
+
+    assert len(low) == 2
+    assert low.text == ["$", "$"]
+    assert low.confidence == [0.45, 0.70]
+    assert low[1]["left"] == 130
+    assert list(TokenTable.from_dicts(list(table))[0].values())[0] == "STAPLES"
+
+
+def test_mean_confidence_skips_layout_rows():
+    """Block/paragraph/line rows (conf -1) don't drag the average down."""
+    confs = [96, 91, 88, 45, 90, 70, 95]
+    assert abs(mean_confidence_from_tsv_data(SAMPLE) - sum(confs) / len(confs) / 100) < 1e-9
+
+
+def test_ocr_result_round_trip_keeps_token_columns():
+    """OCRResult serializes tokens as columns and accepts legacy token dicts."""
+    result = OCRResult("x", 0.9, tokens=token_table_from_tsv_data(SAMPLE))
+    restored = OCRResult.from_dict(result.to_dict())
+    assert restored.token_table.to_dict() == result.token_table.to_dict()
+
+    legacy = OCRResult("x", 0.9, tokens=[{"text": "A", "confidence": 0.5}])
+    assert legacy.tokens[0]["text"] == "A"
+    assert len(legacy.token_table.low_confidence()) == 1
+
+
+def test_parse_tsv_text_matches_image_to_data_columns():
+    """Header-less C API TSV parses into the same columns image_to_data returns."""
+    tsv = (
+        "1\t1\t0\t0\t0\t0\t0\t0\t640\t480\t-1\t\n"
+        "4\t1\t1\t1\t1\t0\t10\t20\t200\t30\t-1\t\n"
+        "5\t1\t1\t1\t1\t1\t10\t20\t90\t30\t95.812\tSTAPLES\n"
+        "5\t1\t1\t1\t1\t2\t110\t20\t40\t30\t60.5\t$5.00\n"
+    )
+    data = parse_tsv_text(tsv)
+
+    assert data["text"] == ["", "", "STAPLES", "$5.00"]
+    assert data["left"] == [0, 10, 10, 110]
+    table = token_table_from_tsv_data(data)
+    assert table.text == ["STAPLES", "$5.00"]
+    assert table.to_text() == "STAPLES $5.00"
+    assert abs(table.confidence[0] - 0.95812) < 1e-9
+
+
+def _fake_tesseract(tmp_path, monkeypatch, body):
+    """Stand-in tesseract executable (`tesseract IMAGE OUTPUT_BASE ...`) running a shell body."""
+    if sys.platform == "win32":
+        pytest.skip("needs a shell script as the tesseract executable")
+    script = tmp_path / "tesseract"
+    script.write_text("#!/bin/sh\n" + body + "\n")
+    script.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(script))
+    return TesseractBackend(tesseract_cmd=str(script))
+
+
+def test_cancellable_pass_reads_tesseract_tsv(tmp_path, monkeypatch):
+    """With a cancel event the backend runs tesseract itself and parses the same TSV."""
+    header = "\t".join(["level", "page_num", "block_num", "par_num", "line_num", "word_num",
+                        "left", "top", "width", "height", "conf", "text"])
+    backend = _fake_tesseract(tmp_path, monkeypatch, (
+        f"echo \"$@\" > {tmp_path}/args\n"
+        f"printf '{header}\\n5\\t1\\t1\\t1\\t1\\t1\\t10\\t20\\t90\\t30\\t90\\tSTAPLES\\n' > \"$2.tsv\""
+    ))
+    result = backend.extract(Image.new("LA", (40, 20), (255, 0)), cancel=threading.Event())
+
+    assert (result.text, result.confidence) == ("STAPLES", 0.9)
+    image_path, output_base, *options = (tmp_path / "args").read_text().split()
+    assert image_path.endswith(".png") and not output_base.endswith(".tsv")
+    assert options == ["-c", "tessedit_create_tsv=1"] + backend._build_config().split()
+
+
+def test_tesseract_failure_raises_its_errors(tmp_path, monkeypatch):
+    """A non-zero exit raises TesseractError with tesseract's stderr."""
+    backend = _fake_tesseract(tmp_path, monkeypatch, "echo 'Error opening data file' >&2\nexit 1")
+
+    with pytest.raises(pytesseract.TesseractError, match="Error opening data file"):
+        backend.extract(Image.new("L", (40, 20), 255), cancel=threading.Event())
+
+
+def test_cancel_kills_tesseract_process(tmp_path, monkeypatch):
+    """Setting the cancel event stops a running tesseract pass."""
+    backend = _fake_tesseract(tmp_path, monkeypatch, "exec sleep 30")
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        backend.extract(Image.new("L", (40, 20), 255), cancel=cancel)
+    assert time.perf_counter() - start < 5.0
@@ -0,0 +1,179 @@
+"""Unit tests for the in-process Tesseract backend against a stubbed libtesseract."""
+
+import ctypes
+import threading
+
+import pytest
+from PIL import Image
+
+from itbl.ocr import tesseract_api
+from itbl.ocr.tesseract_api import TesseractAPIBackend
+
+TSV = "5\t1\t1\t1\t1\t1\t10\t20\t90\t30\t90\tSTAPLES\n"
+
+
+class StubFunction:
+    """C function stand-in: callable, with assignable restype/argtypes."""
+
+    def __init__(self, impl):
+        self.impl = impl
+
+    def __call__(self, *args):
+        return self.impl(*args)
+
+
+class StubLibrary:
+    """Records TessBaseAPI calls; handles are ints, returned strings are real C buffers."""
+
+    def __init__(self, monitor=True, failing_langs=()):
+        self.calls = []
+        self.failing_langs = set(failing_langs)
+        self.next_handle = 0
+        self.buffers = {}
+        self.cancel_funcs = {}
+        names = [
+            "TessVersion", "TessBaseAPICreate", "TessBaseAPIDelete", "TessBaseAPIEnd",
+            "TessBaseAPIInit2", "TessBaseAPISetPageSegMode", "TessBaseAPISetImage",
+            "TessBaseAPISetSourceResolution", "TessBaseAPIRecognize", "TessBaseAPIGetUTF8Text",
+            "TessBaseAPIGetTsvText", "TessDeleteText", "TessBaseAPIClear",
+        ]
+        if monitor:
+            names += ["TessMonitorCreate", "TessMonitorDelete", "TessMonitorSetCancelFunc"]
+        for name in names:
+            setattr(self, name, StubFunction(getattr(self, "_" + name)))
+
+    def handles(self, name):
+        return [args[0] for call, args in self.calls if call == name]
+
+    def _record(self, name, *args):
+        self.calls.append((name, args))
+
+    def _string(self, text):
+        buffer = ctypes.create_string_buffer(text.encode("utf-8"))
+        self.buffers[ctypes.addressof(buffer)] = buffer
+        return ctypes.addressof(buffer)
+
+    def _TessVersion(self):
+        return b"5.3.0"
+
+    def _TessBaseAPICreate(self):
+        self.next_handle += 1
+        self._record("Create", self.next_handle)
+        return self.next_handle
+
+    def _TessBaseAPIDelete(self, handle):
+        self._record("Delete", handle)
+
+    def _TessBaseAPIEnd(self, handle):
+        self._record("End", handle)
+
+    def _TessBaseAPIInit2(self, handle, datapath, lang, oem):
+        self._record("Init2", handle, lang)
+        return -1 if lang.decode() in self.failing_langs else 0
+
+    def _TessBaseAPISetPageSegMode(self, handle, psm):
+        self._record("SetPageSegMode", handle, psm)
+
+    def _TessBaseAPISetImage(self, handle, buffer, width, height, bytes_per_pixel, bytes_per_line):
+        self._record("SetImage", handle, width, height)
+
+    def _TessBaseAPISetSourceResolution(self, handle, dpi):
+        pass
+
+    def _TessBaseAPIRecognize(self, handle, monitor):
+        self._record("Recognize", handle, monitor)
+        if monitor is not None and self.cancel_funcs[monitor](None, 0):
+            return -1
+        return 0
+
+    def _TessBaseAPIGetUTF8Text(self, handle):
+        return self._string("STAPLES\n")
+
+    def _TessBaseAPIGetTsvText(self, handle, page):
+        return self._string(TSV)
+
+    def _TessDeleteText(self, pointer):
+        del self.buffers[pointer]
+
+    def _TessBaseAPIClear(self, handle):
+        self._record("Clear", handle)
+
+    def _TessMonitorCreate(self):
+        monitor = 1000 + len(self.cancel_funcs)
+        self.cancel_funcs[monitor] = None
+        return monitor
+
+    def _TessMonitorDelete(self, monitor):
+        self._record("MonitorDelete", monitor)
+
+    def _TessMonitorSetCancelFunc(self, monitor, cancel_func):
+        self.cancel_funcs[monitor] = cancel_func
+
+
+def _backend(monkeypatch, lib):
+    monkeypatch.setattr(tesseract_api.ctypes, "CDLL", lambda path: lib)
+    return TesseractAPIBackend(library_path="libtesseract-stub.so")
+
+
+def _image():
+    return Image.new("L", (40, 20), 255)
+
+
+def test_engines_are_reused_per_thread_and_closed(monkeypatch):
+    """Each thread inits one engine and reuses it; close() ends and deletes every handle."""
+    lib = StubLibrary()
+    backend = _backend(monkeypatch, lib)
+
+    first = backend.extract(_image())
+    backend.extract(_image(), psm=3)
+    thread = threading.Thread(target=backend.extract, args=(_image(),))
+    thread.start()
+    thread.join()
+
+    assert (first.text, first.confidence, first.token_table.text) == ("STAPLES", 0.9, ["STAPLES"])
+    assert lib.handles("Create") == [1, 2]
+    assert lib.handles("Recognize") == [1, 1, 2]
+    assert lib.handles("Clear") == [1, 1, 2]  # Image and results dropped after every pass
+    assert not lib.buffers  # Every returned string freed with TessDeleteText
+
+    backend.close()
+    assert sorted(lib.handles("End")) == [1, 2] and sorted(lib.handles("Delete")) == [1, 2]
+    backend.extract(_image())
+    assert lib.handles("Create") == [1, 2, 3]  # A closed backend starts fresh engines
+
+
+def test_failed_init_deletes_handle_and_is_retried(monkeypatch):
+    """A failed TessBaseAPIInit2 raises, frees the handle and caches no broken engine."""
+    lib = StubLibrary(failing_langs={"deu"})
+    backend = _backend(monkeypatch, lib)
+
+    with pytest.raises(RuntimeError, match="language 'deu'"):
+        backend.extract(_image(), lang="deu")
+    assert lib.handles("Delete") == [1] and lib.handles("End") == []
+
+    lib.failing_langs.clear()
+    assert backend.extract(_image(), lang="deu").text == "STAPLES"
+    assert lib.handles("Init2") == [1, 2]
+    backend.close()
+    assert lib.handles("End") == [2]  # The failed handle is not released twice
+
+
+def test_cancel_uses_monitor_or_falls_back_without_it(monkeypatch):
+    """With the monitor API a set cancel event stops recognition; without it cancel is ignored."""
+    lib = StubLibrary()
+    backend = _backend(monkeypatch, lib)
+    assert backend.supports_cancel
+
+    assert backend.extract(_image(), cancel=threading.Event()).text == "STAPLES"
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        backend.extract(_image(), cancel=cancel)
+    assert len(lib.handles("MonitorDelete")) == 2
+    assert lib.handles("Clear") == [1, 1]
+
+    old_lib = StubLibrary(monitor=False)
+    old_backend = _backend(monkeypatch, old_lib)
+    assert not old_backend.supports_cancel
+    assert old_backend.extract(_image(), cancel=cancel).text == "STAPLES"
+    assert [args[1] for call, args in old_lib.calls if call == "Recognize"] == [None]
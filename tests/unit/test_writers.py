@@ -0,0 +1,200 @@
+"""Unit tests for output writers, streaming sinks and the report accumulator."""
+
+import csv
+
+import pytest
+
+from itbl.output.csv_writer import CSVWriter
+from itbl.output.writer_base import BufferedSink, WriterBase
+from itbl.review.report import ReportAccumulator, generate_report
+
+
+def _row(vendor, amount, flags=None, highlight=None, category="Office Supplies"):
+    return {
+        "_row_id": vendor,
+        "_category": category,
+        "_flags": flags or [],
+        "_highlight_cells": highlight or [],
+        "Date": "2024-01-15",
+        "Vendor": vendor,
+        "Amount": amount,
+    }
+
+
+ROWS = [
+    _row("STAPLES", 25.99),
+    _row("AMAZON", 10.0, flags=["low_ocr_confidence"], highlight=["Amount"]),
+    _row("UBER", 18.5, category="Transportation"),
+]
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_sink_appends_rows_as_they_arrive(tmp_path):
+    """Each appended row is on disk before the sink is closed."""
+    sink = CSVWriter().open_sink(tmp_path, "Office Supplies")
+
+    sink.append(ROWS[0])
+    assert [r["Vendor"] for r in _read_csv(tmp_path / "Office_Supplies.csv")] == ["STAPLES"]
+
+    sink.append(ROWS[1])
+    sink.close()
+    rows = _read_csv(tmp_path / "Office_Supplies.csv")
+    assert [r["Vendor"] for r in rows] == ["STAPLES", "AMAZON"]
+    assert rows[1]["_triage"] == "low_ocr_confidence; highlight:Amount"
+    assert rows[0]["_triage"] == ""
+    assert sink.rows_written == 2
+
+
+def test_csv_sinks_reject_two_categories_in_one_file(tmp_path):
+    """A single-file --out can't take a second category's rows (the file would be clobbered)."""
+    output_file = tmp_path / "ledger.csv"
+    writer = CSVWriter()
+    sink = writer.open_sink(output_file, "Office Supplies")
+    sink.append(ROWS[0])
+
+    with pytest.raises(ValueError, match="use a directory"):
+        writer.open_sink(output_file, "Travel")
+    sink.append(ROWS[1])
+    sink.close()
+
+    assert [r["Vendor"] for r in _read_csv(output_file)] == ["STAPLES", "AMAZON"]
+
+
+def test_parse_rejects_csv_file_out_before_processing(tmp_path, monkeypatch):
+    """Stream and batch CSV runs refuse a single-file --out before any OCR work."""
+    from itbl import cli
+
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "receipt.png").write_bytes(b"")
+    monkeypatch.setattr(cli, "process_images", lambda *args, **kwargs: pytest.fail("processed"))
+
+    for stream in (False, True):
+        assert cli.parse_command(inbox, tmp_path / "ledger.csv", stream=stream) == 3
+    assert not (tmp_path / "ledger.csv").exists()
+
+
+def test_csv_sink_matches_batch_write_values(tmp_path):
+    """Streaming and batch CSV output agree on columns and values."""
+    batch_dir = tmp_path / "batch"
+    stream_dir = tmp_path / "stream"
+    batch_dir.mkdir()
+    stream_dir.mkdir()
+
+    CSVWriter(annotate_inline=True).write(ROWS[:2], batch_dir, "Office Supplies")
+    sink = CSVWriter(annotate_inline=True).open_sink(stream_dir, "Office Supplies")
+    for row in ROWS[:2]:
+        sink.append(row)
+    sink.close()
+
+    assert _read_csv(batch_dir / "Office_Supplies.csv") == _read_csv(stream_dir / "Office_Supplies.csv")
+
+
+def test_buffered_sink_writes_in_batches(tmp_path):
+    """Writers without native streaming get write() calls of flush_every rows."""
+
+    class RecordingWriter(WriterBase):
+        stream_batch_size = 2
+
+        def __init__(self):
+            self.batches = []
+
+        def write(self, rows, output_path, category, apply_highlights=False):
+            self.batches.append([row["Vendor"] for row in rows])
+
+    writer = RecordingWriter()
+    sink = writer.open_sink(tmp_path, "Office Supplies")
+    assert isinstance(sink, BufferedSink)
+    for row in ROWS:
+        sink.append(row)
+    assert writer.batches == [["STAPLES", "AMAZON"]]
+    sink.close()
+    assert writer.batches == [["STAPLES", "AMAZON"], ["UBER"]]
+    assert sink.rows_written == 3
+
+
+def test_xlsx_sink_streams_highlights_and_comments(tmp_path):
+    """Write-only XLSX output keeps highlight fills and review comments."""
+    openpyxl = pytest.importorskip("openpyxl")
+    from itbl.output.xlsx_writer import XLSXWriter
+
+    sink = XLSXWriter().open_sink(tmp_path, "Office Supplies", apply_highlights=True)
+    for row in ROWS[:2]:
+        sink.append(row)
+    sink.close()
+
+    ws = openpyxl.load_workbook(tmp_path / "Office_Supplies.xlsx")["Office Supplies"]
+    header = [cell.value for cell in ws[1]]
+    assert header == ["Amount", "Date", "Vendor"]
+    assert ws["C3"].value == "AMAZON"
+    assert ws["A3"].fill.fgColor.rgb.endswith("FFF59D")
+    assert "low_ocr_confidence" in ws["A3"].comment.text
+    assert ws["A2"].comment is None
+
+
+def test_xlsx_file_output_collects_categories_as_sheets(tmp_path):
+    """A file output path gets one workbook with a sheet per category, saved by close()."""
+    openpyxl = pytest.importorskip("openpyxl")
+    from itbl.output.xlsx_writer import XLSXWriter
+
+    output = tmp_path / "ledger.xlsx"
+    writer = XLSXWriter()
+    writer.write(ROWS[:2], output, "Office Supplies", apply_highlights=True)
+    writer.write(ROWS[2:], output, "Transportation")
+    assert not output.exists()
+    writer.close()
+
+    wb = openpyxl.load_workbook(output)
+    assert wb.sheetnames == ["Office Supplies", "Transportation"]
+    assert wb["Office Supplies"].max_row == 3
+    assert wb["Office Supplies"]["A3"].fill.fgColor.rgb.endswith("FFF59D")
+    assert wb["Transportation"]["C2"].value == "UBER"
+
+
+def test_xlsx_append_adds_rows_to_existing_workbook(tmp_path):
+    """Append mode keeps existing rows and header order, and adds new sheets."""
+    openpyxl = pytest.importorskip("openpyxl")
+    from itbl.output.xlsx_writer import XLSXWriter
+
+    output = tmp_path / "ledger.xlsx"
+    writer = XLSXWriter()
+    writer.write(ROWS[:1], output, "Office Supplies")
+    writer.close()
+
+    writer = XLSXWriter(append=True)
+    extra = dict(ROWS[1], Memo="pens")
+    writer.write([extra], output, "Office Supplies", apply_highlights=True)
+    writer.write(ROWS[2:], output, "Transportation")
+    writer.close()
+
+    wb = openpyxl.load_workbook(output)
+    assert wb.sheetnames == ["Office Supplies", "Transportation"]
+    ws = wb["Office Supplies"]
+    assert [cell.value for cell in ws[1]] == ["Amount", "Date", "Vendor", "Memo"]
+    assert [cell.value for cell in ws[2]][:3] == [25.99, "2024-01-15", "STAPLES"]
+    assert [cell.value for cell in ws[3]] == [10.0, "2024-01-15", "AMAZON", "pens"]
+    assert "low_ocr_confidence" in ws["A3"].comment.text
+
+
+def test_report_accumulator_matches_generate_report(tmp_path):
+    """Accumulating row by row renders the same report as the batch helper."""
+    batch_dir = tmp_path / "batch"
+    batch_dir.mkdir()
+    by_category = {}
+    for row in ROWS:
+        by_category.setdefault(row["_category"], []).append(row)
+    generate_report(by_category, batch_dir, ingest_counts={"image": 3})
+
+    accumulator = ReportAccumulator()
+    for row in ROWS:
+        accumulator.add(row)
+    accumulator.add_ingest("image")
+    accumulator.add_ingest("image")
+    accumulator.add_ingest("image")
+
+    assert accumulator.total_rows == 3 and accumulator.total_flagged == 1
+    assert accumulator.render() == (batch_dir / "report.md").read_text(encoding="utf-8")